@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：有大量重复文件的目录中，按内容指纹只解析一次与逐个解析所有文件的对比
+
+生成 --profile 预设的语料，再复制 --copies 份到子目录（模拟个人目录中的副本和备份），
+分别用 dedupe_content=False（逐个解析）、True（首次搜索，需要读取文件计算指纹）和
+True且使用上次保存的指纹数据库（再次搜索，未修改的文件不必重新计算指纹）单进程搜索 --repeat 次，
+取最短耗时计算 文件/秒 和 MB/秒，并检查三种方式找到的文件相同。
+
+用法：
+    python benchmarks/bench_duplicates.py [--profile mixed] [--copies 3] [--keyword needle] [--repeat 3]
+语料参数（--files、--rows 等）会覆盖预设的对应值。
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import PROFILES, KEYWORD, add_spec_arguments, generate_corpus, make_spec, spec_overrides
+from src.search_core import SearchCore
+
+MB = 1024 * 1024
+
+
+def make_copies(directory, copies):
+    """把目录中的工作簿复制copies份到 copy_N 子目录，返回复制后的总字节数"""
+    names = [name for name in os.listdir(directory) if name.endswith(('.xlsx', '.xls'))]
+    total = 0
+    for copy_idx in range(copies):
+        copy_dir = os.path.join(directory, f"copy_{copy_idx}")
+        os.makedirs(copy_dir)
+        for name in names:
+            shutil.copy2(os.path.join(directory, name), os.path.join(copy_dir, name))
+            total += os.path.getsize(os.path.join(copy_dir, name))
+    return total
+
+
+def run_search(directory, keyword, dedupe_content, fingerprint_path=None):
+    """单进程搜索目录，返回 (耗时秒数, {路径: 匹配数}, 处理的文件数)"""
+    engine = SearchCore()
+    engine.set_search_params(directory=directory, keyword=keyword, max_workers=1)
+    engine.dedupe_content = dedupe_content
+    engine.fingerprint_path = fingerprint_path
+    results = {}
+    state = {'total': 0}
+    engine.on_files_found = lambda file_infos: results.update((info['path'], info['matches']) for info in file_infos)
+    engine.on_finished = lambda total, found: state.update(total=total)
+    start = time.perf_counter()
+    engine.start_search()
+    return time.perf_counter() - start, results, state['total']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重复文件按内容指纹跳过的基准测试")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='mixed')
+    parser.add_argument('--copies', type=int, default=3, help="每个文件的副本数")
+    parser.add_argument('--keyword', default=KEYWORD)
+    parser.add_argument('--repeat', type=int, default=3)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = make_spec(args.profile, **spec_overrides(args))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = os.path.join(tmp_dir, 'corpus')
+        manifest = generate_corpus(directory, spec, args.seed, log=lambda message: print(message, file=sys.stderr))
+        total_mb = (manifest['bytes'] + make_copies(directory, args.copies)) / MB
+        fingerprint_path = os.path.join(tmp_dir, 'fingerprints.db')
+
+        print(f"{'mode':>12} {'time (s)':>10} {'files/s':>9} {'MB/s':>7} {'found':>6}")
+        modes = (
+            ('all files', False, None, False),
+            ('dedupe', True, None, False),
+            ('fingerprints', True, fingerprint_path, True),
+        )
+        baseline = None
+        for mode, dedupe_content, path, warm_up in modes:
+            if warm_up:
+                # 先搜索一次保存指纹，计时的是之后的搜索
+                run_search(directory, args.keyword, dedupe_content, path)
+            runs = [run_search(directory, args.keyword, dedupe_content, path) for _ in range(args.repeat)]
+            elapsed = min(run[0] for run in runs)
+            _, results, total = runs[0]
+            print(f"{mode:>12} {elapsed:>10.2f} {total / elapsed:>9.1f} {total_mb / elapsed:>7.2f} {len(results):>6}")
+            if baseline is None:
+                baseline = (elapsed, results)
+            else:
+                if results != baseline[1]:
+                    print(f"WARNING: results differ for {mode}")
+                print(f"{mode:>12} speedup: {baseline[0] / elapsed:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
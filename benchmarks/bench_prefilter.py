@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：.xlsx 共享字符串预过滤在"大部分文件不含关键字"的目录上的效果
+
+生成一批不含关键字的工作簿和少量包含关键字的工作簿，
+分别在关闭/开启预过滤的情况下单进程搜索整个目录并计时。
+
+用法：
+    python benchmarks/bench_prefilter.py [--files 200] [--hit-ratio 0.05] [--rows 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import xlsxwriter
+
+from src.search_core import SearchCore
+
+KEYWORD = "needle"
+
+
+def build_corpus(directory, file_count, hit_ratio, rows, cols=8):
+    """生成测试目录，返回包含关键字的文件数"""
+    hit_every = max(1, round(1 / hit_ratio)) if hit_ratio > 0 else 0
+    hit_files = 0
+    for file_idx in range(file_count):
+        workbook = xlsxwriter.Workbook(os.path.join(directory, f"book_{file_idx:05d}.xlsx"))
+        sheet = workbook.add_worksheet()
+        for row in range(rows):
+            sheet.write_row(row, 0, [f"text_{file_idx}_{row}_{col}" for col in range(cols)])
+        if hit_every and file_idx % hit_every == 0:
+            sheet.write(rows // 2, 0, f"row with {KEYWORD} inside")
+            hit_files += 1
+        workbook.close()
+    return hit_files
+
+
+def run_search(directory, use_prefilter):
+    """单进程搜索目录，返回 (耗时秒数, 找到的文件数)"""
+    engine = SearchCore()
+    engine.set_search_params(directory=directory, keyword=KEYWORD, max_workers=1)
+    engine.use_prefilter = use_prefilter
+    result = {}
+    engine.on_finished = lambda total, found: result.update(found=found)
+    start = time.perf_counter()
+    engine.start_search()
+    return time.perf_counter() - start, result.get('found', 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="xlsx 共享字符串预过滤基准测试")
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--hit-ratio', type=float, default=0.05)
+    parser.add_argument('--rows', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hit_files = build_corpus(tmp_dir, args.files, args.hit_ratio, args.rows)
+        print(f"corpus: {args.files} files, {hit_files} containing '{KEYWORD}', {args.rows} rows each")
+
+        full_time, full_found = run_search(tmp_dir, use_prefilter=False)
+        fast_time, fast_found = run_search(tmp_dir, use_prefilter=True)
+
+        print(f"{'mode':>12} {'time (s)':>10} {'files/s':>10} {'found':>6}")
+        print(f"{'full parse':>12} {full_time:>10.2f} {args.files / full_time:>10.1f} {full_found:>6}")
+        print(f"{'prefilter':>12} {fast_time:>10.2f} {args.files / fast_time:>10.1f} {fast_found:>6}")
+        print(f"speedup: {full_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：结果表格插入和排序大量结果的耗时与内存
+
+新表格（FileTableWidget，模型/视图 + 批量插入）插入 --rows 行；
+旧实现（QTableWidget，每行5个QTableWidgetItem、插入时开启排序）插入 --legacy-rows 行作对比。
+另外测量按匹配数排序的耗时和进程内存（RSS）的增长。无显示环境时使用offscreen平台运行。
+
+用法：
+    python benchmarks/bench_results_table.py [--rows 500000] [--legacy-rows 20000] [--batch 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from src.components.file_table import FileTableWidget
+
+
+def rss_bytes():
+    """当前进程的常驻内存（仅Linux，其他平台返回None）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def rss_growth(before):
+    after = rss_bytes()
+    return None if before is None or after is None else after - before
+
+
+def make_file_info(i):
+    """构造一个模拟的文件结果"""
+    return {
+        'name': f"book_{i:07d}.xlsx",
+        'path': f"/data/share/dept_{i % 97}/book_{i:07d}.xlsx",
+        'size': "12.3 KB",
+        'modified': "2025-01-01 12:00:00",
+        'size_bytes': 12345 + i,
+        'mtime': 1735700000.0 + i,
+        'matches': (i * 7919) % 1000,
+        'preview': f"[Sheet1!A{i % 1000 + 1}] invoice {i}",
+        'hits': [("Sheet1", i % 1000 + 1, 1)],
+        'term_matches': {}
+    }
+
+
+def bench_model_view(app, rows, batch):
+    """新表格：每batch个结果批量插入一次（与界面定时刷新相同）"""
+    table = FileTableWidget()
+    table.resize(1200, 800)
+    table.show()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    for first in range(0, rows, batch):
+        for i in range(first, min(first + batch, rows)):
+            table.add_file(make_file_info(i))
+        table.flush()
+        app.processEvents()
+    insert_time = time.perf_counter() - start
+    memory = rss_growth(rss_before)
+
+    start = time.perf_counter()
+    table.sortByColumn(4, Qt.SortOrder.DescendingOrder)
+    app.processEvents()
+    sort_time = time.perf_counter() - start
+    assert table.rowCount() == rows
+    table.close()
+    return insert_time, sort_time, memory
+
+
+def bench_legacy(app, rows):
+    """旧实现：QTableWidget逐行插入5个QTableWidgetItem，插入时开启排序"""
+    table = QTableWidget()
+    table.setColumnCount(5)
+    table.setSortingEnabled(True)
+    table.resize(1200, 800)
+    table.show()
+    file_data = []
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    for i in range(rows):
+        file_info = make_file_info(i)
+        row = table.rowCount()
+        table.insertRow(row)
+        for col, key in enumerate(('name', 'path', 'size', 'modified', 'matches')):
+            table.setItem(row, col, QTableWidgetItem(str(file_info[key])))
+        file_data.append(file_info)
+        if i % 500 == 0:
+            app.processEvents()
+    app.processEvents()
+    insert_time = time.perf_counter() - start
+    memory = rss_growth(rss_before)
+
+    start = time.perf_counter()
+    table.sortItems(4, Qt.SortOrder.DescendingOrder)
+    app.processEvents()
+    sort_time = time.perf_counter() - start
+    table.close()
+    return insert_time, sort_time, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="结果表格基准测试")
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--legacy-rows', type=int, default=20000, help="旧实现插入的行数（0=跳过）")
+    parser.add_argument('--batch', type=int, default=2000, help="新表格每次批量插入的行数")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    print(f"{'table':>12} {'rows':>8} {'insert (s)':>11} {'rows/s':>10} {'sort (s)':>9} {'RSS +MB':>9}")
+    results = [('model/view', args.rows, bench_model_view(app, args.rows, args.batch))]
+    if args.legacy_rows:
+        results.append(('QTableWidget', args.legacy_rows, bench_legacy(app, args.legacy_rows)))
+    for label, rows, (insert_time, sort_time, memory) in results:
+        memory_text = f"{memory / 1024 / 1024:.1f}" if memory is not None else "n/a"
+        print(f"{label:>12} {rows:>8} {insert_time:>11.2f} {rows / insert_time:>10.0f} "
+              f"{sort_time:>9.2f} {memory_text:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：在生成的语料上运行完整搜索，报告吞吐量、峰值内存和各阶段耗时
+
+每个预设语料（见 corpus.py）按 --workers 中的每个工作进程数完整搜索 --repeat 次，
+取最短耗时计算 文件/秒 和 MB/秒；每次搜索在单独的子进程中运行，峰值内存（RSS）互不影响。
+另外用搜索引擎自带的耗时统计（SearchStats）记录单进程搜索时各阶段的耗时：
+目录枚举、共享字符串预过滤、打开工作簿、解析、匹配。
+结果可以保存为JSON，并与之前保存的结果比较。
+
+用法：
+    python benchmarks/bench_search.py [--profile mixed numeric] [--workers 1 4] [--repeat 3]
+                                      [--quick [--quick-limit N] [--quick-unit rows|cells|kb]]
+                                      [--output 结果.json] [--compare 上次结果.json]
+语料参数（--files、--rows 等）会覆盖所有选中预设的对应值。
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import CORPUS_VERSION, PROFILES, add_spec_arguments, generate_corpus, make_spec, spec_overrides
+from src.xlsx_stream import LIMIT_BYTES, LIMIT_CELLS, LIMIT_ROWS
+
+MB = 1024 * 1024
+# 快速搜索上限单位 -> (搜索引擎的上限单位, 换算倍数)，与命令行的--quick-unit相同
+QUICK_UNITS = {'rows': (LIMIT_ROWS, 1), 'cells': (LIMIT_CELLS, 1), 'kb': (LIMIT_BYTES, 1024)}
+RESULT_VERSION = 1
+
+
+def peak_rss_bytes(children=False):
+    """当前进程（或已结束的子进程中）的峰值常驻内存，不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # Linux以KB为单位，macOS以字节为单位
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+def _new_core(directory, keyword, workers, complete_search, quick_limit):
+    from src.search_core import SearchCore
+
+    core = SearchCore()
+    core.set_search_params(directory=directory, keyword=keyword, complete_search=complete_search,
+                           max_workers=workers, quick_limit=quick_limit[0], quick_limit_unit=quick_limit[1])
+    return core
+
+
+def measure_search(directory, keyword, workers, complete_search, quick_limit):
+    """完整搜索一次，返回 (耗时秒数, 找到的文件数, 处理的文件数)"""
+    core = _new_core(directory, keyword, workers, complete_search, quick_limit)
+    result = {}
+    core.on_finished = lambda total, found: result.update(total=total, found=found)
+    core.on_error = lambda message: result.update(error=message)
+    start = time.perf_counter()
+    core.start_search()
+    elapsed = time.perf_counter() - start
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return elapsed, result.get('found', 0), result.get('total', 0)
+
+
+def measure_stages(directory, keyword, complete_search, quick_limit):
+    """单进程搜索一次，返回 (各阶段耗时秒数, 被预过滤跳过的文件数, 各解析器的统计)"""
+    from src.search_stats import PARSER_PREFILTER, STAGES
+
+    core = _new_core(directory, keyword, 1, complete_search, quick_limit)
+    core.start_search()
+    stats = core.stats.to_dict()
+    stages = {stage: stats['stages'].get(stage, 0.0) for stage in STAGES if stage != 'gui'}
+    skipped = stats['parsers'].get(PARSER_PREFILTER, {}).get('files', 0)
+    return stages, skipped, stats['parsers']
+
+
+def _child_main(task, kwargs, conn):
+    """子进程入口：执行测量并把结果和峰值内存发回父进程"""
+    try:
+        result = task(**kwargs)
+        conn.send(('ok', result, peak_rss_bytes(), peak_rss_bytes(children=True)))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {str(e)}", None, None))
+    finally:
+        conn.close()
+
+
+def run_in_child(task, **kwargs):
+    """在新的子进程中执行task，返回 (结果, 子进程峰值RSS, 其工作进程峰值RSS)"""
+    context = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_child_main, args=(task, kwargs, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        status, result, rss, worker_rss = parent_conn.recv()
+    except EOFError:
+        status, result, rss, worker_rss = 'error', f"子进程异常退出（退出码 {process.exitcode}）", None, None
+    process.join()
+    if status != 'ok':
+        raise RuntimeError(result)
+    return result, rss, worker_rss
+
+
+def _to_mb(value):
+    return round(value / MB, 1) if value is not None else None
+
+
+def run_profile(profile, spec, args, corpus_root, log):
+    """生成（或复用）一个语料并运行所有测量，返回结果记录列表和阶段耗时"""
+    directory = os.path.join(corpus_root, f"{profile}-seed{args.seed}")
+    manifest = generate_corpus(directory, spec, args.seed, log=log)
+    keyword = manifest['keyword']
+    complete_search = not args.quick
+    quick_limit = (args.quick_limit * QUICK_UNITS[args.quick_unit][1], QUICK_UNITS[args.quick_unit][0])
+    total_mb = manifest['bytes'] / MB
+
+    runs = []
+    for workers in args.workers:
+        timings = []
+        peak_rss = peak_worker_rss = None
+        for _ in range(args.repeat):
+            (elapsed, found, total), rss, worker_rss = run_in_child(
+                measure_search, directory=directory, keyword=keyword, workers=workers,
+                complete_search=complete_search, quick_limit=quick_limit
+            )
+            timings.append(elapsed)
+            peak_rss = max(filter(None, (peak_rss, rss)), default=None)
+            peak_worker_rss = max(filter(None, (peak_worker_rss, worker_rss)), default=None)
+        best = min(timings)
+        runs.append({
+            'profile': profile,
+            'workers': workers,
+            'complete_search': complete_search,
+            'quick_limit': None if complete_search else f"{args.quick_limit} {args.quick_unit}",
+            'files': total,
+            'found': found,
+            'expected_found': manifest['hit_files'],
+            'seconds': round(best, 4),
+            'all_seconds': [round(value, 4) for value in timings],
+            'files_per_sec': round(total / best, 1) if best else None,
+            'mb_per_sec': round(total_mb / best, 2) if best else None,
+            'peak_rss_mb': _to_mb(peak_rss),
+            'peak_worker_rss_mb': _to_mb(peak_worker_rss),
+        })
+
+    (stages, skipped, parsers), _, _ = run_in_child(
+        measure_stages, directory=directory, keyword=keyword, complete_search=complete_search,
+        quick_limit=quick_limit
+    )
+    stage_record = {
+        'profile': profile,
+        'seconds': {name: round(value, 4) for name, value in stages.items()},
+        'prefilter_skipped': skipped,
+        'parsers': parsers,
+    }
+    corpus_record = {
+        'profile': profile,
+        'corpus_version': CORPUS_VERSION,
+        'spec': spec,
+        'seed': args.seed,
+        'files': manifest['files'],
+        'mb': round(total_mb, 2),
+        'hit_files': manifest['hit_files'],
+    }
+    return corpus_record, runs, stage_record
+
+
+def git_revision():
+    """当前代码的git提交（无法获取时返回None）"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_runs(runs):
+    print(f"{'profile':>12} {'workers':>7} {'files':>6} {'found':>9} {'time (s)':>9} "
+          f"{'files/s':>9} {'MB/s':>7} {'RSS MB':>7} {'worker MB':>9}")
+    for run in runs:
+        found = f"{run['found']}/{run['expected_found']}"
+        print(f"{run['profile']:>12} {run['workers']:>7} {run['files']:>6} {found:>9} {run['seconds']:>9.3f} "
+              f"{run['files_per_sec']:>9.1f} {run['mb_per_sec']:>7.2f} "
+              f"{run['peak_rss_mb'] if run['peak_rss_mb'] is not None else 'n/a':>7} "
+              f"{run['peak_worker_rss_mb'] if run['peak_worker_rss_mb'] is not None else 'n/a':>9}")
+
+
+def print_stages(stage_records):
+    columns = ('enumerate', 'prefilter', 'open', 'parse', 'match', 'index')
+    print(f"\n{'profile':>12} " + ' '.join(f"{name:>10}" for name in columns) + f" {'skipped':>8}  (单进程，秒)")
+    for record in stage_records:
+        seconds = record['seconds']
+        print(f"{record['profile']:>12} " + ' '.join(f"{seconds.get(name, 0.0):>10.3f}" for name in columns)
+              + f" {record['prefilter_skipped']:>8}")
+
+
+def _corpus_identity(corpus):
+    return corpus.get('corpus_version'), corpus['spec'], corpus['seed']
+
+
+def print_comparison(corpora, runs, baseline_path):
+    """与之前保存的结果比较相同语料、相同工作进程数的耗时（语料参数不同的不比较）"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous_corpora = {corpus['profile']: _corpus_identity(corpus) for corpus in baseline['corpora']}
+    same_corpus = {
+        corpus['profile'] for corpus in corpora
+        if previous_corpora.get(corpus['profile']) == _corpus_identity(corpus)
+    }
+    previous = {
+        (run['profile'], run['workers'], run['complete_search'], run.get('quick_limit')): run
+        for run in baseline['runs']
+    }
+    print(f"\n与 {baseline_path}（{baseline.get('git_revision') or '未知版本'}）比较：")
+    print(f"{'profile':>12} {'workers':>7} {'before (s)':>11} {'after (s)':>10} {'speedup':>8}")
+    for run in runs:
+        old = previous.get((run['profile'], run['workers'], run['complete_search'], run['quick_limit']))
+        if old is None:
+            continue
+        if run['profile'] not in same_corpus:
+            print(f"{run['profile']:>12} {run['workers']:>7}  语料参数不同，不比较")
+            continue
+        speedup = old['seconds'] / run['seconds'] if run['seconds'] else float('inf')
+        print(f"{run['profile']:>12} {run['workers']:>7} {old['seconds']:>11.3f} {run['seconds']:>10.3f} "
+              f"{speedup:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="搜索引擎基准测试")
+    parser.add_argument('--profile', nargs='+', choices=sorted(PROFILES), default=['mixed', 'numeric'],
+                        help="要测试的预设语料")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help="工作进程数（每个值分别测试）")
+    parser.add_argument('--repeat', type=int, default=3, help="每项测量重复次数（取最短耗时）")
+    parser.add_argument('--quick', action='store_true', help="快速搜索模式（每个工作表只读取开头部分）")
+    parser.add_argument('--quick-limit', type=int, default=1000, help="快速搜索时每个工作表读取的上限")
+    parser.add_argument('--quick-unit', choices=sorted(QUICK_UNITS), default='rows',
+                        help="快速搜索上限的单位（行数、非空单元格数或KB）")
+    parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'excel_search_bench'),
+                        help="语料目录（按预设和种子分子目录，相同参数的语料会被复用）")
+    parser.add_argument('--output', help="把结果保存为JSON文件")
+    parser.add_argument('--compare', help="与之前保存的JSON结果比较")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    args.workers = sorted(set(max(1, workers) for workers in args.workers))
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    corpora, runs, stage_records = [], [], []
+    for profile in args.profile:
+        spec = make_spec(profile, **spec_overrides(args))
+        log(f"测试语料 {profile}: {spec}")
+        corpus_record, profile_runs, stage_record = run_profile(profile, spec, args, args.corpus_dir, log)
+        corpora.append(corpus_record)
+        runs.extend(profile_runs)
+        stage_records.append(stage_record)
+
+    print_runs(runs)
+    print_stages(stage_records)
+    if args.compare:
+        print_comparison(corpora, runs, args.compare)
+
+    if args.output:
+        result = {
+            'version': RESULT_VERSION,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'corpora': corpora,
+            'runs': runs,
+            'stages': stage_records,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        log(f"结果已保存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
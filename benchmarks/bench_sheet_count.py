@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：.xlsx 单文件搜索耗时与工作表数量的关系
+
+对比两种读取方式：
+- legacy：每个工作表都调用一次 pd.read_excel(file_path, ...)（每次重新解析整个工作簿）
+  并用 DataFrame.to_string() 搜索
+- engine：SearchCore._search_file（工作簿只打开一次，所有工作表共用同一句柄）
+
+用法：
+    python benchmarks/bench_sheet_count.py [--sheets 1 5 10 30] [--rows 200] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import xlsxwriter
+
+from src.search_core import SearchCore
+
+
+def build_workbook(path, sheet_count, rows, cols=8):
+    """生成包含指定数量工作表的测试工作簿"""
+    workbook = xlsxwriter.Workbook(path)
+    for sheet_idx in range(sheet_count):
+        sheet = workbook.add_worksheet(f"Sheet{sheet_idx + 1}")
+        for row in range(rows):
+            sheet.write_row(row, 0, [f"text_{sheet_idx}_{row}_{col}" for col in range(cols)])
+    workbook.close()
+
+
+def legacy_search(file_path, pattern):
+    """旧实现：每个工作表单独调用 pd.read_excel，再把整个DataFrame转成字符串搜索"""
+    matches = 0
+    for sheet_name in pd.ExcelFile(file_path).sheet_names:
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        matches += len(pattern.findall(df.to_string()))
+    return matches
+
+
+def time_call(func, repeat):
+    """返回多次调用中的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="xlsx 工作表数量基准测试")
+    parser.add_argument('--sheets', type=int, nargs='+', default=[1, 5, 10, 30])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    engine = SearchCore()
+    engine.set_search_params(directory='', keyword='needle')
+    pattern = engine._build_search_pattern()
+
+    print(f"{'sheets':>8} {'legacy (ms)':>12} {'engine (ms)':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sheet_count in args.sheets:
+            file_path = os.path.join(tmp_dir, f"sheets_{sheet_count}.xlsx")
+            build_workbook(file_path, sheet_count, args.rows)
+
+            legacy = time_call(lambda: legacy_search(file_path, pattern), args.repeat)
+            current = time_call(lambda: engine._search_file(file_path, pattern), args.repeat)
+            print(f"{sheet_count:>8} {legacy * 1000:>12.1f} {current * 1000:>12.1f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
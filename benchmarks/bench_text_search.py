@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：大CSV文件按字节搜索与解码所有内容后搜索的吞吐量
+
+生成一个 --size-mb MB 的CSV文件（每 --hit-every 行有一行包含关键字），按 --encoding 中的每种编码保存，
+分别用"解码所有内容后搜索"（use_bytes_search=False）和"直接在原始字节上搜索、只解码候选行"
+单进程搜索 --repeat 次，取最短耗时计算 MB/秒，并检查两种方式的匹配数相同。
+关键字含有英文字母时，文件中轮流写入原样、全大写、首字母大写和全小写的关键字，
+检查不区分大小写的按字节搜索不会漏掉大小写不同的行；--window-kb 指定按字节搜索的窗口大小，
+窗口较小时更容易检查候选密集和跨窗口的情况。匹配数不同时返回1。
+
+用法：
+    python benchmarks/bench_text_search.py [--size-mb 200] [--hit-every 10000] [--encoding utf-8 gbk]
+                                           [--keyword 发票] [--whole-word] [--repeat 3] [--window-kb 1024]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search_core import SearchCore
+
+MB = 1024 * 1024
+WORDS = ['北京', '上海', '订单', '客户', 'alpha', 'beta', 'gamma', 'delta', 'total', 'status']
+
+
+def build_csv(file_path, size_mb, hit_every, keyword, encoding, seed=1):
+    """生成约size_mb MB的CSV文件，返回包含关键字的行数"""
+    rng = random.Random(seed)
+    target = size_mb * MB
+    written = 0
+    hit_lines = 0
+    line_no = 0
+    # 大小写不同的写法（关键字没有英文字母时都相同）
+    variants = [keyword, keyword.upper(), keyword.title(), keyword.lower()]
+    with open(file_path, 'w', encoding=encoding, newline='\n') as f:
+        while written < target:
+            lines = []
+            for _ in range(1000):
+                line_no += 1
+                fields = [f"{rng.choice(WORDS)}{rng.randint(0, 99999)}" for _ in range(8)]
+                if hit_every and line_no % hit_every == 0:
+                    variant = variants[hit_lines % len(variants)]
+                    fields[rng.randrange(len(fields))] = f"{variant}{line_no}"
+                    hit_lines += 1
+                lines.append(','.join(fields))
+            block = '\n'.join(lines) + '\n'
+            f.write(block)
+            written += len(block.encode(encoding))
+    return hit_lines
+
+
+def run_search(directory, keyword, whole_word, use_bytes_search, window_bytes=None):
+    """单进程搜索目录，返回 (耗时秒数, 匹配总数, 使用的解析器)"""
+    engine = SearchCore()
+    engine.set_search_params(directory=directory, keyword=keyword, whole_word=whole_word,
+                             file_type="All Files", max_workers=1)
+    engine.use_bytes_search = use_bytes_search
+    if window_bytes:
+        engine.TEXT_CHUNK_SIZE = window_bytes
+    result = {'matches': 0}
+    engine.on_files_found = lambda file_infos: result.update(
+        matches=result['matches'] + sum(info['matches'] for info in file_infos))
+    start = time.perf_counter()
+    engine.start_search()
+    elapsed = time.perf_counter() - start
+    parsers = engine.stats.to_dict()['parsers'] if engine.stats is not None else {}
+    return elapsed, result['matches'], ', '.join(parsers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV按字节搜索基准测试")
+    parser.add_argument('--size-mb', type=int, default=200)
+    parser.add_argument('--hit-every', type=int, default=10000, help="每多少行有一行包含关键字（0=没有）")
+    parser.add_argument('--encoding', nargs='+', default=['utf-8', 'gbk'])
+    parser.add_argument('--keyword', default="发票")
+    parser.add_argument('--whole-word', action='store_true')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--window-kb', type=int, help="按字节搜索的窗口大小（KB，默认使用SearchCore.TEXT_CHUNK_SIZE）")
+    args = parser.parse_args()
+    window_bytes = args.window_kb * 1024 if args.window_kb else None
+
+    differ = False
+    print(f"{'encoding':>9} {'mode':>8} {'time (s)':>10} {'MB/s':>8} {'matches':>8}  parser")
+    for encoding in args.encoding:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, f"export_{encoding}.csv")
+            build_csv(file_path, args.size_mb, args.hit_every, args.keyword, encoding)
+            size_mb = os.path.getsize(file_path) / MB
+            times = {}
+            for mode, use_bytes_search in (('decode', False), ('bytes', True)):
+                runs = [run_search(tmp_dir, args.keyword, args.whole_word, use_bytes_search, window_bytes)
+                        for _ in range(args.repeat)]
+                elapsed = min(run[0] for run in runs)
+                _, matches, parsers = runs[0]
+                times[mode] = (elapsed, matches)
+                print(f"{encoding:>9} {mode:>8} {elapsed:>10.2f} {size_mb / elapsed:>8.1f} {matches:>8}  {parsers}")
+            if times['decode'][1] != times['bytes'][1]:
+                print(f"WARNING: match counts differ for {encoding}")
+                differ = True
+            print(f"{encoding:>9} speedup: {times['decode'][0] / times['bytes'][0]:.1f}x")
+    return 1 if differ else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
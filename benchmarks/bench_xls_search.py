@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试：.xls（97-2003）语料上按需加载工作表、只匹配文本与一次加载整个工作簿、匹配所有单元格的对比
+
+生成（或复用）--profile 预设的语料（默认xls，需要xlwt），对 --keyword 中的每个关键字分别用
+use_xls_on_demand=False（一次加载所有工作表、逐个单元格匹配所有值）和True（按需加载并卸载工作表，
+在共享字符串表中匹配后只按记录找出单元格）单进程搜索 --repeat 次，取最短耗时计算 文件/秒 和 MB/秒，
+并检查两种方式的结果相同。数字关键字（如2024）可能出现在数值单元格中，只有按需加载的部分生效。
+
+用法：
+    python benchmarks/bench_xls_search.py [--profile xls] [--keyword needle 客户 2024] [--repeat 3]
+                                          [--quick] [--corpus-dir 目录]
+语料参数（--files、--rows 等）会覆盖预设的对应值。
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import PROFILES, KEYWORD, add_spec_arguments, generate_corpus, make_spec, spec_overrides, xlwt
+from src.search_core import SearchCore
+
+MB = 1024 * 1024
+
+
+def run_search(directory, keyword, use_xls_on_demand, complete_search):
+    """单进程搜索目录，返回 (耗时秒数, {路径: (匹配数, 坐标)}, 处理的文件数)"""
+    engine = SearchCore()
+    engine.set_search_params(directory=directory, keyword=keyword, complete_search=complete_search,
+                             file_type="Excel 97-2003 (.xls)", max_workers=1)
+    engine.use_xls_on_demand = use_xls_on_demand
+    results = {}
+    state = {'total': 0}
+    engine.on_files_found = lambda file_infos: results.update(
+        (info['path'], (info['matches'], info['hits'])) for info in file_infos)
+    engine.on_finished = lambda total, found: state.update(total=total)
+    start = time.perf_counter()
+    engine.start_search()
+    return time.perf_counter() - start, results, state['total']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=".xls按需加载与只匹配文本的基准测试")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='xls')
+    parser.add_argument('--keyword', nargs='+', default=[KEYWORD, "客户", "2024"])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--quick', action='store_true', help="快速搜索（每个工作表前1000行）")
+    parser.add_argument('--corpus-dir', help="语料目录（默认在临时目录中生成，结束后删除）")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    if xlwt is None:
+        print("需要xlwt生成.xls语料：pip install xlwt", file=sys.stderr)
+        return 2
+    spec = make_spec(args.profile, **spec_overrides(args))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.corpus_dir or os.path.join(tmp_dir, 'corpus')
+        manifest = generate_corpus(directory, spec, args.seed, log=lambda message: print(message, file=sys.stderr))
+        total_mb = manifest['bytes'] / MB
+
+        print(f"{'keyword':>10} {'mode':>10} {'time (s)':>10} {'files/s':>9} {'MB/s':>7} {'found':>6}")
+        for keyword in args.keyword:
+            times = {}
+            for mode, use_xls_on_demand in (('eager', False), ('on-demand', True)):
+                runs = [run_search(directory, keyword, use_xls_on_demand, not args.quick)
+                        for _ in range(args.repeat)]
+                elapsed = min(run[0] for run in runs)
+                _, results, total = runs[0]
+                times[mode] = (elapsed, results)
+                print(f"{keyword:>10} {mode:>10} {elapsed:>10.2f} {total / elapsed:>9.1f} "
+                      f"{total_mb / elapsed:>7.2f} {len(results):>6}")
+            if times['eager'][1] != times['on-demand'][1]:
+                print(f"WARNING: results differ for {keyword}")
+            print(f"{keyword:>10} speedup: {times['eager'][0] / times['on-demand'][0]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试语料生成器：按参数生成可复现的 .xlsx/.xls 工作簿目录
+
+同样的参数和随机种子总是生成相同的单元格内容；生成完成后在目录中写入 corpus.json，
+再次使用相同参数时直接复用，不重新生成。.xlsx 使用 xlsxwriter 生成；
+.xls 需要可选依赖 xlwt，未安装时该部分文件改为 .xlsx 并给出提示。
+
+单独运行时只生成语料：
+    python benchmarks/corpus.py 输出目录 [--profile mixed] [--files 100] [--seed 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+
+import xlsxwriter
+
+try:
+    import xlwt
+except ImportError:
+    xlwt = None
+
+CORPUS_VERSION = 2  # 生成规则变化时递增，使旧语料失效
+KEYWORD = "needle"  # 插入到命中文件中的关键字（语料中其他位置不会出现）
+MANIFEST_NAME = "corpus.json"
+
+# 预设语料：文件数、每个文件的工作表数、行数、列数、文本单元格比例、命中文件比例、.xls文件比例
+PROFILES = {
+    'mixed': {'files': 100, 'sheets': 3, 'rows': 300, 'cols': 10,
+              'string_ratio': 0.6, 'hit_ratio': 0.1, 'xls_ratio': 0.2},
+    'many-sheets': {'files': 30, 'sheets': 30, 'rows': 60, 'cols': 8,
+                    'string_ratio': 0.7, 'hit_ratio': 0.1, 'xls_ratio': 0.0},
+    'wide': {'files': 30, 'sheets': 1, 'rows': 200, 'cols': 120,
+             'string_ratio': 0.5, 'hit_ratio': 0.2, 'xls_ratio': 0.0},
+    'numeric': {'files': 60, 'sheets': 2, 'rows': 1500, 'cols': 12,
+                'string_ratio': 0.05, 'hit_ratio': 0.05, 'xls_ratio': 0.0},
+    'large': {'files': 4, 'sheets': 2, 'rows': 20000, 'cols': 15,
+              'string_ratio': 0.6, 'hit_ratio': 0.5, 'xls_ratio': 0.0},
+    'xls': {'files': 60, 'sheets': 3, 'rows': 300, 'cols': 10,
+            'string_ratio': 0.6, 'hit_ratio': 0.1, 'xls_ratio': 1.0},
+}
+
+_WORDS = (
+    "account", "amount", "balance", "budget", "customer", "date", "department", "expense",
+    "invoice", "item", "ledger", "order", "payment", "price", "product", "quantity", "region",
+    "report", "revenue", "sales", "status", "supplier", "total", "warehouse",
+    "客户", "金额", "日期", "部门", "合同", "发票", "产品", "数量", "备注", "地区"
+)
+
+
+def make_spec(profile='mixed', **overrides):
+    """返回语料参数：预设值，再用不为None的overrides覆盖"""
+    spec = dict(PROFILES[profile])
+    spec.update({key: value for key, value in overrides.items() if value is not None})
+    return spec
+
+
+def _cell_value(rng, string_ratio):
+    """随机生成一个单元格的值：文本（1~4个单词）或数值"""
+    if rng.random() < string_ratio:
+        return ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.5:
+        return rng.randint(0, 1000000)
+    return round(rng.uniform(0, 100000), 2)
+
+
+def _sheet_rows(rng, spec, hit_cells):
+    """按行产生一个工作表的单元格值；hit_cells中的 (行, 列) 写入包含关键字的文本"""
+    for row in range(spec['rows']):
+        values = [_cell_value(rng, spec['string_ratio']) for _ in range(spec['cols'])]
+        for hit_row, hit_col in hit_cells:
+            if hit_row == row:
+                values[hit_col] = f"{rng.choice(_WORDS)} {KEYWORD} {rng.choice(_WORDS)}"
+        yield values
+
+
+def _write_xlsx(path, sheet_data):
+    # 不使用constant_memory模式：该模式把文本写成内联字符串，而Excel保存的文件使用共享字符串表
+    workbook = xlsxwriter.Workbook(path)
+    for sheet_name, rows in sheet_data:
+        sheet = workbook.add_worksheet(sheet_name)
+        for row_idx, values in enumerate(rows):
+            sheet.write_row(row_idx, 0, values)
+    workbook.close()
+
+
+def _write_xls(path, sheet_data):
+    workbook = xlwt.Workbook(encoding='utf-8')
+    for sheet_name, rows in sheet_data:
+        sheet = workbook.add_sheet(sheet_name)
+        for row_idx, values in enumerate(rows):
+            for col_idx, value in enumerate(values):
+                sheet.write(row_idx, col_idx, value)
+    workbook.save(path)
+
+
+def _corpus_key(spec, seed):
+    return {'version': CORPUS_VERSION, 'spec': spec, 'seed': seed, 'xlwt': xlwt is not None}
+
+
+def load_manifest(directory):
+    """读取语料目录中的 corpus.json，不存在或无法读取时返回None"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def generate_corpus(directory, spec, seed=1, log=None):
+    """在directory中生成语料并返回清单（字典）
+
+    目录中已有参数和种子相同的语料时直接返回其清单；是参数不同的旧语料时清空目录重新生成。
+    为避免误删文件，目录不为空又不是语料目录时抛出ValueError。
+    清单包含生成参数、关键字、文件数、总字节数、命中文件数和命中单元格数。
+    """
+    key = _corpus_key(spec, seed)
+    manifest = load_manifest(directory)
+    if manifest is not None and manifest.get('key') == key:
+        return manifest
+
+    if os.path.isdir(directory) and os.listdir(directory):
+        if manifest is None:
+            raise ValueError(f"目录不为空且不是语料目录: {directory}")
+        shutil.rmtree(directory)
+    os.makedirs(directory, exist_ok=True)
+    if spec['xls_ratio'] > 0 and xlwt is None and log:
+        log("未安装xlwt，.xls文件改为生成.xlsx（pip install xlwt 后可生成.xls）")
+
+    rng = random.Random(seed)
+    hit_every = 1 / spec['hit_ratio'] if spec['hit_ratio'] > 0 else 0
+    hit_files = 0
+    hit_cells_total = 0
+    total_bytes = 0
+    for file_idx in range(spec['files']):
+        is_xls = xlwt is not None and rng.random() < spec['xls_ratio']
+        is_hit = bool(hit_every) and int(file_idx % hit_every) == 0
+        cols = min(spec['cols'], 256) if is_xls else spec['cols']
+        rows = min(spec['rows'], 65536) if is_xls else spec['rows']
+        file_spec = dict(spec, cols=cols, rows=rows)
+
+        # 命中文件在随机工作表的随机位置写入1~5个包含关键字的单元格
+        hits_by_sheet = {}
+        if is_hit:
+            hit_files += 1
+            for _ in range(rng.randint(1, 5)):
+                cell = (rng.randrange(rows), rng.randrange(cols))
+                hits_by_sheet.setdefault(rng.randrange(spec['sheets']), set()).add(cell)
+            hit_cells_total += sum(len(cells) for cells in hits_by_sheet.values())
+
+        sheet_data = [
+            (f"Sheet{sheet_idx + 1}", _sheet_rows(rng, file_spec, hits_by_sheet.get(sheet_idx, ())))
+            for sheet_idx in range(spec['sheets'])
+        ]
+        path = os.path.join(directory, f"book_{file_idx:05d}.{'xls' if is_xls else 'xlsx'}")
+        if is_xls:
+            _write_xls(path, sheet_data)
+        else:
+            _write_xlsx(path, sheet_data)
+        total_bytes += os.path.getsize(path)
+        if log and (file_idx + 1) % 50 == 0:
+            log(f"已生成 {file_idx + 1}/{spec['files']} 个文件")
+
+    manifest = {
+        'key': key,
+        'keyword': KEYWORD,
+        'files': spec['files'],
+        'bytes': total_bytes,
+        'hit_files': hit_files,
+        'hit_cells': hit_cells_total,
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def add_spec_arguments(parser):
+    """添加语料参数选项（基准测试脚本共用）"""
+    parser.add_argument('--files', type=int, help="文件数")
+    parser.add_argument('--sheets', type=int, help="每个文件的工作表数")
+    parser.add_argument('--rows', type=int, help="每个工作表的行数")
+    parser.add_argument('--cols', type=int, help="每个工作表的列数")
+    parser.add_argument('--string-ratio', type=float, help="文本单元格比例（其余为数值）")
+    parser.add_argument('--hit-ratio', type=float, help="包含关键字的文件比例")
+    parser.add_argument('--xls-ratio', type=float, help=".xls文件比例（需要xlwt）")
+    parser.add_argument('--seed', type=int, default=1, help="随机种子")
+
+
+def spec_overrides(args):
+    """从命令行参数中取出语料参数覆盖值"""
+    return {
+        'files': args.files, 'sheets': args.sheets, 'rows': args.rows, 'cols': args.cols,
+        'string_ratio': args.string_ratio, 'hit_ratio': args.hit_ratio, 'xls_ratio': args.xls_ratio,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成基准测试用的Excel语料")
+    parser.add_argument('directory', help="输出目录（空目录或之前生成的语料目录）")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='mixed')
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = make_spec(args.profile, **spec_overrides(args))
+    manifest = generate_corpus(args.directory, spec, args.seed, log=lambda message: print(message, file=sys.stderr))
+    print(json.dumps(manifest, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
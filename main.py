@@ -3,17 +3,22 @@
 """
 Excel关键字搜索工具
 一个专业的工具，用于在目录中搜索Excel文件中的关键字。
+
+不带参数运行时启动图形界面；以 --cli 开头时在命令行中搜索，不加载图形界面：
+    python main.py --cli 目录 关键字 [选项]
 """
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
-from src.main_window import MainWindow
-from src.utils.logger import setup_logging
+import multiprocessing
 
 def main():
     """主应用程序入口点"""
+    # 图形界面模块较大，只在启动图形界面时导入
+    from PyQt6.QtWidgets import QApplication
+    from src.main_window import MainWindow
+    from src.utils.logger import setup_logging
+    
     # 设置日志
     setup_logging()
     
@@ -34,4 +39,9 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # 打包为可执行文件时，进程池的子进程需要此调用
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == '--cli':
+        from src.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[2:]))
     main()
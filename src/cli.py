@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel关键字搜索工具命令行模块
+
+不启动图形界面，直接驱动搜索引擎，把找到的文件以JSON Lines或CSV格式逐条写到标准输出，
+适合计划任务或没有显示环境的服务器。直接使用搜索核心（SearchCore），不导入Qt。
+
+用法：
+    python main.py --cli 目录 关键字 [关键字 ...] [选项]
+    python -m src.cli 目录 关键字 [关键字 ...] [选项]
+
+退出码：0=找到匹配的文件，1=没有找到，2=参数或搜索出错，130=被用户中断。
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import signal
+import sys
+import time
+
+from .xlsx_stream import LIMIT_ROWS, LIMIT_CELLS, LIMIT_BYTES
+
+EXIT_FOUND = 0
+EXIT_NOT_FOUND = 1
+EXIT_ERROR = 2
+EXIT_INTERRUPTED = 130
+
+# 命令行文件类型 -> 搜索引擎的文件类型过滤器
+FILE_TYPES = {
+    'excel': "All Excel Files (.xlsx, .xls)",
+    'xlsx': "Excel 2007+ (.xlsx)",
+    'xls': "Excel 97-2003 (.xls)",
+    'all': "All Files",
+}
+
+# 命令行快速搜索上限单位 -> (搜索引擎的上限单位, 换算倍数)
+QUICK_UNITS = {
+    'rows': (LIMIT_ROWS, 1),
+    'cells': (LIMIT_CELLS, 1),
+    'kb': (LIMIT_BYTES, 1024),
+}
+
+MB = 1024 * 1024
+
+CSV_FIELDS = ['path', 'name', 'size', 'modified', 'matches', 'term_matches', 'hits']
+
+
+def build_parser():
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog='excel-search',
+        description="在目录中搜索Excel文件中的关键字，结果逐条写到标准输出",
+        epilog="退出码：0=找到匹配的文件，1=没有找到，2=出错，130=被中断"
+    )
+    parser.add_argument('directory', help="搜索目录")
+    parser.add_argument('keywords', nargs='*', help="搜索关键字（可以有多个，也可以用分号分隔）")
+    parser.add_argument('-f', '--terms-file', help="从文本文件或Excel文件读取搜索词")
+    parser.add_argument('-c', '--case-sensitive', action='store_true', help="区分大小写")
+    parser.add_argument('-w', '--whole-word', action='store_true', help="完整单词匹配")
+    parser.add_argument('--no-subdirs', action='store_true', help="不搜索子目录")
+    parser.add_argument('-t', '--type', choices=sorted(FILE_TYPES), default='excel',
+                        help="文件类型（默认：excel，即.xlsx和.xls；all还包括.csv和.txt文本文件）")
+    parser.add_argument('--quick', action='store_true',
+                        help="快速搜索：每个工作表只读取开头部分（默认前1000行，见--quick-limit）")
+    parser.add_argument('--quick-limit', type=int, default=1000, metavar='N',
+                        help="快速搜索时每个工作表读取的上限（默认：1000）")
+    parser.add_argument('--quick-unit', choices=sorted(QUICK_UNITS), default='rows',
+                        help="快速搜索上限的单位：行数、非空单元格数或.xlsx工作表XML的KB数（默认：rows）")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="并行搜索的工作进程数（1=单进程顺序搜索）")
+    parser.add_argument('--index', metavar='PATH',
+                        help="使用内容索引数据库，索引中未修改的文件不再解析；"
+                             "搜索完成后更新索引（只解析新增或修改过的文件，数据库不存在时创建）")
+    parser.add_argument('--fingerprints', metavar='PATH',
+                        help="把文件内容指纹保存到数据库，之后的搜索直接识别内容相同的文件")
+    parser.add_argument('--no-dedupe', action='store_true', help="内容相同的文件也分别解析")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help="输出格式（默认：jsonl）")
+    parser.add_argument('--preview', action='store_true',
+                        help="在jsonl输出中包含匹配行的预览（搜索只记录匹配坐标，需要重新读取每个找到的文件）")
+    parser.add_argument('--max-file-size', type=float, default=0, metavar='MB',
+                        help="跳过大于该大小的文件（0=不限制）")
+    parser.add_argument('--max-file-seconds', type=float, default=0, metavar='SECONDS',
+                        help="单个文件解析超过该秒数时跳过（0=不限制）")
+    parser.add_argument('--max-file-cells', type=int, default=0, metavar='N',
+                        help="单个文件读取超过该单元格数时跳过（0=不限制）")
+    parser.add_argument('--max-file-memory', type=float, default=0, metavar='MB',
+                        help="解析单个文件的内存增长超过该值时跳过（0=不限制）")
+    parser.add_argument('--isolate', action='store_true',
+                        help="在可终止的工作进程中解析文件，打开工作簿期间也强制执行耗时和内存上限")
+    parser.add_argument('--skipped', metavar='PATH',
+                        help="把超出上限被跳过的文件路径写入文件（每行一个，可用--files-from重试）")
+    parser.add_argument('--files-from', metavar='PATH',
+                        help="只搜索文件中列出的路径（每行一个），不遍历目录")
+    parser.add_argument('--stats', metavar='PATH',
+                        help="把各阶段耗时和最慢文件导出到文件（.json为完整报告，.csv为最慢文件列表）")
+    parser.add_argument('-q', '--quiet', action='store_true', help="不在标准错误输出中打印搜索摘要")
+    parser.add_argument('-v', '--verbose', action='store_true', help="在标准错误输出中打印详细日志")
+    return parser
+
+
+def to_record(file_info, preview=None):
+    """把搜索引擎的文件结果转换为可序列化的记录，preview不为None时包含预览行"""
+    from .utils.formatting import column_letter
+
+    record = {
+        'path': file_info['path'],
+        'name': file_info['name'],
+        'size': file_info['size_bytes'],
+        'modified': file_info['modified'],
+        'mtime': file_info['mtime'],
+        'matches': file_info['matches'],
+        'term_matches': file_info.get('term_matches', {}),
+        'hits': [
+            {'sheet': sheet, 'row': row, 'col': col, 'cell': f"{column_letter(col)}{row}"}
+            for sheet, row, col in file_info.get('hits', [])
+        ],
+    }
+    if preview is not None:
+        record['preview'] = preview
+    return record
+
+
+def read_preview(file_info, pattern):
+    """按匹配坐标重新读取文件，返回匹配行的预览文本行（读取失败时为空列表）"""
+    from .preview import load_preview, preview_to_lines
+
+    try:
+        return preview_to_lines(load_preview(file_info['path'], file_info.get('hits', []), pattern, context_rows=0))
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"读取 {file_info['path']} 的预览失败: {str(e)}")
+        return []
+
+
+class ResultWriter:
+    """把搜索结果逐条写到输出流，每批结果写完后立即刷新
+
+    preview_pattern不为None时（jsonl格式）为每个结果读取预览，用该匹配器截取匹配附近的文本。
+    """
+
+    def __init__(self, stream, output_format, preview_pattern=None):
+        self.stream = stream
+        self.output_format = output_format
+        self.preview_pattern = preview_pattern if output_format == 'jsonl' else None
+        self.count = 0
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, file_infos):
+        """写入一批文件结果"""
+        for file_info in file_infos:
+            preview = read_preview(file_info, self.preview_pattern) if self.preview_pattern is not None else None
+            record = to_record(file_info, preview)
+            if self.output_format == 'csv':
+                record['term_matches'] = '; '.join(
+                    f"{term}: {count}" for term, count in record['term_matches'].items()
+                )
+                record['hits'] = '; '.join(f"{hit['sheet']}!{hit['cell']}" for hit in record['hits'])
+                self._csv.writerow(record)
+            else:
+                self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.count += 1
+        self.stream.flush()
+
+
+def run_search(args):
+    """执行搜索并返回退出码"""
+    from .search_core import SearchCore
+    from .file_budget import FileBudget
+    from .term_matcher import load_terms, split_terms, build_matcher
+
+    directory = os.path.abspath(args.directory)
+    if not os.path.isdir(directory):
+        print(f"错误：目录不存在: {args.directory}", file=sys.stderr)
+        return EXIT_ERROR
+
+    terms = split_terms('\n'.join(args.keywords))
+    if args.terms_file:
+        try:
+            terms += [term for term in load_terms(args.terms_file) if term not in terms]
+        except Exception as e:
+            print(f"错误：无法读取搜索词文件 {args.terms_file}: {str(e)}", file=sys.stderr)
+            return EXIT_ERROR
+    if not terms:
+        print("错误：请指定至少一个搜索关键字", file=sys.stderr)
+        return EXIT_ERROR
+
+    file_list = None
+    if args.files_from:
+        try:
+            with open(args.files_from, encoding='utf-8') as f:
+                file_list = [os.path.abspath(line.strip()) for line in f if line.strip()]
+        except OSError as e:
+            print(f"错误：无法读取文件列表 {args.files_from}: {str(e)}", file=sys.stderr)
+            return EXIT_ERROR
+
+    engine = SearchCore()
+    engine.set_search_params(
+        directory=directory,
+        keyword=terms,
+        case_sensitive=args.case_sensitive,
+        whole_word=args.whole_word,
+        include_subdirs=not args.no_subdirs,
+        file_type=FILE_TYPES[args.type],
+        complete_search=not args.quick,
+        quick_limit=max(1, args.quick_limit) * QUICK_UNITS[args.quick_unit][1],
+        quick_limit_unit=QUICK_UNITS[args.quick_unit][0],
+        max_workers=args.workers,
+        index_path=args.index,
+        budget=FileBudget(
+            max_size=int(args.max_file_size * MB),
+            max_seconds=args.max_file_seconds,
+            max_cells=args.max_file_cells,
+            max_memory=int(args.max_file_memory * MB)
+        )
+    )
+    engine.isolate_parsing = args.isolate
+    engine.dedupe_content = not args.no_dedupe
+    engine.fingerprint_path = args.fingerprints
+    engine.file_list = file_list
+
+    preview_pattern = build_matcher(terms, args.case_sensitive, args.whole_word) if args.preview else None
+    writer = ResultWriter(sys.stdout, args.format, preview_pattern)
+    state = {'interrupted': False, 'broken_pipe': False, 'error': None, 'total': 0}
+
+    def on_files_found(file_infos):
+        if state['broken_pipe']:
+            return
+        try:
+            writer.write(file_infos)
+        except BrokenPipeError:
+            # 下游（如head）已关闭管道，不再需要更多结果
+            state['broken_pipe'] = True
+            engine.stop_search()
+
+    def on_search_finished(total_files, found_files):
+        state['total'] = total_files
+
+    def on_search_error(message):
+        state['error'] = message
+
+    def on_interrupt(signum, frame):
+        # 第一次Ctrl+C停止搜索并输出已找到的结果，再次按下时立即退出
+        state['interrupted'] = True
+        engine.stop_search()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # start_search在当前线程中执行，期间直接调用这些回调
+    engine.on_files_found = on_files_found
+    engine.on_finished = on_search_finished
+    engine.on_error = on_search_error
+    previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+
+    start = time.perf_counter()
+    try:
+        engine.start_search()
+    except KeyboardInterrupt:
+        state['interrupted'] = True
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    elapsed = time.perf_counter() - start
+
+    # 与图形界面相同：搜索完成后更新内容索引（只搜索指定文件时不更新）
+    if (args.index and file_list is None and state['error'] is None
+            and not state['interrupted'] and not state['broken_pipe']):
+        update_index(engine, args.quiet)
+
+    if args.stats and engine.stats is not None:
+        try:
+            engine.stats.export(args.stats)
+        except OSError as e:
+            print(f"错误：无法导出耗时统计 {args.stats}: {str(e)}", file=sys.stderr)
+
+    if args.skipped:
+        try:
+            with open(args.skipped, 'w', encoding='utf-8') as f:
+                f.writelines(f"{file_path}\n" for file_path in engine.skipped_files)
+        except OSError as e:
+            print(f"错误：无法写入跳过的文件列表 {args.skipped}: {str(e)}", file=sys.stderr)
+
+    if state['broken_pipe']:
+        # 避免解释器退出时刷新已关闭的标准输出再次报错
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return EXIT_FOUND
+
+    if not args.quiet:
+        print(f"在 {state['total']} 个文件中找到 {writer.count} 个包含关键字的文件，耗时 {elapsed:.2f} 秒",
+              file=sys.stderr)
+        if engine.skipped_files:
+            print(f"{len(engine.skipped_files)} 个文件超出单文件上限被跳过", file=sys.stderr)
+    if state['error'] is not None:
+        print(f"错误：{state['error']}", file=sys.stderr)
+        return EXIT_ERROR
+    if state['interrupted']:
+        return EXIT_INTERRUPTED
+    return EXIT_FOUND if writer.count else EXIT_NOT_FOUND
+
+
+def update_index(engine, quiet=False):
+    """按搜索的目录和文件类型更新内容索引，只重新解析新增或修改过的文件"""
+    result = {}
+    engine.on_index_finished = lambda updated_files, total_files: result.update(updated=updated_files)
+    start = time.perf_counter()
+    try:
+        engine.start_indexing()
+    except KeyboardInterrupt:
+        # 中断时已索引的文件保留在数据库中，下次继续
+        engine.stop_search()
+        return
+    if not quiet and 'updated' in result:
+        print(f"内容索引已更新：重新索引了 {result['updated']} 个文件，耗时 {time.perf_counter() - start:.2f} 秒",
+              file=sys.stderr)
+
+
+def main(argv=None):
+    """命令行入口点，返回退出码"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+    try:
+        return run_search(args)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存设置对话框模块
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QLabel, QSpinBox,
+    QComboBox, QCheckBox, QPushButton, QDialogButtonBox
+)
+from ..sheet_cache import POLICY_LRU, POLICY_LARGEST
+from ..utils.i18n import get_text
+
+MB = 1024 * 1024
+
+
+class CacheSettingsDialog(QDialog):
+    """缓存设置对话框：设置搜索结果缓存和工作表内容缓存的上限，显示当前占用，可清空缓存
+
+    unreadable_cache不为None时同时显示记录的无法读取的文件数，可以清空后重新尝试解析。
+    """
+
+    def __init__(self, result_cache, sheet_cache, spill_dir, parent=None, unreadable_cache=None):
+        super().__init__(parent)
+        self.result_cache = result_cache
+        self.sheet_cache = sheet_cache
+        self.unreadable_cache = unreadable_cache
+        self.spill_dir = spill_dir  # 启用磁盘缓存时使用的目录
+        self.init_ui()
+        self.update_usage()
+
+    def init_ui(self):
+        """初始化用户界面"""
+        self.setWindowTitle(get_text("Cache Settings"))
+        layout = QVBoxLayout(self)
+
+        # 搜索结果缓存
+        result_group = QGroupBox(get_text("Search Result Cache"))
+        result_layout = QVBoxLayout(result_group)
+        form_layout = QFormLayout()
+        self.entries_spin = QSpinBox()
+        self.entries_spin.setRange(0, 1000)
+        self.entries_spin.setValue(self.result_cache.max_entries)
+        self.entries_spin.setToolTip(get_text("Cached Searches Tooltip"))
+        form_layout.addRow(get_text("Cached Searches:"), self.entries_spin)
+
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setRange(1, 16384)
+        self.memory_spin.setSuffix(" MB")
+        self.memory_spin.setValue(max(1, self.result_cache.max_bytes // MB))
+        form_layout.addRow(get_text("Result Cache Memory Limit:"), self.memory_spin)
+        result_layout.addLayout(form_layout)
+
+        usage_layout = QHBoxLayout()
+        self.usage_label = QLabel()
+        usage_layout.addWidget(self.usage_label, 1)
+        self.clear_btn = QPushButton(get_text("Clear Cache"))
+        self.clear_btn.clicked.connect(self.clear_cache)
+        usage_layout.addWidget(self.clear_btn)
+        result_layout.addLayout(usage_layout)
+        layout.addWidget(result_group)
+
+        # 工作表内容缓存
+        sheet_group = QGroupBox(get_text("Sheet Content Cache"))
+        sheet_group.setToolTip(get_text("Sheet Content Cache Tooltip"))
+        sheet_layout = QVBoxLayout(sheet_group)
+        form_layout = QFormLayout()
+        self.sheet_memory_spin = QSpinBox()
+        self.sheet_memory_spin.setRange(0, 65536)
+        self.sheet_memory_spin.setSuffix(" MB")
+        self.sheet_memory_spin.setValue(self.sheet_cache.max_bytes // MB)
+        form_layout.addRow(get_text("Memory Limit:"), self.sheet_memory_spin)
+
+        self.policy_combo = QComboBox()
+        self.policy_combo.addItem(get_text("Least Recently Used"), POLICY_LRU)
+        self.policy_combo.addItem(get_text("Largest First"), POLICY_LARGEST)
+        self.policy_combo.setCurrentIndex(max(0, self.policy_combo.findData(self.sheet_cache.policy)))
+        form_layout.addRow(get_text("Eviction Policy:"), self.policy_combo)
+
+        self.spill_cb = QCheckBox(get_text("Spill Evicted Sheets to Disk"))
+        self.spill_cb.setChecked(bool(self.sheet_cache.spill_dir))
+        self.spill_cb.setToolTip(self.spill_dir)
+        form_layout.addRow(self.spill_cb)
+
+        self.disk_spin = QSpinBox()
+        self.disk_spin.setRange(1, 1024 * 1024)
+        self.disk_spin.setSuffix(" MB")
+        self.disk_spin.setValue(max(1, self.sheet_cache.max_disk_bytes // MB))
+        self.disk_spin.setEnabled(self.spill_cb.isChecked())
+        self.spill_cb.toggled.connect(self.disk_spin.setEnabled)
+        form_layout.addRow(get_text("Disk Limit:"), self.disk_spin)
+        sheet_layout.addLayout(form_layout)
+
+        usage_layout = QHBoxLayout()
+        self.sheet_usage_label = QLabel()
+        usage_layout.addWidget(self.sheet_usage_label, 1)
+        self.clear_sheet_btn = QPushButton(get_text("Clear Cache"))
+        self.clear_sheet_btn.clicked.connect(self.clear_sheet_cache)
+        usage_layout.addWidget(self.clear_sheet_btn)
+        sheet_layout.addLayout(usage_layout)
+        layout.addWidget(sheet_group)
+
+        # 无法读取的文件
+        if self.unreadable_cache is not None:
+            unreadable_group = QGroupBox(get_text("Unreadable Files"))
+            unreadable_group.setToolTip(get_text("Unreadable Files Tooltip"))
+            usage_layout = QHBoxLayout(unreadable_group)
+            self.unreadable_label = QLabel()
+            usage_layout.addWidget(self.unreadable_label, 1)
+            self.clear_unreadable_btn = QPushButton(get_text("Clear Cache"))
+            self.clear_unreadable_btn.clicked.connect(self.clear_unreadable_cache)
+            usage_layout.addWidget(self.clear_unreadable_btn)
+            layout.addWidget(unreadable_group)
+
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def update_usage(self):
+        """显示当前缓存占用"""
+        entries, total_bytes = self.result_cache.stats()
+        self.usage_label.setText(
+            get_text("Cached: {} searches, {:.1f} MB").format(entries, total_bytes / MB)
+        )
+        files, memory_bytes, disk_bytes = self.sheet_cache.stats()
+        self.sheet_usage_label.setText(
+            get_text("Cached: {} files, {:.1f} MB in memory, {:.1f} MB on disk").format(
+                files, memory_bytes / MB, disk_bytes / MB
+            )
+        )
+        if self.unreadable_cache is not None:
+            self.unreadable_label.setText(
+                get_text("{} files skipped until modified").format(len(self.unreadable_cache))
+            )
+
+    def clear_cache(self):
+        """清空搜索结果缓存"""
+        self.result_cache.clear()
+        self.update_usage()
+
+    def clear_sheet_cache(self):
+        """清空工作表内容缓存（包括磁盘缓存）"""
+        self.sheet_cache.clear()
+        self.update_usage()
+
+    def clear_unreadable_cache(self):
+        """清空无法读取的文件记录，下次搜索时重新尝试解析这些文件"""
+        self.unreadable_cache.clear()
+        self.update_usage()
+
+    def apply_settings(self):
+        """把对话框中的设置应用到缓存"""
+        self.result_cache.set_limits(self.entries_spin.value(), self.memory_spin.value() * MB)
+        self.sheet_cache.set_limits(
+            self.sheet_memory_spin.value() * MB,
+            self.policy_combo.currentData(),
+            self.spill_dir if self.spill_cb.isChecked() else None,
+            self.disk_spin.value() * MB
+        )
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单文件资源上限设置对话框模块
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QGroupBox, QLabel, QSpinBox, QDoubleSpinBox, QCheckBox,
+    QDialogButtonBox
+)
+from ..file_budget import FileBudget
+from ..utils.i18n import get_text
+
+MB = 1024 * 1024
+
+
+class FileLimitsDialog(QDialog):
+    """单文件资源上限对话框：设置文件大小、解析耗时、单元格数、内存上限和隔离解析（0为不限制）"""
+
+    def __init__(self, budget, isolate_parsing, parent=None):
+        super().__init__(parent)
+        self.budget = budget
+        self.isolate_parsing = isolate_parsing
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化用户界面"""
+        self.setWindowTitle(get_text("File Limits"))
+        layout = QVBoxLayout(self)
+
+        limits_group = QGroupBox(get_text("Per-File Limits"))
+        limits_layout = QVBoxLayout(limits_group)
+        hint_label = QLabel(get_text("File Limits Hint"))
+        hint_label.setWordWrap(True)
+        limits_layout.addWidget(hint_label)
+
+        form_layout = QFormLayout()
+        unlimited = get_text("Unlimited")
+        self.size_spin = QSpinBox()
+        self.size_spin.setRange(0, 1024 * 1024)
+        self.size_spin.setSuffix(" MB")
+        self.size_spin.setSpecialValueText(unlimited)
+        self.size_spin.setValue(self.budget.max_size // MB)
+        form_layout.addRow(get_text("Max File Size:"), self.size_spin)
+
+        self.seconds_spin = QDoubleSpinBox()
+        self.seconds_spin.setRange(0, 3600)
+        self.seconds_spin.setDecimals(1)
+        self.seconds_spin.setSuffix(" s")
+        self.seconds_spin.setSpecialValueText(unlimited)
+        self.seconds_spin.setValue(self.budget.max_seconds)
+        form_layout.addRow(get_text("Max Parse Time:"), self.seconds_spin)
+
+        self.cells_spin = QSpinBox()
+        self.cells_spin.setRange(0, 2000000000)
+        self.cells_spin.setSingleStep(100000)
+        self.cells_spin.setGroupSeparatorShown(True)
+        self.cells_spin.setSpecialValueText(unlimited)
+        self.cells_spin.setValue(self.budget.max_cells)
+        form_layout.addRow(get_text("Max Cells:"), self.cells_spin)
+
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setRange(0, 65536)
+        self.memory_spin.setSuffix(" MB")
+        self.memory_spin.setSpecialValueText(unlimited)
+        self.memory_spin.setValue(self.budget.max_memory // MB)
+        form_layout.addRow(get_text("Max Memory:"), self.memory_spin)
+        limits_layout.addLayout(form_layout)
+        layout.addWidget(limits_group)
+
+        self.isolate_cb = QCheckBox(get_text("Parse Files in Separate Processes"))
+        self.isolate_cb.setToolTip(get_text("Parse Files in Separate Processes Tooltip"))
+        self.isolate_cb.setChecked(self.isolate_parsing)
+        layout.addWidget(self.isolate_cb)
+
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def get_budget(self):
+        """返回对话框中设置的资源上限"""
+        return FileBudget(
+            max_size=self.size_spin.value() * MB,
+            max_seconds=self.seconds_spin.value(),
+            max_cells=self.cells_spin.value(),
+            max_memory=self.memory_spin.value() * MB
+        )
+
+    def get_isolate_parsing(self):
+        """返回是否在单独的进程中解析文件"""
+        return self.isolate_cb.isChecked()
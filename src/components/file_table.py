@@ -7,47 +7,292 @@
 import os
 import subprocess
 import platform
+from array import array
 from PyQt6.QtWidgets import (
-    QTableWidget, QTableWidgetItem, QHeaderView, QMenu, QMessageBox
+    QTableView, QHeaderView, QMenu, QMessageBox, QAbstractItemView
+)
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QTimer
 )
-from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QAction, QCursor
 from ..utils.logger import get_logger
 from ..utils.i18n import get_text
+from ..utils.formatting import format_file_size, format_mtime
 
 logger = get_logger(__name__)
 
-class FileTableWidget(QTableWidget):
-    """文件结果表格组件"""
+
+def format_term_matches(term_matches):
+    """把 {搜索词: 匹配数} 格式化为显示文本，如 invoice: 3; refund: 1"""
+    return '; '.join(f"{term}: {count}" for term, count in term_matches.items())
+
+
+class FileTableModel(QAbstractTableModel):
+    """文件结果表格模型
+    
+    按列保存结果：数值列使用紧凑的array，文本列只保存路径等必要的字符串，匹配只保存坐标（预览在选中时才读取），
+    显示文本（文件名、大小、时间等）在视图需要时才生成，每行的额外开销是固定的。
+    """
+    
+    COLUMN_COUNT = 6
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header_labels = [""] * self.COLUMN_COUNT
+        self._init_columns()
+        
+    def _init_columns(self):
+        self._paths = []
+        self._sizes = array('q')
+        self._mtimes = array('d')
+        self._matches = array('q')
+        self._term_matches = []  # 多个搜索词时为 {搜索词: 匹配数}，否则为None
+        self._hits = []
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.COLUMN_COUNT
+        
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.header_labels[section]
+        return None
+        
+    def set_header_labels(self, labels):
+        """设置表头文本"""
+        self.header_labels = list(labels)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.COLUMN_COUNT - 1)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display_text(row, column)
+        if role == Qt.ItemDataRole.ToolTipRole and column in (0, 1, 5):
+            return self._display_text(row, column)
+        return None
+        
+    def _display_text(self, row, column):
+        if column == 0:
+            return os.path.basename(self._paths[row])
+        if column == 1:
+            return self._paths[row]
+        if column == 2:
+            return format_file_size(self._sizes[row])
+        if column == 3:
+            return format_mtime(self._mtimes[row])
+        if column == 4:
+            return str(self._matches[row])
+        term_matches = self._term_matches[row]
+        return format_term_matches(term_matches) if term_matches else ""
+        
+    def sort_keys(self, column, first=0):
+        """返回从first行开始各行在指定列上的排序键（数值列为原始数值，文本列不区分大小写）"""
+        if column == 2:
+            return self._sizes[first:]
+        if column == 3:
+            return self._mtimes[first:]
+        if column == 4:
+            return self._matches[first:]
+        return [self._display_text(row, column).lower() for row in range(first, len(self._paths))]
+        
+    def append_files(self, file_infos):
+        """批量追加文件结果（只发出一次行插入通知）"""
+        if not file_infos:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(file_infos) - 1)
+        for file_info in file_infos:
+            self._paths.append(file_info['path'])
+            self._sizes.append(file_info.get('size_bytes', 0))
+            self._mtimes.append(file_info.get('mtime', 0.0))
+            self._matches.append(file_info['matches'])
+            self._term_matches.append(file_info.get('term_matches') or None)
+            self._hits.append(file_info.get('hits') or None)
+        self.endInsertRows()
+        
+    def clear(self):
+        """清空所有结果"""
+        self.beginResetModel()
+        self._init_columns()
+        self.endResetModel()
+        
+    def get_file_info(self, row):
+        """获取指定行（模型行号）的文件信息"""
+        if not 0 <= row < len(self._paths):
+            return None
+        path = self._paths[row]
+        return {
+            'name': os.path.basename(path),
+            'path': path,
+            'size': format_file_size(self._sizes[row]),
+            'modified': format_mtime(self._mtimes[row]),
+            'size_bytes': self._sizes[row],
+            'mtime': self._mtimes[row],
+            'matches': self._matches[row],
+            'hits': self._hits[row] or [],
+            'term_matches': self._term_matches[row] or {}
+        }
+
+
+class SortProxyModel(QAbstractProxyModel):
+    """按列排序的代理模型
+    
+    QSortFilterProxyModel排序时每次比较都要通过data()取值，对Python实现的模型非常慢。
+    这里直接从源模型取出整列的排序键，用Python的sorted一次得到行顺序。
+    未排序时行顺序与源模型相同；排序后新追加的行合并进已有顺序（timsort对已有序的部分几乎是线性的）。
+    源模型只会在末尾追加行或整体重置。
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._order = None  # 视图行 -> 源行（None表示未排序）
+        self._positions = None  # 源行 -> 视图行（需要时才计算）
+        self._keys = []  # 排序列的排序键（按源行）
+        
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_model_reset)
+        model.headerDataChanged.connect(self.headerDataChanged)
+        
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+        
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().rowCount()
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+        
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        return self.sourceModel().headerData(section, orientation, role)
+        
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._order is not None:
+            row = self._order[row]
+        return self.sourceModel().index(row, proxy_index.column())
+        
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._order is not None:
+            if self._positions is None:
+                self._positions = [0] * len(self._order)
+                for position, source_row in enumerate(self._order):
+                    self._positions[source_row] = position
+            row = self._positions[row]
+        return self.createIndex(row, source_index.column())
+        
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """按列排序（column为-1时恢复源模型的顺序）"""
+        self._sort_column = column
+        self._sort_order = order
+        self._keys = self.sourceModel().sort_keys(column) if column >= 0 else []
+        self._relayout(list(range(self.sourceModel().rowCount())) if column >= 0 else None)
+        
+    def _relayout(self, order):
+        """按新的行顺序重新排列，保持选中项等持久索引"""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        source_indexes = [self.mapToSource(index) for index in old_indexes]
+        if order is not None:
+            order.sort(key=self._keys.__getitem__, reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        self._order = order
+        self._positions = None
+        self.changePersistentIndexList(old_indexes, [self.mapFromSource(index) for index in source_indexes])
+        self.layoutChanged.emit()
+        
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        # 新行先追加在末尾，排序状态下随后重新排列
+        self.beginInsertRows(QModelIndex(), first, last)
+        
+    def _on_rows_inserted(self, parent, first, last):
+        if self._order is not None:
+            self._order.extend(range(first, last + 1))
+            self._keys += self.sourceModel().sort_keys(self._sort_column, first)
+            self._positions = None
+        self.endInsertRows()
+        if self._order is not None:
+            self._relayout(self._order)
+            
+    def _on_model_reset(self):
+        if self._order is not None:
+            self._order = []
+            self._keys = self.sourceModel().sort_keys(self._sort_column)
+        self._positions = None
+        self.endResetModel()
+
+
+class FileTableWidget(QTableView):
+    """文件结果表格组件
+    
+    基于FileTableModel和SortProxyModel的虚拟化表格：只绘制可见的行，
+    add_file的结果先放入缓冲区，由定时器批量插入模型；排序由代理模型完成，
+    只在用户点击表头时进行。
+    """
     
     # 信号定义
     file_double_clicked = pyqtSignal(str)  # 双击文件时发出信号
+    itemSelectionChanged = pyqtSignal()  # 选中的行变化时发出信号
+    
+    FLUSH_INTERVAL = 100  # 批量插入缓冲结果的间隔（毫秒）
     
     def __init__(self):
         super().__init__()
-        self.file_data = []  # 存储文件数据
+        self.file_model = FileTableModel(self)
+        self.proxy_model = SortProxyModel(self)
+        self.proxy_model.setSourceModel(self.file_model)
+        self.setModel(self.proxy_model)
+        
+        self._pending = []  # 等待批量插入的文件结果
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self.flush)
+        
         self.init_ui()
         
     def init_ui(self):
         """初始化用户界面"""
-        # 设置表格属性
-        self.setColumnCount(5)
-        self.setHorizontalHeaderLabels([
+        self.set_header_labels([
             get_text("File Name"),
             get_text("Path"),
             get_text("Size"),
             get_text("Modified"),
-            get_text("Keyword Matches")
+            get_text("Keyword Matches"),
+            get_text("Term Matches")
         ])
         
         # 设置表格样式
         self.setAlternatingRowColors(True)
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # 初始不排序（按找到的顺序显示），点击表头后才排序
+        self.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.setSortingEnabled(True)
         
-        # 隐藏行号
+        # 隐藏行号，固定行高（避免逐行计算行高）
         self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         
         # 设置网格
         self.setShowGrid(True)
@@ -56,8 +301,6 @@ class FileTableWidget(QTableWidget):
         # 禁用焦点框
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         
-
-        
         # 设置列宽
         header = self.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)  # 文件名 - 固定宽度
@@ -65,72 +308,72 @@ class FileTableWidget(QTableWidget):
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)  # 大小 - 固定宽度
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)  # 修改时间 - 固定宽度
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)  # 匹配数 - 固定宽度
+        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Interactive)  # 各搜索词匹配数 - 可调整
         
         # 设置固定列宽
         self.setColumnWidth(0, 200)  # 文件名列宽
         self.setColumnWidth(2, 80)   # 大小列宽
         self.setColumnWidth(3, 120)  # 修改时间列宽
         self.setColumnWidth(4, 100)  # 匹配数列宽
+        self.setColumnWidth(5, 200)  # 各搜索词匹配数列宽
         
         # 设置右键菜单
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
         
-        # 连接双击信号
-        self.itemDoubleClicked.connect(self.on_item_double_clicked)
-        
-    def add_file(self, file_info):
-        """添加文件到表格"""
-        row = self.rowCount()
-        self.insertRow(row)
-        logger.info(f"添加文件到表格第{row}行: {file_info['name']}")
-        
-        # 创建表格项
-        name_item = QTableWidgetItem(file_info['name'])
-        path_item = QTableWidgetItem(file_info['path'])
-        size_item = QTableWidgetItem(file_info['size'])
-        modified_item = QTableWidgetItem(file_info['modified'])
-        matches_item = QTableWidgetItem(str(file_info['matches']))
-        
-
+        # 连接双击和选择变化信号
+        self.doubleClicked.connect(self.on_item_double_clicked)
+        self.selectionModel().selectionChanged.connect(lambda *_: self.itemSelectionChanged.emit())
         
-        # 设置工具提示
-        name_item.setToolTip(file_info['name'])
-        path_item.setToolTip(file_info['path'])
+    def set_header_labels(self, labels):
+        """设置表头文本"""
+        self.file_model.set_header_labels(labels)
         
-        # 设置项目不可编辑
-        name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        path_item.setFlags(path_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        size_item.setFlags(size_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        modified_item.setFlags(modified_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        matches_item.setFlags(matches_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+    def add_file(self, file_info):
+        """添加文件到表格（放入缓冲区，稍后批量插入）"""
+        self._pending.append(file_info)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+            
+    def add_files(self, file_infos):
+        """批量添加文件到表格"""
+        self._pending.extend(file_infos)
+        self.flush()
         
-        # 添加到表格
-        self.setItem(row, 0, name_item)
-        self.setItem(row, 1, path_item)
-        self.setItem(row, 2, size_item)
-        self.setItem(row, 3, modified_item)
-        self.setItem(row, 4, matches_item)
+    def flush(self):
+        """把缓冲区中的结果插入表格"""
+        self._flush_timer.stop()
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.file_model.append_files(pending)
+            
+    def rowCount(self):
+        """表格行数（包括尚未插入的缓冲结果）"""
+        self.flush()
+        return self.proxy_model.rowCount()
         
-        # 存储文件数据
-        self.file_data.append(file_info)
+    def currentRow(self):
+        """当前行号（视图行号，没有当前行时为-1）"""
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
         
     def get_file_info(self, row):
-        """获取指定行的文件信息"""
-        if 0 <= row < len(self.file_data):
-            return self.file_data[row]
-        return None
+        """获取指定行（视图行号，已考虑排序）的文件信息"""
+        self.flush()
+        source_index = self.proxy_model.mapToSource(self.proxy_model.index(row, 0))
+        if not source_index.isValid():
+            return None
+        return self.file_model.get_file_info(source_index.row())
         
     def clear(self):
         """清空表格"""
-        # 只清除行数据，保留表头
-        self.setRowCount(0)
-        self.file_data.clear()
+        self._pending.clear()
+        self._flush_timer.stop()
+        self.file_model.clear()
         
-    def on_item_double_clicked(self, item):
+    def on_item_double_clicked(self, index):
         """处理项目双击事件"""
-        row = item.row()
-        file_info = self.get_file_info(row)
+        file_info = self.get_file_info(index.row())
         if file_info:
             self.file_double_clicked.emit(file_info['path'])
             self.open_file(file_info['path'])
@@ -186,7 +429,7 @@ class FileTableWidget(QTableWidget):
             
         except Exception as e:
             logger.error(f"打开文件失败 {file_path}: {str(e)}")
-            QMessageBox.warning(self, get_text("Warning"), 
+            QMessageBox.warning(self, get_text("Warning"),
                               f"{get_text('Failed to open file')}: {str(e)}")
                               
     def open_folder(self, file_path):
@@ -205,7 +448,7 @@ class FileTableWidget(QTableWidget):
             
         except Exception as e:
             logger.error(f"打开文件夹失败 {file_path}: {str(e)}")
-            QMessageBox.warning(self, get_text("Warning"), 
+            QMessageBox.warning(self, get_text("Warning"),
                               f"{get_text('Failed to open folder')}: {str(e)}")
                               
     def copy_path(self, file_path):
@@ -229,11 +472,10 @@ class FileTableWidget(QTableWidget):
     def get_selected_files(self):
         """获取选中的文件列表"""
         selected_files = []
-        for row in range(self.rowCount()):
-            if self.item(row, 0).isSelected():
-                file_info = self.get_file_info(row)
-                if file_info:
-                    selected_files.append(file_info)
+        for index in self.selectionModel().selectedRows():
+            file_info = self.get_file_info(index.row())
+            if file_info:
+                selected_files.append(file_info)
         return selected_files
         
     def select_all(self):
@@ -246,4 +488,4 @@ class FileTableWidget(QTableWidget):
         
     def sort_by_column(self, column, order):
         """按列排序"""
-        self.sortItems(column, order)
+        self.sortByColumn(column, order)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预览加载组件模块
+"""
+
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from ..preview import load_preview, preview_to_html
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _PreviewThread(QThread):
+    """在后台线程中读取一个文件的预览"""
+
+    loaded = pyqtSignal(object, str, str)  # 请求键, HTML, 错误信息
+
+    def __init__(self, key, file_info, pattern, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.file_info = file_info
+        self.pattern = pattern
+
+    def run(self):
+        try:
+            blocks = load_preview(self.file_info['path'], self.file_info.get('hits') or [], self.pattern)
+            self.loaded.emit(self.key, preview_to_html(blocks, self.pattern), "")
+        except Exception as e:
+            logger.warning(f"读取 {self.file_info['path']} 的预览失败: {str(e)}")
+            self.loaded.emit(self.key, "", str(e))
+
+
+class PreviewLoader(QObject):
+    """按需加载选中结果的预览
+
+    同一时间只有一个后台线程在读取文件：选择变化很快时（如用方向键浏览结果），
+    只保留最后一个请求，当前的读取完成后再开始。最近查看的预览按（路径、大小、修改时间）缓存。
+    """
+
+    preview_ready = pyqtSignal(dict, str)  # 文件结果, 预览HTML
+    preview_failed = pyqtSignal(dict, str)  # 文件结果, 错误信息
+
+    CACHE_SIZE = 32
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pattern = None  # 搜索时的匹配器，用于截取和加粗匹配的文字
+        self._thread = None
+        self._pending = None
+        self._current = None  # 最近一次请求的键
+        self._cache = OrderedDict()  # 键 -> HTML
+
+    def _key(self, file_info):
+        return file_info['path'], file_info.get('size_bytes'), file_info.get('mtime')
+
+    def set_pattern(self, pattern):
+        """设置新搜索的匹配器（同时清空缓存）"""
+        self.pattern = pattern
+        self._cache.clear()
+
+    def request(self, file_info):
+        """请求一个文件结果的预览；缓存中有时立即发出preview_ready"""
+        key = self._key(file_info)
+        self._current = key
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.preview_ready.emit(file_info, self._cache[key])
+            return
+        if self._thread is not None:
+            self._pending = (key, file_info)
+            return
+        self._start(key, file_info)
+
+    def _start(self, key, file_info):
+        self._thread = _PreviewThread(key, file_info, self.pattern, self)
+        self._thread.loaded.connect(self._on_loaded)
+        self._thread.finished.connect(self._on_finished)
+        self._thread.start()
+
+    def _on_loaded(self, key, html, error):
+        file_info = self._thread.file_info
+        if not error:
+            self._cache[key] = html
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        if key != self._current:
+            return
+        if error:
+            self.preview_failed.emit(file_info, error)
+        else:
+            self.preview_ready.emit(file_info, html)
+
+    def _on_finished(self):
+        self._thread.deleteLater()
+        self._thread = None
+        if self._pending is not None:
+            key, file_info = self._pending
+            self._pending = None
+            if key == self._current:
+                self._start(key, file_info)
+
+    def cancel(self):
+        """放弃尚未开始的请求（正在读取的结果到达后不再发出）"""
+        self._pending = None
+        self._current = None
+
+    def wait_finished(self):
+        """等待后台线程结束（关闭窗口时）"""
+        self._pending = None
+        if self._thread is not None:
+            self._thread.wait()
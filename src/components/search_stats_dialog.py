@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索耗时统计对话框模块
+"""
+
+import os
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QGroupBox, QFileDialog, QMessageBox, QSplitter
+)
+from ..search_stats import (
+    STAGES, FILE_STAGES, HISTOGRAM_LABELS, STAGE_ENUMERATE, STAGE_PREFILTER, STAGE_OPEN, STAGE_PARSE,
+    STAGE_MATCH, STAGE_INDEX, STAGE_GUI
+)
+from ..utils.formatting import format_file_size
+from ..utils.i18n import get_text
+
+# 阶段 -> 显示名称的翻译键
+STAGE_LABELS = {
+    STAGE_ENUMERATE: "Directory Scan",
+    STAGE_PREFILTER: "Prefilter",
+    STAGE_OPEN: "Open Workbook",
+    STAGE_PARSE: "Parse",
+    STAGE_MATCH: "Match",
+    STAGE_INDEX: "Index Lookup",
+    STAGE_GUI: "GUI Update",
+}
+
+
+def _item(value, align_right=False):
+    item = QTableWidgetItem(str(value))
+    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+    if align_right:
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+class SearchStatsDialog(QDialog):
+    """搜索耗时统计对话框：各阶段耗时、各解析器的耗时分布和最慢的文件，可导出为JSON或CSV"""
+
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.init_ui()
+        self.populate()
+
+    def init_ui(self):
+        """初始化用户界面"""
+        self.setWindowTitle(get_text("Search Statistics"))
+        self.resize(900, 650)
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        top_splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        stage_group = QGroupBox(get_text("Stages"))
+        stage_layout = QVBoxLayout(stage_group)
+        self.stage_table = self._create_table([get_text("Stage"), get_text("Time (s)"), get_text("Share")])
+        stage_layout.addWidget(self.stage_table)
+        top_splitter.addWidget(stage_group)
+
+        parser_group = QGroupBox(get_text("Parsers"))
+        parser_layout = QVBoxLayout(parser_group)
+        self.parser_table = self._create_table(
+            [get_text("Parser"), get_text("Files"), get_text("Time (s)"), get_text("Average (ms)")]
+            + list(HISTOGRAM_LABELS)
+        )
+        parser_layout.addWidget(self.parser_table)
+        top_splitter.addWidget(parser_group)
+        top_splitter.setSizes([300, 600])
+        splitter.addWidget(top_splitter)
+
+        slowest_group = QGroupBox(get_text("Slowest Files"))
+        slowest_layout = QVBoxLayout(slowest_group)
+        self.slowest_table = self._create_table(
+            [get_text("Path"), get_text("Parser"), get_text("Size"), get_text("Total (s)")]
+            + [get_text(STAGE_LABELS[stage]) for stage in FILE_STAGES]
+        )
+        self.slowest_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        slowest_layout.addWidget(self.slowest_table)
+        splitter.addWidget(slowest_group)
+        splitter.setSizes([220, 430])
+        layout.addWidget(splitter, 1)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.export_btn = QPushButton(get_text("Export..."))
+        self.export_btn.clicked.connect(self.export_stats)
+        button_layout.addWidget(self.export_btn)
+        close_btn = QPushButton(get_text("Close"))
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def _create_table(self, labels):
+        table = QTableWidget(0, len(labels))
+        table.setHorizontalHeaderLabels(labels)
+        table.verticalHeader().setVisible(False)
+        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        return table
+
+    def populate(self):
+        """把统计数据填入表格"""
+        data = self.stats.to_dict()
+        cached = sum(data['cached_files'].values())
+        summary = get_text("Search took {:.2f} s: {} files checked, {} failed, {} from cache or index").format(
+            data['wall_seconds'], data['checked_files'], data['failed_files'], cached
+        )
+        skipped = sum(data['skipped_files'].values())
+        if skipped:
+            summary += ' ' + get_text("{} files skipped for exceeding file limits").format(skipped)
+        if data['fallbacks']:
+            summary += '\n' + get_text("Parser fallbacks: {}").format(
+                ', '.join(f"{fallback} ×{count}" for fallback, count in data['fallbacks'].items())
+            )
+        self.summary_label.setText(summary)
+
+        stages = [(stage, data['stages'][stage]) for stage in STAGES if stage in data['stages']]
+        total = sum(seconds for _, seconds in stages) or 1.0
+        self.stage_table.setRowCount(len(stages))
+        for row, (stage, seconds) in enumerate(stages):
+            self.stage_table.setItem(row, 0, _item(get_text(STAGE_LABELS[stage])))
+            self.stage_table.setItem(row, 1, _item(f"{seconds:.3f}", True))
+            self.stage_table.setItem(row, 2, _item(f"{seconds / total:.1%}", True))
+
+        parsers = sorted(data['parsers'].items(), key=lambda item: -item[1]['seconds'])
+        self.parser_table.setRowCount(len(parsers))
+        for row, (name, parser) in enumerate(parsers):
+            average = parser['seconds'] / parser['files'] * 1000 if parser['files'] else 0.0
+            values = [parser['files'], f"{parser['seconds']:.3f}", f"{average:.1f}"]
+            values += [parser['histogram'][label] for label in HISTOGRAM_LABELS]
+            self.parser_table.setItem(row, 0, _item(name))
+            for col, value in enumerate(values, start=1):
+                self.parser_table.setItem(row, col, _item(value, True))
+
+        slowest = data['slowest_files']
+        self.slowest_table.setRowCount(len(slowest))
+        for row, timing in enumerate(slowest):
+            self.slowest_table.setItem(row, 0, _item(timing['path']))
+            self.slowest_table.setItem(row, 1, _item(timing['parser']))
+            self.slowest_table.setItem(row, 2, _item(format_file_size(timing['size']), True))
+            self.slowest_table.setItem(row, 3, _item(f"{timing['seconds']:.3f}", True))
+            for col, stage in enumerate(FILE_STAGES, start=4):
+                self.slowest_table.setItem(row, col, _item(f"{timing['stages'].get(stage, 0.0):.3f}", True))
+
+    def export_stats(self):
+        """导出统计为JSON（完整报告）或CSV（最慢文件列表）"""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, get_text("Export Statistics"), "search_stats.json",
+            get_text("JSON Report (*.json);;CSV Slowest Files (*.csv)")
+        )
+        if not file_path:
+            return
+        if not os.path.splitext(file_path)[1]:
+            file_path += '.csv' if '*.csv' in selected_filter else '.json'
+        try:
+            self.stats.export(file_path)
+        except Exception as e:
+            QMessageBox.warning(self, get_text("Warning"), f"{get_text('Failed to export statistics')}: {str(e)}")
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件内容指纹模块
+
+共享目录中常有大量内容完全相同的工作簿（个人目录中的副本、备份、"final_v2"之类的版本）。
+搜索时按内容把文件分组，每种内容只解析一次：只有大小相同的文件才需要比较，
+先读取开头和结尾各SAMPLE_SIZE字节计算快速指纹，快速指纹相同时再计算整个文件的指纹确认。
+指纹按 路径+文件状态 保存在SQLite数据库中，之后的搜索不必重新读取未修改的文件。
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 快速指纹读取的文件开头和结尾的字节数（不超过两倍于此的文件，快速指纹就是整个文件的指纹）
+SAMPLE_SIZE = 64 * 1024
+
+# 计算整个文件的指纹时每次读取的字节数
+READ_SIZE = 1024 * 1024
+
+_DIGEST_SIZE = 16
+
+
+def _new_digest(size):
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    digest.update(size.to_bytes(8, 'little'))
+    return digest
+
+
+def _unchanged(f, state):
+    """打开的文件与枚举时的状态（大小、修改时间）是否一致"""
+    stat = os.fstat(f.fileno())
+    return (stat.st_size, stat.st_mtime) == tuple(state[:2])
+
+
+def covers_whole_file(size):
+    """快速指纹是否已经包含整个文件的内容"""
+    return size <= 2 * SAMPLE_SIZE
+
+
+def quick_fingerprint(path, state):
+    """文件大小及开头、结尾各SAMPLE_SIZE字节的指纹（十六进制字符串）
+
+    state为枚举目录时得到的文件状态 (大小, 修改时间, ...)；文件之后被修改过时返回None。
+    """
+    size = state[0]
+    with open(path, 'rb') as f:
+        if not _unchanged(f, state):
+            return None
+        digest = _new_digest(size)
+        if covers_whole_file(size):
+            digest.update(f.read())
+        else:
+            digest.update(f.read(SAMPLE_SIZE))
+            f.seek(size - SAMPLE_SIZE)
+            digest.update(f.read(SAMPLE_SIZE))
+        return digest.hexdigest()
+
+
+def full_fingerprint(path, state):
+    """整个文件的指纹（十六进制字符串）；文件在枚举之后或读取期间被修改时返回None"""
+    with open(path, 'rb') as f:
+        if not _unchanged(f, state):
+            return None
+        digest = _new_digest(state[0])
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                break
+            digest.update(data)
+        if not _unchanged(f, state):
+            return None
+        return digest.hexdigest()
+
+
+class _Entry:
+    """一个文件的指纹（尚未计算时为None，无法计算时为空字符串）及其作为代表文件的结果"""
+
+    __slots__ = ('path', 'state', 'quick', 'full', 'outcome', 'waiting')
+
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+        self.quick = None
+        self.full = None
+        self.outcome = None  # 代表文件处理完成后的结果，见DuplicateFinder.done
+        self.waiting = []  # 等待这个代表文件结果的重复文件 [(路径, 文件状态)]
+
+
+class DuplicateFinder:
+    """在一次搜索中查找内容相同的文件
+
+    第一次出现的内容由其文件（代表文件）解析，之后内容相同的文件使用代表文件的结果。
+    大小不同的文件不可能相同，所以只有遇到大小相同的文件时才读取文件计算指纹。
+    代表文件按 (大小, 快速指纹) 和 (大小, 完整指纹) 分组，每个文件只需查找一次，不必与同样大小的代表文件逐个比较；
+    完整指纹也只在快速指纹相同的文件出现第二个时才计算。
+    known为之前保存的 {路径: (文件状态, 快速指纹, 完整指纹或None)}，状态未变的文件直接使用其中的指纹。
+    """
+
+    def __init__(self, known=None):
+        self._known = known or {}
+        self._by_size = {}  # 大小 -> 尚未计算指纹的第一个文件的_Entry（计算后为None）
+        self._by_quick = {}  # (大小, 快速指纹) -> 尚未计算完整指纹的第一个文件的_Entry（计算后为None）
+        self._by_full = {}  # (大小, 完整指纹) -> 代表文件的_Entry
+        self._representatives = {}  # 路径 -> 代表文件的_Entry
+        self._fingerprinted = {}  # 路径 -> 有指纹的_Entry（搜索结束后保存）
+        self.bytes_read = 0  # 计算指纹读取的字节数
+
+    def find(self, path, state):
+        """返回与path内容相同的代表文件路径；没有时把path记为新的代表文件，返回None"""
+        entry = _Entry(path, state)
+        size = state[0]
+        if size not in self._by_size:
+            # 第一个这样大小的文件：暂不计算指纹
+            self._by_size[size] = entry
+        else:
+            first = self._by_size[size]
+            if first is not None:
+                self._by_size[size] = None
+                self._place(first)
+            representative = self._place(entry)
+            if representative is not None:
+                return representative.path
+        self._representatives[path] = entry
+        return None
+
+    def outcome(self, representative):
+        """代表文件的结果，尚未处理完成时返回None"""
+        return self._representatives[representative].outcome
+
+    def wait(self, representative, path, state):
+        """记录等待代表文件结果的重复文件"""
+        self._representatives[representative].waiting.append((path, state))
+
+    def done(self, path, outcome):
+        """记录代表文件的结果，返回等待这个结果的重复文件 [(路径, 文件状态)]；path不是代表文件时返回空列表"""
+        entry = self._representatives.get(path)
+        if entry is None:
+            return []
+        entry.outcome = outcome
+        waiting, entry.waiting = entry.waiting, []
+        return waiting
+
+    def entries(self):
+        """本次搜索中计算或沿用了指纹的文件 [(路径, 文件状态, 快速指纹, 完整指纹或None)]"""
+        return [(entry.path, entry.state, entry.quick, entry.full or None)
+                for entry in self._fingerprinted.values() if entry.quick]
+
+    def _place(self, entry):
+        """按指纹查找与entry内容相同的代表文件；没有时把entry加入分组并返回None（无法读取的文件不加入）"""
+        quick = self._fingerprint(entry)
+        if not quick:
+            return None
+        size = entry.state[0]
+        key = (size, quick)
+        if key not in self._by_quick:
+            # 第一个这样快速指纹的文件：暂不计算完整指纹
+            self._by_quick[key] = entry
+            return None
+        first = self._by_quick[key]
+        if first is not None:
+            # 快速指纹相同：计算整个文件的指纹确认
+            self._by_quick[key] = None
+            full = self._fingerprint(first, True)
+            if full:
+                self._by_full.setdefault((size, full), first)
+        full = self._fingerprint(entry, True)
+        if not full:
+            return None
+        representative = self._by_full.setdefault((size, full), entry)
+        return None if representative is entry else representative
+
+    def _fingerprint(self, entry, full=False):
+        """返回文件的快速指纹或整个文件的指纹，需要时才读取文件；无法读取时返回空字符串"""
+        if entry.quick is None:
+            known = self._known.get(entry.path)
+            if known is not None and tuple(known[0]) == tuple(entry.state):
+                entry.quick, entry.full = known[1], known[2]
+            else:
+                entry.quick = self._read(quick_fingerprint, entry, min(entry.state[0], 2 * SAMPLE_SIZE))
+            self._fingerprinted[entry.path] = entry
+            if entry.quick and covers_whole_file(entry.state[0]):
+                # 快速指纹已包含整个文件，与完整指纹相同
+                entry.full = entry.quick
+        if not full:
+            return entry.quick
+        if entry.full is None:
+            entry.full = self._read(full_fingerprint, entry, entry.state[0])
+        return entry.full
+
+    def _read(self, fingerprint, entry, size):
+        try:
+            value = fingerprint(entry.path, entry.state)
+        except OSError as e:
+            logger.warning(f"无法读取 {entry.path} 计算内容指纹: {str(e)}")
+            return ''
+        self.bytes_read += size
+        return value or ''
+
+
+class FingerprintStore:
+    """保存在SQLite中的文件内容指纹
+
+    每个文件记录 (大小, 修改时间, inode) 和指纹，状态变化的文件在下次计算后被替换；
+    超过max_entries时删除最久没有用到的记录。SQLite连接不能跨线程使用，每个线程应各自创建实例。
+    """
+
+    def __init__(self, db_path, max_entries=200000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS fingerprints ('
+            'path TEXT PRIMARY KEY, size INTEGER, mtime REAL, inode INTEGER, quick TEXT, full TEXT, used REAL)'
+        )
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def load(self, directory):
+        """返回目录（及其子目录）中文件的 {路径: (文件状态, 快速指纹, 完整指纹或None)}"""
+        prefix = os.path.join(directory, '')
+        # 路径以prefix开头：按主键范围查询（prefix最后一个字符加一作为上界）
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        cursor = self.conn.execute(
+            'SELECT path, size, mtime, inode, quick, full FROM fingerprints WHERE path >= ? AND path < ?',
+            (prefix, upper)
+        )
+        return {path: ((size, mtime, inode), quick, full) for path, size, mtime, inode, quick, full in cursor}
+
+    def save(self, entries):
+        """写入（或替换）文件的指纹，entries为 (路径, 文件状态, 快速指纹, 完整指纹或None) 的可迭代对象"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO fingerprints (path, size, mtime, inode, quick, full, used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((path, state[0], state[1], state[2] if len(state) > 2 else None, quick, full, now)
+                 for path, state, quick, full in entries)
+            )
+            count = self.conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute(
+                    'DELETE FROM fingerprints WHERE path IN '
+                    '(SELECT path FROM fingerprints ORDER BY used LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+
+    def clear(self):
+        """删除所有记录"""
+        with self.conn:
+            self.conn.execute('DELETE FROM fingerprints')
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel内容持久化索引模块
+
+使用SQLite FTS5（trigram分词，支持任意子串匹配）保存所有单元格文本，
+按 路径+大小+修改时间+inode 判断索引是否仍然有效，重复搜索同一目录时无需重新解析文件。
+"""
+
+import os
+import sqlite3
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# trigram分词至少需要3个字符才能使用全文索引
+_MIN_FTS_QUERY_LENGTH = 3
+
+# 批量写入的单元格数
+_INSERT_BATCH_SIZE = 5000
+
+
+def _path_range(directory):
+    """目录（及其子目录）中文件路径的范围 (下界, 上界)：路径以 目录+分隔符 开头"""
+    prefix = os.path.join(directory, '')
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class ContentIndex:
+    """基于SQLite的单元格内容索引
+
+    每个文件的单元格以连续的rowid写入cells表，files表记录该区间，
+    因此更新或删除一个文件只需按rowid区间删除，不必扫描整个全文索引。
+    SQLite连接不能跨线程使用，每个线程应各自创建实例。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.fts = self._create_schema()
+
+    def _create_schema(self):
+        """创建表结构，返回是否使用FTS5全文索引"""
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'path TEXT PRIMARY KEY, size INTEGER, mtime REAL, first_cell INTEGER, last_cell INTEGER, inode INTEGER)'
+        )
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(files)')]
+        if 'inode' not in columns:
+            # 旧版索引没有inode列，补上后这些文件会因状态不一致而重新索引
+            self.conn.execute('ALTER TABLE files ADD COLUMN inode INTEGER')
+        row = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'cells'").fetchone()
+        if row is not None:
+            return 'fts5' in row[0].lower()
+
+        try:
+            self.conn.execute(
+                'CREATE VIRTUAL TABLE cells USING fts5('
+                'text, path UNINDEXED, sheet_idx UNINDEXED, sheet UNINDEXED, row UNINDEXED, col UNINDEXED, '
+                "tokenize='trigram')"
+            )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"当前SQLite不支持FTS5 trigram分词，内容索引改用普通表: {str(e)}")
+            self.conn.execute(
+                'CREATE TABLE cells (text TEXT, path TEXT, sheet_idx INTEGER, sheet TEXT, row INTEGER, col INTEGER)'
+            )
+            return False
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def get_file_states(self, directory=None):
+        """返回已索引文件的 {路径: (大小, 修改时间, inode)}，directory不为None时只返回该目录（及其子目录）中的文件"""
+        if directory is None:
+            cursor = self.conn.execute('SELECT path, size, mtime, inode FROM files')
+        else:
+            cursor = self.conn.execute('SELECT path, size, mtime, inode FROM files WHERE path >= ? AND path < ?',
+                                       _path_range(directory))
+        return {path: (size, mtime, inode) for path, size, mtime, inode in cursor}
+
+    def _delete_cells(self, path):
+        """删除文件在cells表中的单元格区间"""
+        row = self.conn.execute('SELECT first_cell, last_cell FROM files WHERE path = ?', (path,)).fetchone()
+        if row is not None and row[0] is not None:
+            self.conn.execute('DELETE FROM cells WHERE rowid BETWEEN ? AND ?', row)
+
+    def update_file(self, path, state, cells):
+        """写入（或替换）一个文件的全部单元格
+
+        state为文件状态 (大小, 修改时间, inode)。
+        cells为 (工作表序号, 工作表名, 行, 列, 文本) 的可迭代对象，可以是流式生成器；
+        迭代过程中抛出异常时整个文件的写入会回滚。
+        """
+        with self.conn:
+            self._delete_cells(path)
+            first_cell = (self.conn.execute('SELECT MAX(rowid) FROM cells').fetchone()[0] or 0) + 1
+            rowid = first_cell
+            batch = []
+            for sheet_idx, sheet, row, col, text in cells:
+                batch.append((rowid, text, path, sheet_idx, sheet, row, col))
+                rowid += 1
+                if len(batch) >= _INSERT_BATCH_SIZE:
+                    self._insert_cells(batch)
+                    batch = []
+            self._insert_cells(batch)
+            if rowid == first_cell:
+                # 没有任何单元格（空文件或无法解析）也记录下来，避免重复解析
+                first_cell = last_cell = None
+            else:
+                last_cell = rowid - 1
+            size, mtime, inode = state
+            self.conn.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime, first_cell, last_cell, inode) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (path, size, mtime, first_cell, last_cell, inode)
+            )
+
+    def _insert_cells(self, batch):
+        if batch:
+            self.conn.executemany(
+                'INSERT INTO cells (rowid, text, path, sheet_idx, sheet, row, col) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                batch
+            )
+
+    def remove_file(self, path):
+        """从索引中删除文件"""
+        with self.conn:
+            self._delete_cells(path)
+            self.conn.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def search(self, terms, pattern, directory, max_row=None):
+        """在索引中搜索目录（及其子目录）中文件的关键字，逐个文件产生 (路径, 匹配的单元格列表)
+
+        terms为搜索词列表（或单个关键字字符串）。先用全文索引（所有搜索词都不少于3个字符时）
+        取出包含任一搜索词的候选单元格，再用pattern逐个校验，
+        因此区分大小写、完整单词等选项与实时搜索的结果一致。
+        搜索词太短时按files表中目录内文件的单元格区间读取，只对这些单元格用正则过滤。
+        单元格为 (工作表序号, 工作表名, 行, 列, 文本)，按工作表、行、列排序；没有匹配的文件不产生。
+        """
+        if isinstance(terms, str):
+            terms = [terms]
+        low, high = _path_range(directory)
+        if self.fts and all(len(term) >= _MIN_FTS_QUERY_LENGTH for term in terms):
+            query = ' OR '.join('"' + term.replace('"', '""') + '"' for term in terms)
+            cursor = self.conn.execute(
+                'SELECT path, sheet_idx, sheet, row, col, text FROM cells '
+                'WHERE cells MATCH ? AND path >= ? AND path < ? ORDER BY rowid',
+                (query, low, high)
+            )
+        else:
+            # 搜索词太短无法使用trigram索引：只读取目录中文件的单元格区间，在SQLite中逐个单元格用正则过滤
+            self.conn.create_function(
+                'pattern_search', 1, lambda text: pattern.search(text) is not None, deterministic=True
+            )
+            cursor = self.conn.execute(
+                'SELECT c.path, c.sheet_idx, c.sheet, c.row, c.col, c.text FROM files f '
+                'JOIN cells c ON c.rowid BETWEEN f.first_cell AND f.last_cell '
+                'WHERE f.path >= ? AND f.path < ? AND pattern_search(c.text) ORDER BY c.rowid',
+                (low, high)
+            )
+
+        # 每个文件的单元格占用连续的rowid，按rowid排序时同一文件的单元格相邻
+        current = None
+        cells = []
+        for path, sheet_idx, sheet, row, col, text in cursor:
+            if (max_row is not None and row > max_row) or pattern.search(text) is None:
+                continue
+            if path != current:
+                if cells:
+                    cells.sort(key=lambda cell: (cell[0], cell[2], cell[3]))
+                    yield current, cells
+                current = path
+                cells = []
+            cells.append((sheet_idx, sheet, row, col, text))
+        if cells:
+            cells.sort(key=lambda cell: (cell[0], cell[2], cell[3]))
+            yield current, cells
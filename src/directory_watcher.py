@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录监视模块
+
+在应用运行期间监视文件清单中的目录，把发生变化的目录标记到清单中，
+使下次搜索只需重新扫描这些目录。
+"""
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DirectoryWatcher(QObject):
+    """基于QFileSystemWatcher的目录清单监视器"""
+    
+    # 监视的目录数上限（受操作系统句柄/inotify数量限制），超出时不监视，清单每次完整扫描
+    MAX_WATCHED_DIRECTORIES = 4096
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.manifest = None
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        
+    def watch(self, manifest):
+        """开始监视清单中的所有目录（替换之前监视的清单）"""
+        self.clear()
+        directories = manifest.directories()
+        if len(directories) > self.MAX_WATCHED_DIRECTORIES:
+            logger.info(f"目录数({len(directories)})超过监视上限，每次搜索将完整扫描目录")
+            return
+            
+        self.manifest = manifest
+        if directories:
+            self.watcher.addPaths(directories)
+        manifest.watched = True
+        logger.info(f"开始监视 {len(directories)} 个目录的变化")
+        
+    def clear(self):
+        """停止监视"""
+        if self.manifest is not None:
+            self.manifest.watched = False
+            self.manifest = None
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+            
+    def on_directory_changed(self, directory):
+        """目录内容变化（文件新增、删除、重命名或修改）"""
+        if self.manifest is not None:
+            self.manifest.mark_dirty(directory)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单文件资源上限模块
+
+限制搜索单个文件时的文件大小、耗时、单元格数和内存占用。超出上限的文件被跳过并记录原因，
+不会拖住整个搜索；之后可以放宽上限单独重试这些文件。
+"""
+
+import os
+import time
+
+# 跳过原因
+REASON_SIZE = 'size'  # 文件超过大小上限
+REASON_TIME = 'time'  # 解析超时
+REASON_CELLS = 'cells'  # 单元格数超过上限
+REASON_MEMORY = 'memory'  # 内存占用超过上限
+REASON_CRASHED = 'crashed'  # 隔离的工作进程异常退出
+
+# 协作式检查的间隔（行数）：每读取这么多行检查一次耗时、单元格数和内存
+CHECK_INTERVAL_ROWS = 64
+
+
+class BudgetExceeded(Exception):
+    """文件超出资源上限"""
+
+    def __init__(self, reason, detail=''):
+        super().__init__(reason, detail)
+        self.reason = reason
+        self.detail = detail
+
+    def __str__(self):
+        return f"{self.reason}: {self.detail}" if self.detail else self.reason
+
+
+def process_memory():
+    """当前进程的常驻内存字节数（仅Linux，其他平台返回None）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def address_space():
+    """当前进程的虚拟地址空间字节数（仅Linux，其他平台返回None）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class FileBudget:
+    """单个文件的资源上限（各项为0表示不限制）
+
+    大小在解析前检查；耗时、单元格数、内存在逐行读取时协作式检查（见FileBudgetMeter）。
+    打开工作簿本身（如xlrd一次读入整个文件）无法被协作式检查打断，需要隔离的工作进程
+    按硬超时终止，内存上限在隔离的工作进程中还会设置为地址空间上限。
+    """
+
+    __slots__ = ('max_size', 'max_seconds', 'max_cells', 'max_memory')
+
+    def __init__(self, max_size=0, max_seconds=0, max_cells=0, max_memory=0):
+        self.max_size = max_size  # 文件大小上限（字节）
+        self.max_seconds = max_seconds  # 单个文件的解析耗时上限（秒）
+        self.max_cells = max_cells  # 单个文件读取的单元格数上限
+        self.max_memory = max_memory  # 解析单个文件时的内存增长上限（字节）
+
+    def __bool__(self):
+        return bool(self.max_size or self.max_seconds or self.max_cells or self.max_memory)
+
+    def __getstate__(self):
+        return (self.max_size, self.max_seconds, self.max_cells, self.max_memory)
+
+    def __setstate__(self, state):
+        self.max_size, self.max_seconds, self.max_cells, self.max_memory = state
+
+    def check_size(self, size):
+        """文件超过大小上限时抛出BudgetExceeded"""
+        if self.max_size and size > self.max_size:
+            raise BudgetExceeded(REASON_SIZE, f"{size} > {self.max_size} bytes")
+
+    def meter(self):
+        """开始解析一个文件时创建计量器；没有需要逐行检查的上限时返回None"""
+        if self.max_seconds or self.max_cells or self.max_memory:
+            return FileBudgetMeter(self)
+        return None
+
+
+class FileBudgetMeter:
+    """解析单个文件时的计量器：累计单元格数，定期检查耗时、单元格数和内存增长"""
+
+    __slots__ = ('budget', 'cells', 'rows', '_deadline', '_memory_limit')
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.cells = 0
+        self.rows = 0
+        self._deadline = time.perf_counter() + budget.max_seconds if budget.max_seconds else None
+        memory = process_memory() if budget.max_memory else None
+        self._memory_limit = memory + budget.max_memory if memory is not None else None
+
+    def add_row(self, cells):
+        """累计读取的一行（跨工作表计数），每CHECK_INTERVAL_ROWS行检查一次上限"""
+        self.cells += cells
+        self.rows += 1
+        if self.rows % CHECK_INTERVAL_ROWS == 0:
+            self.check()
+
+    def add_rows(self, rows, cells):
+        """累计按块读取的多行（如文本文件的一个块）并检查上限"""
+        self.cells += cells
+        self.rows += rows
+        self.check()
+
+    def check(self):
+        """超出任一上限时抛出BudgetExceeded"""
+        budget = self.budget
+        if budget.max_cells and self.cells > budget.max_cells:
+            raise BudgetExceeded(REASON_CELLS, f"> {budget.max_cells} cells")
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise BudgetExceeded(REASON_TIME, f"> {budget.max_seconds} s")
+        if self._memory_limit is not None:
+            memory = process_memory()
+            if memory is not None and memory > self._memory_limit:
+                raise BudgetExceeded(REASON_MEMORY, f"> {budget.max_memory // (1024 * 1024)} MB")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件内容共享模块
+
+搜索一个文件时，格式识别、预过滤、XML流式读取、openpyxl和xlrd（以及它们之间的回退）
+原本各自打开并读取同一个文件。FileBuffer在搜索开始时打开文件一次：较大的文件用mmap
+映射为只读内存（直接使用操作系统的页缓存，不复制到进程的缓冲区），较小的文件一次读入；
+各阶段通过open()得到互不影响的文件对象，从同一份内容读取。
+"""
+
+import mmap
+import os
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 不小于该大小的文件使用mmap；更小的文件一次读入比建立映射更快
+MMAP_MIN_SIZE = 256 * 1024
+
+
+class BufferReader:
+    """在共享的文件内容（mmap或bytes）上按位置读取的只读文件对象，供zipfile等使用
+
+    每个读取器有自己的读取位置，同一份内容可以同时被多个读取器使用。
+    切片读取不会导出缓冲区，FileBuffer关闭mmap时不受仍未关闭的读取器影响。
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._size = len(data)
+        self._pos = 0
+        self.closed = False
+
+    def read(self, size=-1):
+        start = self._pos
+        end = self._size if size is None or size < 0 else min(self._size, start + size)
+        self._pos = max(start, end)
+        return self._data[start:end]
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"无效的whence: {whence}")
+        if pos < 0:
+            raise ValueError("读取位置不能为负数")
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def close(self):
+        self.closed = True
+        self._data = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FileBuffer:
+    """一个文件在一次搜索中共享的只读内容
+
+    data为mmap对象或bytes，可以直接交给需要整块内容的解析器（如xlrd）；无法映射或
+    不使用mmap的大文件data为None，open()改为每次重新打开文件。用法：
+
+        with FileBuffer(path, size) as source:
+            head = source.head(8)
+            with zipfile.ZipFile(source.open()) as zip_file:
+                ...
+    """
+
+    def __init__(self, file_path, size=None, use_mmap=True):
+        self.path = file_path
+        self.data = None
+        self.mapped = False  # 内容是否为mmap映射
+        with open(file_path, 'rb') as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            self.size = size
+            if size < MMAP_MIN_SIZE:
+                self.data = f.read()
+            elif use_mmap:
+                try:
+                    # 映射在文件关闭后仍然有效
+                    self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.mapped = True
+                except (OSError, ValueError) as e:
+                    logger.debug(f"无法映射文件 {file_path}，改为按需读取: {str(e)}")
+
+    def head(self, size):
+        """文件开头的size个字节"""
+        if self.data is not None:
+            return self.data[:size]
+        with open(self.path, 'rb') as f:
+            return f.read(size)
+
+    def open(self):
+        """返回一个新的只读文件对象（从头开始读取）"""
+        if self.data is not None:
+            return BufferReader(self.data)
+        return open(self.path, 'rb')
+
+    def close(self):
+        if self.mapped:
+            self.data.close()
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件格式识别模块
+
+按文件开头的魔数判断实际格式，而不是相信扩展名：.xlsx是ZIP压缩包，.xls是OLE2复合文档，
+从网页系统导出的"Excel"文件常常是CSV、HTML等文本。先识别格式再选择解析器，
+不必让xlrd、openpyxl逐个尝试并失败后再换下一个。
+"""
+
+import codecs
+
+# 文件格式
+FORMAT_ZIP = 'zip'  # Office Open XML（.xlsx）
+FORMAT_OLE2 = 'ole2'  # OLE2复合文档（.xls，也包括加密的.xlsx）
+FORMAT_TEXT = 'text'  # 文本（CSV、制表符分隔、HTML等）
+FORMAT_EMPTY = 'empty'  # 空文件
+FORMAT_UNKNOWN = 'unknown'  # 无法识别的二进制内容
+
+# 文件开头的魔数
+_ZIP_MAGIC = (b'PK\x03\x04', b'PK\x05\x06')  # 普通ZIP / 空ZIP
+_OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_TEXT_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# 判断是否为文本时读取的字节数
+SNIFF_SIZE = 4096
+
+# 按文本搜索的文件扩展名
+TEXT_EXTENSIONS = ('.csv', '.txt')
+
+# 格式 -> 对应的扩展名（扩展名与实际格式不一致时用于记录）
+FORMAT_EXTENSIONS = {
+    FORMAT_ZIP: '.xlsx',
+    FORMAT_OLE2: '.xls',
+    FORMAT_TEXT: TEXT_EXTENSIONS,
+}
+
+# 开头只有ASCII字符、按UTF-8读取的文本后面出现无法解码的字节时改用的编码（GBK的超集）
+FALLBACK_TEXT_ENCODING = 'gb18030'
+
+
+def _utf16_byte_order(head):
+    """判断没有BOM的UTF-16文本（ASCII字符的高字节为0）：返回'utf-16-le'、'utf-16-be'或None"""
+    half = len(head) // 2
+    if half < 2:
+        return None
+    even_zeros = head[0::2].count(0)
+    odd_zeros = head[1::2].count(0)
+    if odd_zeros * 10 >= half * 3 and even_zeros * 20 < half:
+        return 'utf-16-le'
+    if even_zeros * 10 >= half * 3 and odd_zeros * 20 < half:
+        return 'utf-16-be'
+    return None
+
+
+def sniff_bytes(head):
+    """根据文件开头的字节判断格式（FORMAT_*）"""
+    if not head:
+        return FORMAT_EMPTY
+    if head.startswith(_ZIP_MAGIC):
+        return FORMAT_ZIP
+    if head.startswith(_OLE2_MAGIC):
+        return FORMAT_OLE2
+    if head.startswith(_TEXT_BOMS):
+        return FORMAT_TEXT
+    # 文本文件中不会出现NUL和大多数控制字符（没有BOM的UTF-16除外）
+    if b'\x00' in head:
+        return FORMAT_TEXT if _utf16_byte_order(head) else FORMAT_UNKNOWN
+    control = sum(1 for byte in head if byte < 0x20 and byte not in b'\t\n\r\x0c\x1a')
+    return FORMAT_TEXT if control * 100 <= len(head) else FORMAT_UNKNOWN
+
+
+def sniff_format(file_path):
+    """读取文件开头判断格式（FORMAT_*），无法读取文件时抛出OSError"""
+    with open(file_path, 'rb') as f:
+        return sniff_bytes(f.read(SNIFF_SIZE))
+
+
+def sniff_encoding(head):
+    """根据文件开头的字节判断文本编码
+
+    有BOM时按BOM；没有BOM的UTF-16按0字节的位置判断；其余依次尝试UTF-8和GB18030
+    （GBK的超集），都无法解码时按latin-1读取（任何字节都能解码，不会漏掉ASCII关键字）。
+    head末尾被截断的多字节字符不算解码失败。
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    byte_order = _utf16_byte_order(head) if b'\x00' in head else None
+    if byte_order:
+        return byte_order
+    for encoding in ('utf-8', FALLBACK_TEXT_ENCODING):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
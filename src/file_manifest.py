@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录清单模块
+
+记录目录下每个待搜索文件的 (大小, 修改时间, inode)，用于与内容索引比较，
+找出新增、修改和删除的文件。配合目录监视器使用时，只重新扫描发生变化的目录。
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+# 清单比较结果：新增、修改、删除、未变化的文件路径列表
+ManifestDiff = namedtuple('ManifestDiff', ['added', 'modified', 'deleted', 'unchanged'])
+
+
+def file_state(stat):
+    """由stat结果得到用于比较的文件状态 (大小, 修改时间, inode)"""
+    return stat.st_size, stat.st_mtime, stat.st_ino
+
+
+def diff_states(current, stored):
+    """比较当前扫描结果与已保存的状态（均为 {路径: 状态}）"""
+    added = []
+    modified = []
+    unchanged = []
+    for path, state in current.items():
+        old_state = stored.get(path)
+        if old_state is None:
+            added.append(path)
+        elif tuple(old_state) != state:
+            modified.append(path)
+        else:
+            unchanged.append(path)
+    deleted = [path for path in stored if path not in current]
+    return ManifestDiff(added, modified, deleted, unchanged)
+
+
+class FileManifest:
+    """一个搜索目录（及其搜索选项）的文件清单
+
+    首次refresh时完整扫描目录；之后若有目录监视器通过mark_dirty报告变化，
+    只重新扫描这些目录，其余目录不再遍历，只对已知的文件重新stat（目录监视器只报告目录变化，
+    原地覆盖写入文件不会触发）。未被监视（watched为False）时
+    每次refresh都完整扫描。可以在GUI线程标记变化、在搜索线程刷新。
+    """
+
+    def __init__(self, directory, include_subdirs, file_type, file_filter):
+        self.directory = directory
+        self.include_subdirs = include_subdirs
+        self.file_type = file_type
+        self.file_filter = file_filter  # 文件名过滤函数（对应file_type）
+        self.watched = False  # 是否有目录监视器在报告变化
+        self._files = {}  # 目录 -> {路径: 状态}
+        self._subdirs = {}  # 目录 -> 子目录集合
+        self._dirty = set()
+        self._warm = False
+        self._lock = threading.Lock()  # 保护清单内容（刷新期间持有）
+        self._dirty_lock = threading.Lock()  # 保护变化目录集合，标记变化时不必等待刷新完成
+
+    def matches(self, directory, include_subdirs, file_type):
+        """判断清单是否对应给定的搜索目录和选项"""
+        return (self.directory == directory and self.include_subdirs == include_subdirs
+                and self.file_type == file_type)
+
+    def mark_dirty(self, directory):
+        """标记目录内容已变化，下次refresh时重新扫描"""
+        with self._dirty_lock:
+            self._dirty.add(directory)
+
+    def directories(self):
+        """返回清单中已扫描的所有目录"""
+        with self._lock:
+            return list(self._files)
+
+    def refresh(self):
+        """刷新清单并返回 {路径: 状态}"""
+        return dict(self.iter_refresh())
+
+    def iter_refresh(self):
+        """流式刷新清单，逐个产生 (路径, 状态)
+
+        完整扫描时每扫描完一个目录就产生其中的文件，调用方不必等待整个目录树遍历完成。
+        迭代中途放弃时清单被视为不完整，下次刷新会重新完整扫描。
+        """
+        with self._lock:
+            with self._dirty_lock:
+                dirty = self._dirty
+                self._dirty = set()
+
+            if not (self._warm and self.watched):
+                self._warm = False
+                self._files.clear()
+                self._subdirs.clear()
+                yield from self._iter_scan_tree(self.directory)
+                self._warm = True
+            else:
+                for directory in sorted(dirty):
+                    self._rescan_directory(directory)
+                for directory in list(self._files):
+                    if directory not in dirty:
+                        self._restat_files(directory)
+                    yield from self._files.get(directory, {}).items()
+
+    def _iter_scan_tree(self, directory):
+        """递归扫描目录树，逐个目录产生其中的文件"""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            subdirs = self._scan_directory(current)
+            if self.include_subdirs:
+                pending.extend(subdirs)
+            yield from self._files.get(current, {}).items()
+
+    def _scan_tree(self, directory):
+        """递归扫描目录树"""
+        for _ in self._iter_scan_tree(directory):
+            pass
+
+    def _scan_directory(self, directory):
+        """扫描单个目录，更新其文件状态，返回子目录列表"""
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file() and self.file_filter(entry.name):
+                            files[entry.path] = file_state(entry.stat())
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+
+        self._files[directory] = files
+        self._subdirs[directory] = set(subdirs) if self.include_subdirs else set()
+        return subdirs
+
+    def _restat_files(self, directory):
+        """重新获取目录中已知文件的状态（不列出目录），已不存在的文件从清单中删除"""
+        files = self._files[directory]
+        for path in list(files):
+            try:
+                files[path] = file_state(os.stat(path))
+            except OSError:
+                del files[path]
+
+    def _rescan_directory(self, directory):
+        """重新扫描发生变化的目录：新出现的子目录递归扫描，消失的子目录整棵删除"""
+        if directory not in self._files:
+            return
+        if not os.path.isdir(directory):
+            self._drop_tree(directory)
+            return
+
+        old_subdirs = self._subdirs.get(directory, set())
+        subdirs = self._scan_directory(directory)
+        if not self.include_subdirs:
+            return
+        for subdir in old_subdirs - set(subdirs):
+            self._drop_tree(subdir)
+        for subdir in set(subdirs) - old_subdirs:
+            self._scan_tree(subdir)
+
+    def _drop_tree(self, directory):
+        """从清单中删除目录及其所有子目录"""
+        for subdir in self._subdirs.pop(directory, set()):
+            self._drop_tree(subdir)
+        self._files.pop(directory, None)
@@ -5,17 +5,31 @@ Excel关键字搜索工具主窗口模块
 """
 
 import os
+import time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QPushButton, QLineEdit, QLabel, QFileDialog, QTableWidget,
-    QTableWidgetItem, QProgressBar, QTextEdit, QSplitter,
+    QPushButton, QLineEdit, QLabel, QFileDialog, QProgressBar, QTextEdit, QSplitter,
     QGroupBox, QCheckBox, QComboBox, QMessageBox, QHeaderView,
-    QFrame, QSizePolicy, QApplication
+    QFrame, QSizePolicy, QApplication, QSpinBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSettings
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSettings, QStandardPaths
 from PyQt6.QtGui import QFont, QIcon, QAction, QKeySequence
 from .search_engine import SearchEngine
-from .components.file_table import FileTableWidget
+from .search_core import FILE_TYPES
+from .directory_watcher import DirectoryWatcher
+from .result_cache import ResultCache
+from .sheet_cache import SheetCache
+from .unreadable_cache import UnreadableCache
+from .term_matcher import split_terms, load_terms, build_matcher
+from .preview import file_changed
+from .components.file_table import FileTableWidget, format_term_matches
+from .components.cache_settings_dialog import CacheSettingsDialog
+from .components.search_stats_dialog import SearchStatsDialog
+from .components.file_limits_dialog import FileLimitsDialog
+from .components.preview_loader import PreviewLoader
+from .file_budget import FileBudget
+from .search_stats import STAGE_GUI
+from .xlsx_stream import LIMIT_ROWS, LIMIT_CELLS, LIMIT_BYTES
 from .utils.logger import get_logger
 from .utils.i18n import get_text, set_language, register_language_change_callback, unregister_language_change_callback
 
@@ -28,7 +42,20 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.search_engine = None
         self.search_thread = None
+        self.index_engine = None
+        self.index_thread = None
+        self.manifest = None  # 上次搜索目录的文件清单，跨搜索复用
+        self.dir_watcher = DirectoryWatcher(self)
         self.settings = QSettings('ProfessionalTools', 'ExcelKeywordSearch')
+        self.result_cache = ResultCache()  # 跨搜索保留的搜索结果缓存
+        self.sheet_cache = SheetCache()  # 跨搜索（不同关键字）保留的工作表内容缓存
+        self.unreadable_cache = UnreadableCache()  # 解析失败且未修改的文件，之后的搜索直接跳过
+        self.last_search_stats = None  # 上次完成的搜索的耗时统计
+        self.gui_update_time = 0.0  # 本次搜索中界面处理结果和进度的耗时
+        self.file_budget = FileBudget()  # 单个文件的资源上限
+        self.isolate_parsing = False  # 是否在可终止的工作进程中解析文件
+        self.skipped_files = {}  # 上次搜索中超出资源上限被跳过的文件 {路径: 原因}
+        self.preview_loader = PreviewLoader(self)  # 选中结果时才按匹配坐标读取预览
         
         self.init_ui()
         self.setup_connections()
@@ -96,6 +123,9 @@ class MainWindow(QMainWindow):
         self.keyword_label = QLabel(get_text("Keyword:"))
         self.keyword_edit = QLineEdit()
         self.keyword_edit.setPlaceholderText(get_text("Enter keyword to search..."))
+        self.load_terms_btn = QPushButton(get_text("Load Terms"))
+        self.load_terms_btn.setFixedWidth(80)
+        self.load_terms_btn.setToolTip(get_text("Load Terms Tooltip"))
         
         # 搜索选项
         self.case_sensitive_cb = QCheckBox(get_text("Case Sensitive"))
@@ -106,15 +136,28 @@ class MainWindow(QMainWindow):
         self.complete_search_cb.setToolTip(get_text("Complete Search Tooltip"))
         self.include_subdirs_cb.setChecked(True)
         
+        # 快速搜索的读取上限（行数、单元格数或KB）
+        self.quick_limit_spin = QSpinBox()
+        self.quick_limit_spin.setRange(1, 100000000)
+        self.quick_limit_spin.setValue(1000)
+        self.quick_limit_spin.setToolTip(get_text("Quick Limit Tooltip"))
+        self.quick_limit_unit_combo = QComboBox()
+        self.populate_quick_limit_units()
+        self.quick_limit_unit_combo.setToolTip(get_text("Quick Limit Tooltip"))
+        self.use_index_cb = QCheckBox(get_text("Use Content Index"))
+        self.use_index_cb.setToolTip(get_text("Use Content Index Tooltip"))
+        
+        # 并行工作进程数
+        self.workers_label = QLabel(get_text("Worker Processes:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(os.cpu_count() or 1, 1) * 2)
+        self.workers_spin.setValue(os.cpu_count() or 1)  # 默认使用CPU核心数
+        self.workers_spin.setToolTip(get_text("Worker Processes Tooltip"))
+        
         # 文件类型过滤器
         self.file_type_label = QLabel(get_text("File Types:"))
         self.file_type_combo = QComboBox()
-        self.file_type_combo.addItems([
-            get_text("All Excel Files (.xlsx, .xls)"),
-            get_text("Excel 2007+ (.xlsx)"),
-            get_text("Excel 97-2003 (.xls)"),
-            get_text("All Files")
-        ])
+        self.populate_file_types()
         
         # 搜索按钮
         self.search_btn = QPushButton(get_text("Search"))
@@ -129,13 +172,25 @@ class MainWindow(QMainWindow):
         search_layout.addWidget(self.browse_btn, 0, 2)
         
         search_layout.addWidget(self.keyword_label, 1, 0)
-        search_layout.addWidget(self.keyword_edit, 1, 1, 1, 2)
+        search_layout.addWidget(self.keyword_edit, 1, 1)
+        search_layout.addWidget(self.load_terms_btn, 1, 2)
         
         search_layout.addWidget(self.case_sensitive_cb, 2, 0)
         search_layout.addWidget(self.whole_word_cb, 2, 1)
         search_layout.addWidget(self.include_subdirs_cb, 2, 2)
         
-        search_layout.addWidget(self.complete_search_cb, 3, 0)
+        complete_layout = QHBoxLayout()
+        complete_layout.addWidget(self.complete_search_cb)
+        complete_layout.addWidget(self.quick_limit_spin)
+        complete_layout.addWidget(self.quick_limit_unit_combo)
+        complete_layout.addStretch()
+        search_layout.addLayout(complete_layout, 3, 0)
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(self.workers_label)
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+        search_layout.addWidget(self.use_index_cb, 3, 1)
+        search_layout.addLayout(workers_layout, 3, 2)
         
         search_layout.addWidget(self.file_type_label, 4, 0)
         search_layout.addWidget(self.file_type_combo, 4, 1, 1, 2)
@@ -144,6 +199,34 @@ class MainWindow(QMainWindow):
         
         parent_layout.addWidget(search_group)
         
+    def populate_file_types(self):
+        """填充文件类型下拉框（数据为搜索引擎的文件类型过滤器，不随界面语言变化）"""
+        current_index = self.file_type_combo.currentIndex()
+        self.file_type_combo.clear()
+        for file_type in FILE_TYPES:
+            self.file_type_combo.addItem(get_text(file_type), file_type)
+        self.file_type_combo.setCurrentIndex(max(current_index, 0))
+        
+    def populate_quick_limit_units(self):
+        """填充快速搜索读取上限的单位下拉框（数据为上限单位，KB按字节数限制）"""
+        current_index = self.quick_limit_unit_combo.currentIndex()
+        self.quick_limit_unit_combo.clear()
+        self.quick_limit_unit_combo.addItem(get_text("Rows"), LIMIT_ROWS)
+        self.quick_limit_unit_combo.addItem(get_text("Cells"), LIMIT_CELLS)
+        self.quick_limit_unit_combo.addItem(get_text("KB"), LIMIT_BYTES)
+        self.quick_limit_unit_combo.setCurrentIndex(max(current_index, 0))
+        
+    def get_quick_limit(self):
+        """返回快速搜索的读取上限 (上限, 单位)，KB换算为字节数"""
+        unit = self.quick_limit_unit_combo.currentData()
+        limit = self.quick_limit_spin.value()
+        return (limit * 1024 if unit == LIMIT_BYTES else limit), unit
+        
+    def on_complete_search_toggled(self, checked):
+        """完整搜索时读取上限不起作用"""
+        self.quick_limit_spin.setEnabled(not checked)
+        self.quick_limit_unit_combo.setEnabled(not checked)
+        
     def create_results_panel(self, splitter):
         """创建结果显示面板"""
         results_group = QGroupBox()
@@ -211,6 +294,8 @@ class MainWindow(QMainWindow):
         self.status_bar = self.statusBar()
         self.status_label = QLabel(get_text("Ready"))
         self.status_bar.addWidget(self.status_label)
+        self.index_status_label = QLabel()
+        self.status_bar.addPermanentWidget(self.index_status_label)
         
     def create_menu_bar(self):
         """创建菜单栏"""
@@ -244,6 +329,31 @@ class MainWindow(QMainWindow):
         self.stop_action.triggered.connect(self.stop_search)
         search_menu.addAction(self.stop_action)
         
+        search_menu.addSeparator()
+        
+        self.watch_action = QAction(get_text("Watch Directory for Changes"), self)
+        self.watch_action.setCheckable(True)
+        self.watch_action.toggled.connect(self.on_watch_toggled)
+        search_menu.addAction(self.watch_action)
+        
+        self.cache_settings_action = QAction(get_text("Cache Settings..."), self)
+        self.cache_settings_action.triggered.connect(self.show_cache_settings)
+        search_menu.addAction(self.cache_settings_action)
+        
+        self.file_limits_action = QAction(get_text("File Limits..."), self)
+        self.file_limits_action.triggered.connect(self.show_file_limits)
+        search_menu.addAction(self.file_limits_action)
+        
+        self.retry_skipped_action = QAction(get_text("Retry Skipped Files"), self)
+        self.retry_skipped_action.setEnabled(False)
+        self.retry_skipped_action.triggered.connect(self.retry_skipped_files)
+        search_menu.addAction(self.retry_skipped_action)
+        
+        self.stats_action = QAction(get_text("Search Statistics..."), self)
+        self.stats_action.setEnabled(False)
+        self.stats_action.triggered.connect(self.show_search_stats)
+        search_menu.addAction(self.stats_action)
+        
         # 语言菜单
         language_menu = menubar.addMenu(get_text("Language"))
         
@@ -272,13 +382,18 @@ class MainWindow(QMainWindow):
         """设置信号连接"""
         self.browse_btn.clicked.connect(self.browse_directory)
         self.search_btn.clicked.connect(self.start_search)
+        self.complete_search_cb.toggled.connect(self.on_complete_search_toggled)
         self.results_table.itemSelectionChanged.connect(self.on_file_selected)
         self.open_file_btn.clicked.connect(self.open_selected_file)
         self.open_folder_btn.clicked.connect(self.open_selected_folder)
         self.copy_path_btn.clicked.connect(self.copy_selected_path)
+        self.preview_loader.preview_ready.connect(self.on_preview_ready)
+        self.preview_loader.preview_failed.connect(self.on_preview_failed)
         
         # 关键字字段的回车键触发搜索
         self.keyword_edit.returnPressed.connect(self.start_search)
+        self.keyword_edit.textChanged.connect(self.on_keyword_text_changed)
+        self.load_terms_btn.clicked.connect(self.load_terms_from_file)
         
         # 目录选择框的回车键触发搜索
         self.dir_combo.lineEdit().returnPressed.connect(self.start_search)
@@ -295,6 +410,30 @@ class MainWindow(QMainWindow):
             self.add_directory_to_history(directory)
             self.dir_combo.setCurrentText(directory)
             
+    def on_keyword_text_changed(self, text):
+        """粘贴多行文本（如从Excel复制的一列）时，把换行转换为分号分隔的搜索词"""
+        if '\n' in text or '\r' in text:
+            self.keyword_edit.setText('; '.join(split_terms(text)))
+            
+    def load_terms_from_file(self):
+        """从文本文件或Excel文件加载搜索词列表"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            get_text("Load Terms"),
+            self.dir_combo.currentText() or os.path.expanduser("~"),
+            get_text("Term Files (*.txt *.csv *.xlsx *.xls)")
+        )
+        if not file_path:
+            return
+        try:
+            terms = load_terms(file_path)
+        except Exception as e:
+            logger.error(f"读取搜索词文件 {file_path} 失败: {str(e)}")
+            QMessageBox.warning(self, get_text("Warning"), f"{get_text('Failed to load terms')}: {str(e)}")
+            return
+        self.keyword_edit.setText('; '.join(terms))
+        self.status_label.setText(get_text("Loaded {} search terms").format(len(terms)))
+        
     def start_search(self):
         """开始搜索过程"""
         directory = self.dir_combo.currentText().strip()
@@ -314,7 +453,41 @@ class MainWindow(QMainWindow):
             
         # 将搜索目录添加到历史记录
         self.add_directory_to_history(directory)
-            
+        
+        quick_limit, quick_limit_unit = self.get_quick_limit()
+        self.run_search(dict(
+            directory=directory,
+            keyword=keyword,
+            case_sensitive=self.case_sensitive_cb.isChecked(),
+            whole_word=self.whole_word_cb.isChecked(),
+            include_subdirs=self.include_subdirs_cb.isChecked(),
+            file_type=self.file_type_combo.currentData(),
+            complete_search=self.complete_search_cb.isChecked(),
+            quick_limit=quick_limit,
+            quick_limit_unit=quick_limit_unit,
+            max_workers=self.workers_spin.value(),
+            index_path=self.get_index_path() if self.use_index_cb.isChecked() else None,
+            budget=self.file_budget
+        ))
+        
+    def retry_skipped_files(self):
+        """不限制资源重新搜索上次被跳过的文件（使用上次搜索的参数），结果追加到结果表格"""
+        if not self.skipped_files or self.search_engine is None:
+            return
+        params = self.search_engine.get_search_params()
+        params.update(max_workers=self.search_engine.max_workers, budget=FileBudget())
+        self.run_search(params, file_list=list(self.skipped_files), clear_results=False)
+        
+    def run_search(self, params, file_list=None, clear_results=True):
+        """按给定的搜索参数在线程中启动搜索
+        
+        file_list不为None时只搜索其中的文件（不遍历目录）；clear_results为False时保留已有结果。
+        """
+        directory = params['directory']
+        
+        # 搜索期间暂停后台索引，避免争用CPU和磁盘
+        self.stop_indexing()
+        
         # 清理之前的搜索线程
         if self.search_thread and self.search_thread.isRunning():
             self.search_engine.stop_search()
@@ -323,9 +496,14 @@ class MainWindow(QMainWindow):
             self.search_thread = None
         
         # 清除之前的结果
-        self.results_table.clear()
-        self.preview_text.clear()
-        self.file_info_label.setText(get_text("Searching..."))
+        self.gui_update_time = 0.0
+        self.skipped_files = {}
+        self.retry_skipped_action.setEnabled(False)
+        if clear_results:
+            self.results_table.clear()
+            self.preview_loader.cancel()
+            self.preview_text.clear()
+            self.file_info_label.setText(get_text("Searching..."))
         
         # 更新UI状态
         self.search_btn.setEnabled(False)
@@ -335,21 +513,30 @@ class MainWindow(QMainWindow):
         
         # 创建搜索引擎
         self.search_engine = SearchEngine()
-        self.search_engine.set_search_params(
-            directory=directory,
-            keyword=keyword,
-            case_sensitive=self.case_sensitive_cb.isChecked(),
-            whole_word=self.whole_word_cb.isChecked(),
-            include_subdirs=self.include_subdirs_cb.isChecked(),
-            file_type=self.file_type_combo.currentText(),
-            complete_search=self.complete_search_cb.isChecked()
-        )
+        self.search_engine.set_search_params(**params)
+        self.search_engine.isolate_parsing = self.isolate_parsing
+        self.search_engine.file_list = file_list
+        self.preview_loader.set_pattern(build_matcher(
+            self.search_engine.terms, self.search_engine.case_sensitive, self.search_engine.whole_word
+        ))
+        
+        # 复用同一目录和选项的文件清单：被监视时只需重新扫描发生变化的目录
+        if self.manifest is None or not self.manifest.matches(directory, self.search_engine.include_subdirs,
+                                                              self.search_engine.file_type):
+            self.dir_watcher.clear()
+            self.manifest = self.search_engine.create_manifest()
+        self.search_engine.manifest = self.manifest
+        self.search_engine.result_cache = self.result_cache
+        self.search_engine.sheet_cache = self.sheet_cache if self.sheet_cache.max_bytes > 0 else None
+        self.search_engine.unreadable_cache = self.unreadable_cache
+        self.search_engine.fingerprint_path = self.get_fingerprint_path()
         
         # 连接信号
-        self.search_engine.file_found.connect(self.on_file_found)
+        self.search_engine.files_found.connect(self.on_file_found)
         self.search_engine.search_progress.connect(self.on_search_progress)
         self.search_engine.search_finished.connect(self.on_search_finished)
         self.search_engine.search_error.connect(self.on_search_error)
+        self.search_engine.file_skipped.connect(self.on_file_skipped)
         
         # 在线程中启动搜索
         self.search_thread = QThread()
@@ -362,16 +549,24 @@ class MainWindow(QMainWindow):
         if self.search_engine:
             self.search_engine.stop_search()
             
-    def on_file_found(self, file_info):
-        """处理找到包含关键字的文件"""
-        logger.info(f"找到文件: {file_info['name']} - 匹配数: {file_info['matches']}")
-        self.results_table.add_file(file_info)
+    def on_file_found(self, file_infos):
+        """处理找到包含关键字的文件（搜索引擎批量发出，一次插入表格）"""
+        start = time.perf_counter()
+        logger.debug(f"找到 {len(file_infos)} 个文件")
+        self.results_table.add_files(file_infos)
+        self.gui_update_time += time.perf_counter() - start
+        
+    def on_file_skipped(self, file_path, reason):
+        """记录超出资源上限被跳过的文件"""
+        self.skipped_files[file_path] = reason
         
     def on_search_progress(self, current, total):
         """处理搜索进度更新"""
+        start = time.perf_counter()
         if total > 0:
             self.progress_bar.setRange(0, total)
             self.progress_bar.setValue(current)
+        self.gui_update_time += time.perf_counter() - start
             
     def on_search_finished(self, total_files, found_files):
         """处理搜索完成"""
@@ -385,15 +580,127 @@ class MainWindow(QMainWindow):
             self.search_thread.wait()
             self.search_thread = None
         
-        self.status_label.setText(
-            get_text("Search completed. Found {} files with keyword out of {} total files.").format(
-                found_files, total_files
-            )
+        status = get_text("Search completed. Found {} files with keyword out of {} total files.").format(
+            found_files, total_files
         )
-        
-        if found_files == 0:
+        if self.skipped_files:
+            status += ' ' + get_text("{} files skipped for exceeding file limits").format(len(self.skipped_files))
+            self.retry_skipped_action.setEnabled(True)
+        self.status_label.setText(status)
+        
+        # 保存本次搜索的耗时统计（加上界面更新耗时），可在"搜索统计"中查看和导出
+        stats = self.search_engine.stats if self.search_engine else None
+        if stats is not None:
+            stats.add_stage(STAGE_GUI, self.gui_update_time)
+            self.last_search_stats = stats
+            self.stats_action.setEnabled(True)
+        
+        if found_files == 0 and self.results_table.rowCount() == 0:
             self.file_info_label.setText(get_text("No files found containing the keyword."))
             
+        # 只搜索了指定文件（重试被跳过的文件）时，不开始监视和索引
+        if self.search_engine and self.search_engine.file_list is not None:
+            return
+            
+        # 监视目录变化，使下次搜索只重新扫描变化的目录（需在后台索引刷新清单之前开始）
+        if self.watch_action.isChecked() and self.manifest is not None:
+            self.dir_watcher.watch(self.manifest)
+            
+        # 搜索完成后在后台更新内容索引（只解析新增或修改过的文件）
+        if self.use_index_cb.isChecked() and self.search_engine and not self.search_engine.stop_flag:
+            self.start_indexing(self.search_engine)
+            
+    def get_data_dir(self):
+        """应用数据目录（内容索引等持久化数据），与QSettings使用相同的组织名和应用名"""
+        base_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+        return os.path.join(base_dir, 'ProfessionalTools', 'ExcelKeywordSearch')
+        
+    def get_index_path(self):
+        """内容索引数据库路径"""
+        return os.path.join(self.get_data_dir(), 'content_index.db')
+        
+    def get_fingerprint_path(self):
+        """内容指纹数据库路径（识别内容相同的文件）"""
+        return os.path.join(self.get_data_dir(), 'fingerprints.db')
+        
+    def get_sheet_cache_dir(self):
+        """工作表内容缓存的磁盘缓存目录"""
+        return os.path.join(self.get_data_dir(), 'sheet_cache')
+        
+    def start_indexing(self, search_engine):
+        """在后台线程中按上次搜索的目录和文件类型更新内容索引"""
+        self.stop_indexing()
+        
+        self.index_engine = SearchEngine()
+        self.index_engine.set_search_params(
+            directory=search_engine.directory,
+            keyword=search_engine.keyword,
+            include_subdirs=search_engine.include_subdirs,
+            file_type=search_engine.file_type,
+            index_path=self.get_index_path()
+        )
+        self.index_engine.manifest = self.manifest
+        self.index_engine.index_progress.connect(self.on_index_progress)
+        self.index_engine.index_finished.connect(self.on_index_finished)
+        
+        self.index_thread = QThread()
+        self.index_engine.moveToThread(self.index_thread)
+        self.index_thread.started.connect(self.index_engine.start_indexing)
+        self.index_thread.start()
+        
+    def stop_indexing(self):
+        """停止后台索引"""
+        if self.index_thread and self.index_thread.isRunning():
+            self.index_engine.stop_search()
+            self.index_thread.quit()
+            self.index_thread.wait()
+        self.index_thread = None
+        
+    def on_watch_toggled(self, checked):
+        """切换目录变化监视"""
+        if checked:
+            if self.manifest is not None:
+                self.dir_watcher.watch(self.manifest)
+        else:
+            self.dir_watcher.clear()
+            
+    def show_cache_settings(self):
+        """显示缓存设置对话框"""
+        dialog = CacheSettingsDialog(self.result_cache, self.sheet_cache, self.get_sheet_cache_dir(), self,
+                                     self.unreadable_cache)
+        if dialog.exec():
+            dialog.apply_settings()
+            
+    def show_file_limits(self):
+        """显示单文件资源上限设置对话框"""
+        dialog = FileLimitsDialog(self.file_budget, self.isolate_parsing, self)
+        if dialog.exec():
+            self.file_budget = dialog.get_budget()
+            self.isolate_parsing = dialog.get_isolate_parsing()
+            
+    def show_search_stats(self):
+        """显示上次搜索的耗时统计"""
+        if self.last_search_stats is not None:
+            SearchStatsDialog(self.last_search_stats, self).exec()
+            
+    def on_index_progress(self, current, total):
+        """处理索引进度更新"""
+        self.index_status_label.setText(get_text("Indexing... {}/{}").format(current, total))
+        
+    def on_index_finished(self, updated_files, total_files):
+        """处理索引更新完成"""
+        if self.index_thread and self.index_thread.isRunning():
+            self.index_thread.quit()
+            self.index_thread.wait()
+            self.index_thread = None
+            
+        if updated_files > 0:
+            self.index_status_label.setText(
+                get_text("Content index updated: {} files re-indexed").format(updated_files)
+            )
+        else:
+            self.index_status_label.clear()
+            
     def on_search_error(self, error_message):
         """处理搜索错误"""
         QMessageBox.critical(self, get_text("Search Error"), error_message)
@@ -427,11 +734,27 @@ class MainWindow(QMainWindow):
 <b>{get_text('Modified')}:</b> {file_info['modified']}<br>
 <b>{get_text('Keyword Matches')}:</b> {file_info['matches']}
 """
+        if file_info.get('term_matches'):
+            info_text += f"<br><b>{get_text('Term Matches')}:</b> {format_term_matches(file_info['term_matches'])}\n"
         self.file_info_label.setText(info_text)
         
-        # 更新预览
-        preview_text = file_info.get('preview', get_text('Preview not available'))
-        self.preview_text.setPlainText(preview_text)
+        # 预览在后台按匹配坐标读取，完成后由on_preview_ready显示
+        if file_info.get('hits'):
+            self.preview_text.setPlainText(get_text("Loading preview..."))
+            self.preview_loader.request(file_info)
+        else:
+            self.preview_loader.cancel()
+            self.preview_text.setPlainText(get_text("Preview not available"))
+            
+    def on_preview_ready(self, file_info, html):
+        """显示读取完成的预览（匹配的单元格高亮）"""
+        if file_changed(file_info):
+            html = f"<p><i>{get_text('The file has changed since the search; the preview may not match.')}</i></p>" + html
+        self.preview_text.setHtml(html)
+        
+    def on_preview_failed(self, file_info, error):
+        """预览读取失败"""
+        self.preview_text.setPlainText(f"{get_text('Preview not available')}: {error}")
         
     def open_selected_file(self):
         """打开选中的文件"""
@@ -555,7 +878,7 @@ class MainWindow(QMainWindow):
             }
             
             /* 表格 - 白色背景 */
-            QTableWidget {
+            QTableView {
                 border: 2px solid #dee2e6;
                 border-radius: 8px;
                 background-color: #ffffff;
@@ -566,7 +889,7 @@ class MainWindow(QMainWindow):
 
             }
             
-            QTableWidget::item {
+            QTableView::item {
                 padding: 12px 16px;
                 border: none;
                 color: #212529;
@@ -574,16 +897,16 @@ class MainWindow(QMainWindow):
                 outline: none;  /* 禁用焦点框 */
             }
             
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #0d6efd;
                 color: #ffffff;
             }
             
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #e9ecef;
             }
             
-            QTableWidget::item:focus {
+            QTableView::item:focus {
                 outline: none;  /* 禁用焦点框 */
                 border: none;   /* 禁用边框 */
             }
@@ -615,6 +938,21 @@ class MainWindow(QMainWindow):
                 border: 2px solid #0d6efd;
             }
             
+            /* 数字输入框 - 白色背景 */
+            QSpinBox {
+                padding: 8px 12px;
+                border: 2px solid #dee2e6;
+                border-radius: 8px;
+                background-color: #ffffff;
+                font-size: 14px;
+                color: #212529;
+                min-width: 60px;
+            }
+            
+            QSpinBox:focus {
+                border: 2px solid #0d6efd;
+            }
+            
             QComboBox::drop-down {
                 border: none;
                 width: 30px;
@@ -763,6 +1101,30 @@ class MainWindow(QMainWindow):
         self.whole_word_cb.setChecked(self.settings.value('whole_word', False, type=bool))
         self.include_subdirs_cb.setChecked(self.settings.value('include_subdirs', True, type=bool))
         self.complete_search_cb.setChecked(self.settings.value('complete_search', True, type=bool))
+        self.quick_limit_spin.setValue(self.settings.value('quick_limit', 1000, type=int))
+        unit_index = self.quick_limit_unit_combo.findData(self.settings.value('quick_limit_unit', LIMIT_ROWS))
+        self.quick_limit_unit_combo.setCurrentIndex(max(unit_index, 0))
+        self.on_complete_search_toggled(self.complete_search_cb.isChecked())
+        self.use_index_cb.setChecked(self.settings.value('use_index', False, type=bool))
+        self.watch_action.setChecked(self.settings.value('watch_changes', False, type=bool))
+        self.workers_spin.setValue(self.settings.value('max_workers', os.cpu_count() or 1, type=int))
+        self.result_cache.set_limits(
+            self.settings.value('result_cache_entries', self.result_cache.max_entries, type=int),
+            self.settings.value('result_cache_bytes', self.result_cache.max_bytes, type=int)
+        )
+        self.sheet_cache.set_limits(
+            self.settings.value('sheet_cache_bytes', self.sheet_cache.max_bytes, type=int),
+            self.settings.value('sheet_cache_policy', self.sheet_cache.policy),
+            self.get_sheet_cache_dir() if self.settings.value('sheet_cache_spill', False, type=bool) else None,
+            self.settings.value('sheet_cache_disk_bytes', self.sheet_cache.max_disk_bytes, type=int)
+        )
+        self.file_budget = FileBudget(
+            max_size=self.settings.value('file_limit_size', 0, type=int),
+            max_seconds=self.settings.value('file_limit_seconds', 0.0, type=float),
+            max_cells=self.settings.value('file_limit_cells', 0, type=int),
+            max_memory=self.settings.value('file_limit_memory', 0, type=int)
+        )
+        self.isolate_parsing = self.settings.value('isolate_parsing', False, type=bool)
         
     def save_settings(self):
         """保存应用程序设置"""
@@ -771,6 +1133,22 @@ class MainWindow(QMainWindow):
         self.settings.setValue('case_sensitive', self.case_sensitive_cb.isChecked())
         self.settings.setValue('include_subdirs', self.include_subdirs_cb.isChecked())
         self.settings.setValue('complete_search', self.complete_search_cb.isChecked())
+        self.settings.setValue('quick_limit', self.quick_limit_spin.value())
+        self.settings.setValue('quick_limit_unit', self.quick_limit_unit_combo.currentData())
+        self.settings.setValue('use_index', self.use_index_cb.isChecked())
+        self.settings.setValue('watch_changes', self.watch_action.isChecked())
+        self.settings.setValue('max_workers', self.workers_spin.value())
+        self.settings.setValue('result_cache_entries', self.result_cache.max_entries)
+        self.settings.setValue('result_cache_bytes', self.result_cache.max_bytes)
+        self.settings.setValue('sheet_cache_bytes', self.sheet_cache.max_bytes)
+        self.settings.setValue('sheet_cache_policy', self.sheet_cache.policy)
+        self.settings.setValue('sheet_cache_spill', bool(self.sheet_cache.spill_dir))
+        self.settings.setValue('sheet_cache_disk_bytes', self.sheet_cache.max_disk_bytes)
+        self.settings.setValue('file_limit_size', self.file_budget.max_size)
+        self.settings.setValue('file_limit_seconds', self.file_budget.max_seconds)
+        self.settings.setValue('file_limit_cells', self.file_budget.max_cells)
+        self.settings.setValue('file_limit_memory', self.file_budget.max_memory)
+        self.settings.setValue('isolate_parsing', self.isolate_parsing)
         
     def switch_language(self, language):
         """切换语言"""
@@ -792,9 +1170,12 @@ class MainWindow(QMainWindow):
         self.dir_label.setText(get_text("Search Directory:"))
         self.keyword_label.setText(get_text("Keyword:"))
         self.file_type_label.setText(get_text("File Types:"))
+        self.workers_label.setText(get_text("Worker Processes:"))
         
         # 更新按钮文本
         self.browse_btn.setText(get_text("Browse"))
+        self.load_terms_btn.setText(get_text("Load Terms"))
+        self.load_terms_btn.setToolTip(get_text("Load Terms Tooltip"))
         self.search_btn.setText(get_text("Search"))
         
         # 更新复选框文本
@@ -802,24 +1183,22 @@ class MainWindow(QMainWindow):
         self.whole_word_cb.setText(get_text("Whole Word"))
         self.include_subdirs_cb.setText(get_text("Include Subdirectories"))
         self.complete_search_cb.setText(get_text("Complete Search"))
+        self.use_index_cb.setText(get_text("Use Content Index"))
         
         # 更新工具提示
         self.complete_search_cb.setToolTip(get_text("Complete Search Tooltip"))
+        self.quick_limit_spin.setToolTip(get_text("Quick Limit Tooltip"))
+        self.quick_limit_unit_combo.setToolTip(get_text("Quick Limit Tooltip"))
+        self.workers_spin.setToolTip(get_text("Worker Processes Tooltip"))
+        self.use_index_cb.setToolTip(get_text("Use Content Index Tooltip"))
         
         # 更新占位符文本
         self.dir_combo.setPlaceholderText(get_text("Select directory to search..."))
         self.keyword_edit.setPlaceholderText(get_text("Enter keyword to search..."))
         
         # 更新文件类型下拉框
-        current_index = self.file_type_combo.currentIndex()
-        self.file_type_combo.clear()
-        self.file_type_combo.addItems([
-            get_text("All Excel Files (.xlsx, .xls)"),
-            get_text("Excel 2007+ (.xlsx)"),
-            get_text("Excel 97-2003 (.xls)"),
-            get_text("All Files")
-        ])
-        self.file_type_combo.setCurrentIndex(current_index)
+        self.populate_file_types()
+        self.populate_quick_limit_units()
         
         # 更新表格标题
         header_labels = [
@@ -827,10 +1206,10 @@ class MainWindow(QMainWindow):
             get_text("Path"),
             get_text("Size"),
             get_text("Modified"),
-            get_text("Keyword Matches")
+            get_text("Keyword Matches"),
+            get_text("Term Matches")
         ]
-        for i, label in enumerate(header_labels):
-            self.results_table.horizontalHeaderItem(i).setText(label)
+        self.results_table.set_header_labels(header_labels)
         
         # 更新菜单文本
         menubar = self.menuBar()
@@ -850,6 +1229,11 @@ class MainWindow(QMainWindow):
         self.exit_action.setText(get_text("Exit"))
         self.search_action.setText(get_text("Start Search"))
         self.stop_action.setText(get_text("Stop Search"))
+        self.watch_action.setText(get_text("Watch Directory for Changes"))
+        self.cache_settings_action.setText(get_text("Cache Settings..."))
+        self.file_limits_action.setText(get_text("File Limits..."))
+        self.retry_skipped_action.setText(get_text("Retry Skipped Files"))
+        self.stats_action.setText(get_text("Search Statistics..."))
         self.about_action.setText(get_text("About"))
         
         # 更新详情面板
@@ -910,6 +1294,9 @@ class MainWindow(QMainWindow):
         self.save_settings()
         # 注销语言切换回调
         unregister_language_change_callback(self.update_ui_language)
+        self.stop_indexing()
+        self.dir_watcher.clear()
+        self.preview_loader.wait_finished()
         if self.search_thread and self.search_thread.isRunning():
             self.stop_search()
             self.search_thread.quit()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+匹配预览模块
+
+搜索时只记录匹配单元格的坐标（见SearchCore.MAX_RECORDED_HITS），不生成预览文本；
+用户查看某个结果时才按坐标重新读取文件：只读取前几个匹配行及其上下若干行，
+读到需要的最后一行就停止，不解析工作表的其余部分。匹配的单元格在预览中高亮显示。
+"""
+
+import html
+import os
+from .file_format import sniff_format, FORMAT_ZIP, FORMAT_OLE2, FORMAT_TEXT
+from .text_stream import TextStreamReader, PREVIEW_CHARS, preview_line
+from .utils.formatting import column_letter
+from .xlsx_stream import XlsxStreamReader, LIMIT_ROWS
+
+# 最多预览的匹配行数
+MAX_PREVIEW_ROWS = 10
+
+# 每个匹配行上下显示的行数
+PREVIEW_CONTEXT_ROWS = 2
+
+# 匹配单元格左右显示的列数，以及一段预览最多显示的列数
+PREVIEW_CONTEXT_COLUMNS = 3
+MAX_PREVIEW_COLUMNS = 12
+
+# 预览中一个单元格最多显示的字符数
+MAX_CELL_CHARS = 100
+
+# 匹配单元格的背景色
+HIGHLIGHT_COLOR = '#fff3a0'
+
+
+class PreviewBlock:
+    """预览中一段连续的行
+
+    rows为 [(行号, [各列的文本])]，与columns（列号列表）一一对应；hits为匹配单元格 {(行号, 列号)}。
+    文本文件（text为True）每行是一个单元格，columns为[1]。
+    """
+
+    def __init__(self, sheet, columns, rows, hits, text=False):
+        self.sheet = sheet
+        self.columns = columns
+        self.rows = rows
+        self.hits = hits
+        self.text = text
+
+
+def _wanted_rows(hits, max_rows):
+    """按匹配顺序取前max_rows个不同的匹配行，返回 {工作表: {行号: {列号}}}（保持工作表的顺序）"""
+    wanted = {}
+    count = 0
+    for sheet, row, col in hits:
+        rows = wanted.setdefault(sheet, {})
+        if row not in rows:
+            if count >= max_rows:
+                continue
+            count += 1
+            rows[row] = set()
+        rows[row].add(col)
+    return {sheet: rows for sheet, rows in wanted.items() if rows}
+
+
+def _row_ranges(rows, context):
+    """把匹配行号扩展上下context行，合并重叠的部分，返回 [(起始行, 结束行)]"""
+    ranges = []
+    for row in sorted(rows):
+        start, end = max(1, row - context), row + context
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def _read_xlsx_rows(file_path, needed):
+    """读取.xlsx中需要的行，needed为 {工作表: {行号}}，返回 {工作表: {行号: 单元格值列表}}
+
+    先用XML流式读取器（读到最后一个需要的行就停止解压），失败时改用openpyxl只读模式。
+    """
+    try:
+        result = {}
+        with XlsxStreamReader(file_path) as reader:
+            for sheet_name, member in reader.sheets:
+                rows = needed.get(sheet_name)
+                if not rows:
+                    continue
+                values = result[sheet_name] = {}
+                for row_idx, row in enumerate(reader.iter_rows(member, max(rows), LIMIT_ROWS), start=1):
+                    if row_idx in rows:
+                        values[row_idx] = row
+        return result
+    except Exception:
+        pass
+
+    import openpyxl
+    # 以文件对象打开：按文件名打开时openpyxl按扩展名拒绝实际是ZIP格式的.xls文件
+    with open(file_path, 'rb') as f:
+        workbook = openpyxl.load_workbook(f, read_only=True, data_only=True)
+        try:
+            result = {}
+            for sheet_name, rows in needed.items():
+                if sheet_name not in workbook.sheetnames:
+                    continue
+                values = result[sheet_name] = {}
+                first = min(rows)
+                sheet_rows = workbook[sheet_name].iter_rows(min_row=first, max_row=max(rows), values_only=True)
+                for row_idx, row in enumerate(sheet_rows, start=first):
+                    if row_idx in rows:
+                        values[row_idx] = row
+            return result
+        finally:
+            workbook.close()
+
+
+def _read_xls_rows(file_path, needed):
+    """读取.xls中需要的行（按需加载工作表，只解析有匹配的工作表）"""
+    import xlrd
+
+    workbook = xlrd.open_workbook(file_path, on_demand=True)
+    try:
+        result = {}
+        for sheet_name, rows in needed.items():
+            try:
+                sheet = workbook.sheet_by_name(sheet_name)
+            except xlrd.XLRDError:
+                continue
+            result[sheet_name] = {row: sheet.row_values(row - 1) for row in rows if row <= sheet.nrows}
+        return result
+    finally:
+        workbook.release_resources()
+
+
+def _read_text_lines(file_path, needed):
+    """读取文本文件中需要的行（工作表名为文件名），读到最后一个需要的行就停止"""
+    result = {}
+    for sheet_name, rows in needed.items():
+        last = max(rows)
+        values = result[sheet_name] = {}
+        with open(file_path, 'rb') as f:
+            for line_no, line in TextStreamReader(f).iter_lines():
+                if line_no in rows:
+                    values[line_no] = [line]
+                if line_no >= last:
+                    break
+    return result
+
+
+def _cell_text(value):
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+
+def _match_offset(pattern, text):
+    """第一个匹配在text中的位置（没有匹配器或没有匹配时为0），用于截取超长文本中匹配附近的部分"""
+    if pattern is None:
+        return 0
+    match = pattern.search(text)
+    return match.start() if match is not None else 0
+
+
+def load_preview(file_path, hits, pattern=None, context_rows=PREVIEW_CONTEXT_ROWS, max_rows=MAX_PREVIEW_ROWS):
+    """按匹配坐标读取文件，返回预览段列表（PreviewBlock）
+
+    hits为搜索结果中的 [(工作表, 行, 列)]；pattern为搜索时的匹配器（可选），
+    用于截取超长单元格中匹配附近的部分。无法读取文件时抛出异常。
+    """
+    wanted = _wanted_rows(hits, max_rows)
+    if not wanted:
+        return []
+    ranges = {sheet: _row_ranges(rows, context_rows) for sheet, rows in wanted.items()}
+    needed = {
+        sheet: {row for start, end in sheet_ranges for row in range(start, end + 1)}
+        for sheet, sheet_ranges in ranges.items()
+    }
+
+    file_format = sniff_format(file_path)
+    if file_format == FORMAT_ZIP:
+        values = _read_xlsx_rows(file_path, needed)
+    elif file_format == FORMAT_OLE2:
+        values = _read_xls_rows(file_path, needed)
+    elif file_format == FORMAT_TEXT:
+        values = _read_text_lines(file_path, needed)
+    else:
+        raise ValueError(f"无法识别的文件格式（{file_format}）")
+    text = file_format == FORMAT_TEXT
+
+    blocks = []
+    for sheet, sheet_ranges in ranges.items():
+        sheet_values = values.get(sheet, {})
+        hit_cells = {(row, col) for row, cols in wanted[sheet].items() for col in cols}
+        for start, end in sheet_ranges:
+            rows = [(row, sheet_values[row]) for row in range(start, end + 1) if row in sheet_values]
+            if not rows:
+                continue
+            block_hits = {(row, col) for row, col in hit_cells if start <= row <= end}
+            if text:
+                columns = [1]
+                width = PREVIEW_CHARS
+            else:
+                hit_cols = [col for _, col in block_hits]
+                last_col = max(len(row_values) for _, row_values in rows)
+                first = max(1, min(hit_cols) - PREVIEW_CONTEXT_COLUMNS)
+                last = min(last_col, max(hit_cols) + PREVIEW_CONTEXT_COLUMNS, first + MAX_PREVIEW_COLUMNS - 1)
+                columns = list(range(first, last + 1))
+                width = MAX_CELL_CHARS
+            block_rows = []
+            for row, row_values in rows:
+                cells = []
+                for col in columns:
+                    value = _cell_text(row_values[col - 1]) if col <= len(row_values) else ''
+                    offset = _match_offset(pattern, value) if (row, col) in block_hits else 0
+                    cells.append(preview_line(value, offset, width))
+                block_rows.append((row, cells))
+            blocks.append(PreviewBlock(sheet, columns, block_rows, block_hits, text))
+    return blocks
+
+
+def _highlight(text, pattern):
+    """转义文本，并把其中匹配的部分加粗"""
+    if pattern is None:
+        return html.escape(text)
+    parts = []
+    pos = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[pos:match.start()]))
+        parts.append(f"<b>{html.escape(text[match.start():match.end()])}</b>")
+        pos = match.end()
+    parts.append(html.escape(text[pos:]))
+    return ''.join(parts)
+
+
+def preview_to_html(blocks, pattern=None):
+    """把预览段转换为HTML表格（用于QTextEdit）：匹配单元格高亮，其中匹配的文字加粗"""
+    parts = []
+    for block in blocks:
+        parts.append(f"<p><b>{html.escape(block.sheet)}</b></p>")
+        parts.append('<table border="1" cellspacing="0" cellpadding="2">')
+        if not block.text:
+            header = ''.join(f"<th>{column_letter(col)}</th>" for col in block.columns)
+            parts.append(f"<tr><th></th>{header}</tr>")
+        for row, cells in block.rows:
+            row_html = [f"<th>{row}</th>"]
+            for col, text in zip(block.columns, cells):
+                if (row, col) in block.hits:
+                    row_html.append(f'<td bgcolor="{HIGHLIGHT_COLOR}">{_highlight(text, pattern)}</td>')
+                else:
+                    row_html.append(f"<td>{html.escape(text)}</td>")
+            parts.append(f"<tr>{''.join(row_html)}</tr>")
+        parts.append('</table>')
+    return '\n'.join(parts)
+
+
+def preview_to_lines(blocks):
+    """把预览段转换为文本行（用于命令行输出）
+
+    匹配行为 [工作表!单元格] 各列文本（文本文件为 [文件名:行号] 行文本），上下文行以两个空格开头。
+    """
+    lines = []
+    for block in blocks:
+        for row, cells in block.rows:
+            hit_cols = [col for col in block.columns if (row, col) in block.hits]
+            row_text = cells[0] if block.text else ' | '.join(text for text in cells if text)
+            if not hit_cols:
+                lines.append(f"  [{block.sheet}:{row}] {row_text}")
+            elif block.text:
+                lines.append(f"[{block.sheet}:{row}] {row_text}")
+            else:
+                lines.append(f"[{block.sheet}!{column_letter(hit_cols[0])}{row}] {row_text}")
+    return lines
+
+
+def file_changed(file_info):
+    """文件在搜索之后是否被修改（预览可能与搜索结果不一致）"""
+    try:
+        stat = os.stat(file_info['path'])
+    except OSError:
+        return True
+    return (stat.st_size, stat.st_mtime) != (file_info.get('size_bytes'), file_info.get('mtime'))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索结果缓存模块
+
+在内存中按LRU策略缓存已完成搜索的逐文件结果。再次以相同目录、关键字和选项搜索时，
+状态（大小、修改时间、inode）未变的文件直接使用缓存结果，只重新解析修改过的文件。
+"""
+
+import threading
+from collections import OrderedDict
+
+# 每个文件结果的固定开销估算（字节），用于计算缓存占用
+_ENTRY_OVERHEAD = 200
+
+
+def _estimate_size(file_path, file_info):
+    """粗略估算一个文件结果占用的内存"""
+    size = _ENTRY_OVERHEAD + len(file_path) * 2
+    if file_info:
+        size += len(file_info.get('hits', ())) * 64
+    return size
+
+
+class ResultCache:
+    """搜索结果LRU缓存
+
+    键为搜索参数元组，值为 {路径: (文件状态, 文件结果或None)}；不包含关键字的文件也会记录
+    （结果为None），这样它们在未修改时同样可以跳过。按条目数和估算字节数两种上限淘汰
+    最久未使用的搜索。可以在不同线程中访问。
+    """
+
+    def __init__(self, max_entries=20, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # 键 -> (结果字典, 估算字节数)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def set_limits(self, max_entries, max_bytes):
+        """修改缓存上限，超出部分立即淘汰"""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, key):
+        """获取缓存的搜索结果（并标记为最近使用），不存在时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, results):
+        """保存一次搜索的结果"""
+        size = sum(_estimate_size(path, file_info) for path, (state, file_info) in results.items())
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._total_bytes -= old_entry[1]
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            self._entries[key] = (results, size)
+            self._total_bytes += size
+            self._evict()
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        """返回 (缓存的搜索数, 估算占用字节数)"""
+        with self._lock:
+            return len(self._entries), self._total_bytes
+
+    def _evict(self):
+        """淘汰最久未使用的搜索，直到满足上限"""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            _, (results, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
@@ -0,0 +1,1861 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel文件搜索核心模块
+
+搜索、索引的全部逻辑，不依赖Qt：结果和进度通过可覆盖的回调方法（on_files_found等）报告，
+可以直接在命令行、工作进程、基准测试中使用。图形界面使用的SearchEngine在其上把回调转换为Qt信号。
+"""
+
+import os
+import queue
+import re
+import signal
+import threading
+import time
+import zipfile
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import chain, islice
+from .utils.logger import get_logger
+from .utils.formatting import format_file_size, format_mtime
+from .xlsx_stream import workbook_may_match, XlsxStreamReader, LIMIT_ROWS, LIMIT_CELLS, LIMIT_BYTES
+from .content_index import ContentIndex
+from .content_fingerprint import DuplicateFinder, FingerprintStore
+from .file_manifest import FileManifest, diff_states, file_state
+from .sheet_cache import SheetContent
+from .file_format import (
+    sniff_bytes, sniff_format, SNIFF_SIZE, FORMAT_ZIP, FORMAT_OLE2, FORMAT_TEXT, FORMAT_EMPTY, FORMAT_EXTENSIONS,
+    TEXT_EXTENSIONS
+)
+from .text_stream import (
+    TextStreamReader, CHUNK_SIZE, TEXT_SHEET_INDEX, MAX_DECODE_LINE, MAX_CHAR_BYTES,
+    detect_text_encoding, bytes_encodings, build_bytes_pattern, decode_line
+)
+from .file_buffer import FileBuffer
+from .xls_records import can_scan_records, shared_strings, scan_sst_cells, TextRecordFound
+from .file_budget import (
+    FileBudget, BudgetExceeded, REASON_TIME, REASON_MEMORY, REASON_CRASHED, CHECK_INTERVAL_ROWS, address_space
+)
+from .worker_pool import KillablePool, TASK_DONE, TASK_ERROR, TASK_TIMEOUT
+from .search_stats import (
+    SearchStats, FileTiming, STAGE_ENUMERATE, STAGE_PREFILTER, STAGE_OPEN, STAGE_PARSE, STAGE_MATCH,
+    STAGE_INDEX, PARSER_OPENPYXL, PARSER_OPENPYXL_FULL, PARSER_XLRD, PARSER_XLSX_STREAM, PARSER_TEXT_STREAM,
+    PARSER_TEXT_BYTES, PARSER_PREFILTER,
+    PARSER_SHEET_CACHE, PARSER_SKIPPED, PARSER_NONE, FALLBACK_STREAM, FALLBACK_FULL_LOAD, FALLBACK_FORMAT,
+    FALLBACK_TEXT_DECODE
+)
+from .term_matcher import build_matcher, split_terms, MAX_REGEX_TERMS
+
+logger = get_logger(__name__)
+
+# 文件类型过滤器（同时是界面中显示名称的翻译键），"All Files"包括CSV、TXT文本文件
+FILE_TYPES = ("All Excel Files (.xlsx, .xls)", "Excel 2007+ (.xlsx)", "Excel 97-2003 (.xls)", "All Files")
+
+# 超出资源上限的异常：不能被解析失败时的回退逻辑吞掉（内存不足时回退到完整加载只会更糟）
+_BUDGET_ERRORS = (BudgetExceeded, MemoryError)
+
+# ZIP压缩包本身损坏（截断、数据错误）：换用其他方式读取同一个文件也会失败，不再回退
+_CORRUPT_ZIP_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError)
+
+class _XlrdLog:
+    """xlrd的logfile：警告（如按需加载不支持旧版本）写入调试日志，不打印到标准输出（命令行的结果输出）"""
+    
+    def write(self, text):
+        if text.strip():
+            logger.debug(f"xlrd: {text.strip()}")
+            
+            
+_XLRD_LOG = _XlrdLog()
+
+# 数值、日期、布尔值单元格转换为文本后可能出现的单词和符号（小写）
+_NON_TEXT_VALUE_WORDS = ('true', 'false', 'nan', 'inf', 'days')
+_NON_TEXT_VALUE_SYMBOLS = frozenset('0123456789.-+:, ')
+
+
+def _may_match_non_text_value(keyword):
+    """判断关键字是否可能出现在数值、日期、布尔值单元格的文本形式中（如"2024"、"rue"）"""
+    keyword = keyword.lower()
+    if not set(re.sub(r'[a-z]+', '', keyword)) <= _NON_TEXT_VALUE_SYMBOLS:
+        return False
+    return all(
+        any(run in word for word in _NON_TEXT_VALUE_WORDS)
+        for run in re.findall(r'[a-z]+', keyword)
+    )
+
+
+def _limit_cells(rows, limit):
+    """产生行直到累计读取limit个非空单元格（最后一行截断到第limit个）"""
+    count = 0
+    for row in rows:
+        cells = [col for col, value in enumerate(row) if value is not None and value != '']
+        if count + len(cells) >= limit:
+            yield row[:cells[limit - count - 1] + 1]
+            return
+        count += len(cells)
+        yield row
+
+
+# 工作进程内复用的搜索引擎实例（每个进程创建一次）
+_worker_engine = None
+
+
+def _init_worker():
+    """工作进程初始化：忽略Ctrl+C，由主进程统一停止搜索并关闭进程池"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _init_isolated_worker(max_memory):
+    """隔离的工作进程初始化：max_memory不为0时把地址空间上限设置为当前占用加上max_memory字节
+
+    超出上限的内存分配在工作进程中抛出MemoryError，文件被记为超出内存上限；
+    不支持resource模块的平台（Windows）只能依靠主进程按超时终止工作进程。
+    """
+    _init_worker()
+    if not max_memory:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = (address_space() or 0) + max_memory
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"无法设置工作进程的内存上限: {str(e)}")
+
+
+def _search_file_in_worker(file_path, params, state=None, capture=False):
+    """在进程池的工作进程中搜索单个文件
+
+    必须是模块级函数，才能被进程池序列化后分发到子进程。返回 (搜索结果, 耗时FileTiming或None, 失败原因或None)；
+    capture为True时搜索结果中同时包含解析出的工作表内容，供主进程的工作表缓存使用。
+    文件超出资源上限时抛出BudgetExceeded，其timing属性为该文件的耗时。
+    """
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = SearchCore()
+    _worker_engine.set_search_params(**params)
+    pattern = _worker_engine._build_search_pattern()
+    try:
+        if capture:
+            result = _worker_engine._search_file_with_content(file_path, pattern, state)
+        else:
+            result = _worker_engine._search_file(file_path, pattern, state)
+    except BudgetExceeded as e:
+        e.timing = _worker_engine.last_timing
+        raise
+    return result, _worker_engine.last_timing, _worker_engine.last_failure
+
+
+class SearchCore:
+    """高性能Excel文件搜索核心
+    
+    start_search()和start_indexing()在调用线程中同步执行，期间调用下面的on_*回调方法报告结果和进度；
+    使用方可以在子类中覆盖这些方法，也可以直接给实例的同名属性赋值一个函数。
+    """
+    
+    MAX_RECORDED_HITS = 100  # 每个文件最多记录的匹配单元格坐标数（匹配计数不受限制）
+    QUEUE_SIZE = 10000  # 目录枚举队列长度上限（枚举远快于解析时限制内存占用）
+    REPORT_INTERVAL = 0.05  # 批量报告结果和进度的最小间隔（秒）
+    REPORT_MAX_BATCH = 1000  # 缓冲的结果达到该数量时不等间隔立即报告
+    QUICK_FALLBACK_ROWS = 1000  # 快速搜索按字节数限制时，非XML流式读取的解析器读取的行数
+    KILL_GRACE = 2.0  # 隔离模式下，超过耗时上限多少秒后终止工作进程（协作式检查来不及生效时）
+    TEXT_CHUNK_SIZE = CHUNK_SIZE  # 文本文件每次读取的字节数
+    DENSE_CANDIDATE_BYTES = 1024  # 按字节搜索时候选行平均间隔小于这么多字节，窗口内其余的行一起解码
+    DENSE_MIN_CANDIDATES = 16  # 判断候选是否密集前至少逐行解码的候选行数
+    XLS_BLOCK_ROWS = 256  # .xls只匹配文本单元格时，一次连接后搜索的行数
+    
+    def __init__(self):
+        super().__init__()
+        self.directory = ""  # 搜索目录
+        self.keyword = ""  # 搜索关键字（多个搜索词以"; "连接，用于显示和日志）
+        self.terms = []  # 搜索词列表
+        self.case_sensitive = False  # 是否区分大小写
+        self.whole_word = False  # 是否完整单词匹配
+        self.include_subdirs = True  # 是否包含子目录
+        self.file_type = "All Excel Files (.xlsx, .xls)"  # 文件类型过滤
+        self.stop_flag = False  # 停止搜索标志
+        self.buffer_size = 10 * 1024 * 1024  # 缓冲区大小（10MB）- 增加以支持大量Excel文件
+        self.complete_search = True  # 是否完整搜索（True=搜索所有行，False=只搜索每个工作表的开头）
+        self.quick_limit = 1000  # 快速搜索时每个工作表的读取上限
+        self.quick_limit_unit = LIMIT_ROWS  # 快速搜索读取上限的单位（行数、非空单元格数或XML字节数）
+        self.max_workers = os.cpu_count() or 1  # 并行搜索的工作进程数（1=单进程顺序搜索）
+        self.parallel_min_files = 8  # 文件数少于该值时不启动进程池，避免进程启动开销
+        self.use_prefilter = True  # 是否启用.xlsx共享字符串预过滤
+        self.use_mmap = True  # 是否用mmap映射较大的文件（设置了内存上限时不使用，见_open_source）
+        self.use_bytes_search = True  # 文本文件是否直接在原始字节上搜索（False=解码所有内容后搜索）
+        self.use_xls_on_demand = True  # .xls是否逐个加载工作表、只匹配文本单元格（False=一次加载整个工作簿）
+        self.dedupe_content = True  # 内容相同的文件是否只解析一次（见content_fingerprint）
+        self.fingerprint_path = None  # 内容指纹数据库路径（None=不保存，指纹只在本次搜索中使用）
+        self.index_path = None  # 内容索引数据库路径（None=不使用索引，每次都实时解析）
+        self.manifest = None  # 跨搜索复用的文件清单（None=每次完整扫描目录）
+        self.result_cache = None  # 搜索结果缓存（ResultCache，None=不缓存）
+        self.sheet_cache = None  # 工作表内容缓存（SheetCache，None=不缓存）
+        self.budget = FileBudget()  # 单个文件的资源上限（超出的文件被跳过）
+        self.isolate_parsing = False  # 是否在可终止的工作进程中解析文件（硬性执行耗时和内存上限）
+        self.file_list = None  # 只搜索这些文件（如重试被跳过的文件），None=搜索整个目录
+        self.skipped_files = {}  # 本次搜索中超出资源上限被跳过的文件 {路径: 原因}
+        self.collect_stats = True  # 是否记录各文件、各阶段的耗时
+        self.stats = None  # 最近一次搜索的耗时统计（SearchStats）
+        self.last_timing = None  # 最近一次搜索单个文件的耗时（FileTiming）
+        self.last_failure = None  # 最近一次搜索的文件无法解析时的原因（其他情况为None）
+        self.unreadable_cache = None  # 无法读取的文件缓存（UnreadableCache，None=不缓存）
+        self._timing = None  # 正在搜索的文件的耗时记录
+        self._meter = None  # 正在搜索的文件的资源计量（FileBudgetMeter）
+        self._source = None  # 正在搜索的文件共享的内容（FileBuffer）
+        self._duplicates = None  # 本次搜索中内容相同的文件（DuplicateFinder）
+        self._files_enumerated = 0  # 已枚举的文件数
+        self._files_done = 0  # 已处理完成的文件数
+        self._found_batch = []  # 尚未报告的文件结果
+        self._last_report = 0.0  # 上次报告结果和进度的时间
+        
+    def __getstate__(self):
+        """序列化时只保留搜索参数和选项，缓存、文件清单、回调和运行状态留在当前进程"""
+        state = {
+            key: value for key, value in self.__dict__.items()
+            if not key.startswith(('_', 'on_'))
+            and key not in ('result_cache', 'sheet_cache', 'unreadable_cache', 'manifest', 'stats', 'last_timing',
+                            'skipped_files')
+        }
+        state.update(result_cache=None, sheet_cache=None, unreadable_cache=None, manifest=None)
+        return state
+        
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
+        
+    def set_search_params(self, directory, keyword, case_sensitive=False, 
+                         whole_word=False, include_subdirs=True, file_type="All Excel Files (.xlsx, .xls)",
+                         complete_search=True, max_workers=None, index_path=None, budget=None,
+                         quick_limit=None, quick_limit_unit=None):
+        """设置搜索参数
+        
+        keyword可以是搜索词列表，也可以是字符串（按分号、中文分号或换行拆分为多个搜索词）。
+        budget为单个文件的资源上限（FileBudget），quick_limit和quick_limit_unit为快速搜索
+        （complete_search=False）时每个工作表的读取上限，为None时保持当前设置。
+        """
+        self.directory = directory
+        self.terms = split_terms(keyword) if isinstance(keyword, str) else [term for term in keyword if term]
+        self.keyword = '; '.join(self.terms)
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self.include_subdirs = include_subdirs
+        self.file_type = file_type
+        self.complete_search = complete_search
+        if max_workers is not None:
+            self.max_workers = max(1, int(max_workers))
+        self.index_path = index_path
+        if budget is not None:
+            self.budget = budget
+        if quick_limit is not None:
+            self.quick_limit = max(1, int(quick_limit))
+        if quick_limit_unit is not None:
+            self.quick_limit_unit = quick_limit_unit
+            
+    def get_search_params(self):
+        """获取当前搜索参数（可传给set_search_params，用于在工作进程中重建引擎）"""
+        return {
+            'directory': self.directory,
+            'keyword': list(self.terms),
+            'case_sensitive': self.case_sensitive,
+            'whole_word': self.whole_word,
+            'include_subdirs': self.include_subdirs,
+            'file_type': self.file_type,
+            'complete_search': self.complete_search,
+            'max_workers': 1,
+            'index_path': None,
+            'budget': self.budget,
+            'quick_limit': self.quick_limit,
+            'quick_limit_unit': self.quick_limit_unit,
+        }
+        
+    def get_cache_key(self):
+        """返回结果缓存的键：所有影响搜索结果的参数"""
+        return (self.directory, tuple(self.terms), self.case_sensitive, self.whole_word,
+                self.include_subdirs, self.file_type, self._content_scope())
+        
+    def _content_scope(self):
+        """读取范围：完整搜索时为True，快速搜索时为 (上限单位, 上限)"""
+        return True if self.complete_search else (self.quick_limit_unit, self.quick_limit)
+        
+    def _quick_max_row(self):
+        """快速搜索按行数限制时的最大行号，其他情况为None"""
+        if not self.complete_search and self.quick_limit_unit == LIMIT_ROWS:
+            return self.quick_limit
+        return None
+        
+    def _limit_rows(self, rows):
+        """对openpyxl、xlrd逐行读取的结果应用快速搜索的读取上限
+        
+        按字节数限制只适用于.xlsx的XML流式读取，这些解析器改为读取前QUICK_FALLBACK_ROWS行。
+        """
+        if self.complete_search:
+            return rows
+        if self.quick_limit_unit == LIMIT_CELLS:
+            return _limit_cells(rows, self.quick_limit)
+        limit = self.quick_limit if self.quick_limit_unit == LIMIT_ROWS else self.QUICK_FALLBACK_ROWS
+        return islice(rows, limit)
+        
+    def start_search(self):
+        """开始搜索过程
+        
+        目录枚举在后台线程中进行，枚举到的文件通过队列立即交给搜索过程处理，
+        不必等待整个目录树遍历完成；进度中的总数为目前已枚举到的文件数。
+        """
+        try:
+            logger.info(f"开始搜索关键字 '{self.keyword}' 在目录 '{self.directory}' 中")
+            
+            # 构建搜索模式
+            pattern = self._build_search_pattern()
+            
+            self._files_enumerated = 0
+            self._files_done = 0
+            self._found_files = 0
+            self._found_batch = []
+            self._last_report = time.monotonic()
+            self.stats = SearchStats() if self.collect_stats else None
+            self.skipped_files = {}
+            # 本次搜索的逐文件结果 {路径: (文件状态, 文件结果或None)}，搜索完整结束后存入结果缓存；
+            # 只搜索指定文件时结果不完整，不存入
+            self._results = {} if self.result_cache is not None and self.file_list is None else None
+            self._duplicates = DuplicateFinder(self._load_fingerprints()) if self.dedupe_content else None
+            
+            # 启动目录枚举线程（生产者）
+            file_queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+            producer = threading.Thread(target=self._enumerate_files, args=(file_queue,), daemon=True)
+            producer.start()
+            
+            # 搜索过程（消费者）按 (路径, 文件状态) 逐个处理
+            files = self._iter_queue(file_queue)
+            if self.result_cache is not None:
+                # 上次相同搜索之后未修改过的文件直接使用缓存的结果
+                cached = self.result_cache.get(self.get_cache_key())
+                if cached:
+                    files = self._search_with_cache(files, cached)
+            if self.sheet_cache is not None:
+                # 解析过的文件直接在缓存的单元格文本中搜索
+                files = self._search_with_sheet_cache(files, pattern)
+            if self.index_path and (self.complete_search or self.quick_limit_unit == LIMIT_ROWS):
+                # 索引中仍然有效的文件直接从索引获取结果，其余文件继续实时解析
+                files = self._search_with_index(files, pattern)
+            elif self.index_path:
+                logger.info("快速搜索按单元格数或字节数限制时无法使用内容索引，所有文件实时解析")
+            if self._duplicates is not None:
+                # 内容与之前的文件相同的文件不再解析，使用那个文件的结果
+                files = self._skip_duplicates(files)
+            if self.unreadable_cache is not None:
+                # 之前解析失败、之后没有修改过的文件直接跳过
+                files = self._skip_unreadable(files)
+            
+            if self.isolate_parsing:
+                self._process_files_isolated(files, pattern)
+            elif self.max_workers > 1:
+                self._process_files_parallel(files, pattern)
+            else:
+                self._process_files_sequential(files, pattern)
+                
+            if self.stop_flag:
+                logger.info("用户停止了搜索")
+            elif self._results is not None:
+                self.result_cache.put(self.get_cache_key(), self._results)
+            if self._duplicates is not None:
+                self._save_fingerprints()
+            producer.join()
+            total_files = self._files_enumerated
+            logger.info(f"共枚举 {total_files} 个Excel文件")
+            if self.skipped_files:
+                logger.warning(f"{len(self.skipped_files)} 个文件超出资源上限被跳过")
+            if self.stats is not None:
+                self.stats.finish()
+                for line in self.stats.summary_lines():
+                    logger.info(line)
+            
+            # 报告缓冲中剩余的结果，再报告最终进度和结果
+            self._flush_reports()
+            self.on_progress(total_files, total_files)
+            self.on_finished(total_files, self._found_files)
+            
+        except Exception as e:
+            logger.error(f"搜索错误: {str(e)}")
+            self._flush_reports()
+            self.on_error(str(e))
+            
+    def _enumerate_files(self, file_queue):
+        """目录枚举线程：把 (路径, 文件状态) 逐个放入队列，结束时放入None"""
+        scanner = self._iter_scan_files()
+        walk_time = 0.0  # 遍历目录的耗时（不含等待队列的时间）
+        try:
+            while True:
+                start = time.perf_counter()
+                item = next(scanner, None)
+                walk_time += time.perf_counter() - start
+                if item is None or not self._put_queue(file_queue, item):
+                    break
+                self._files_enumerated += 1
+        except Exception as e:
+            logger.error(f"枚举目录 {self.directory} 时出错: {str(e)}")
+        finally:
+            # 及时关闭生成器，释放文件清单的锁
+            scanner.close()
+            if self.stats is not None:
+                self.stats.add_stage(STAGE_ENUMERATE, walk_time)
+            self._put_queue(file_queue, None)
+            
+    def _put_queue(self, file_queue, item):
+        """放入队列；队列已满时等待，用户停止搜索时放弃并返回False"""
+        while True:
+            try:
+                file_queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                if self.stop_flag:
+                    return False
+                    
+    def _iter_queue(self, file_queue):
+        """从队列中依次取出 (路径, 文件状态)，直到枚举结束或用户停止搜索"""
+        while not self.stop_flag:
+            try:
+                item = file_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            yield item
+            
+    def on_files_found(self, file_infos):
+        """回调：找到包含关键字的文件（批量报告，参数为文件结果列表）"""
+        
+    def on_progress(self, current, total):
+        """回调：搜索进度（与结果一起限频报告），参数：当前进度，总数"""
+        
+    def on_finished(self, total_files, found_files):
+        """回调：搜索完成，参数：总文件数，找到的文件数"""
+        
+    def on_error(self, message):
+        """回调：搜索出错"""
+        
+    def on_index_progress(self, current, total):
+        """回调：索引进度，参数：当前进度，待索引文件数"""
+        
+    def on_index_finished(self, updated_files, total_files):
+        """回调：索引完成，参数：更新的文件数，总文件数"""
+        
+    def on_file_skipped(self, file_path, reason):
+        """回调：文件超出资源上限被跳过，参数：路径，原因（file_budget.REASON_*）"""
+        
+    def _file_found(self, file_info):
+        """记录找到的文件并计数（缓冲后批量报告）"""
+        self._found_files += 1
+        self._found_batch.append(file_info)
+        
+    def _file_done(self, file_path, state, file_info=None):
+        """记录一个文件处理完成（及其结果，供结果缓存使用）并更新进度"""
+        if self._results is not None:
+            self._results[file_path] = (state, file_info)
+        self._files_done += 1
+        if self._duplicates is not None:
+            # 等待这个文件结果的重复文件使用同样的结果
+            outcome = (state is not None, file_info, self.skipped_files.get(file_path))
+            for duplicate_path, duplicate_state in self._duplicates.done(file_path, outcome):
+                self._duplicate_done(file_path, outcome, duplicate_path, duplicate_state)
+        self._maybe_flush_reports()
+        
+    def _file_skipped(self, file_path, error):
+        """记录超出资源上限被跳过的文件（不存入结果缓存，之后可以放宽上限重试）"""
+        logger.warning(f"文件 {file_path} 超出资源上限，已跳过: {error}")
+        self.skipped_files[file_path] = error.reason
+        if self.stats is not None:
+            self.stats.add_skipped(error.reason)
+        self.on_file_skipped(file_path, error.reason)
+        self._file_done(file_path, None)
+        
+    def _add_timing(self, timing):
+        """把单个文件的耗时计入本次搜索的统计"""
+        if self.stats is not None:
+            self.stats.add_file(timing)
+            
+    def _record_failure(self, file_path, state, failure):
+        """把解析失败的文件记入无法读取的文件缓存"""
+        if failure is not None and state is not None and self.unreadable_cache is not None:
+            self.unreadable_cache.put(file_path, state, failure)
+            
+    def _skip_unreadable(self, files):
+        """跳过之前解析失败、之后没有修改过的文件，其余文件原样产出"""
+        skipped = 0
+        for file_path, state in files:
+            if self.unreadable_cache.get(file_path, state) is None:
+                yield file_path, state
+                continue
+            skipped += 1
+            self._add_cached('unreadable cache')
+            self._file_done(file_path, state)
+        if skipped:
+            logger.info(f"跳过 {skipped} 个之前无法读取且未修改的文件")
+            
+    def _skip_duplicates(self, files):
+        """内容与之前的文件（代表文件）相同的文件不再解析，其余文件原样产出
+        
+        代表文件已经处理完成时直接使用它的结果，否则等它完成时再报告（见_file_done）。
+        """
+        duplicates = 0
+        for file_path, state in files:
+            representative = self._duplicates.find(file_path, state) if state and state[0] > 0 else None
+            if representative is None:
+                yield file_path, state
+                continue
+                
+            duplicates += 1
+            outcome = self._duplicates.outcome(representative)
+            if outcome is None:
+                self._duplicates.wait(representative, file_path, state)
+            else:
+                self._duplicate_done(representative, outcome, file_path, state)
+                
+        if duplicates:
+            logger.info(f"{duplicates} 个文件与之前的文件内容相同，直接使用其结果"
+                        f"（计算指纹读取 {format_file_size(self._duplicates.bytes_read)}）")
+            
+    def _duplicate_done(self, representative, outcome, file_path, state):
+        """把代表文件的结果 (是否正常完成, 文件结果或None, 超出资源上限的原因或None) 用于内容相同的文件"""
+        completed, file_info, skipped = outcome
+        if skipped is not None:
+            self._file_skipped(file_path, BudgetExceeded(skipped, f"与 {representative} 内容相同"))
+            return
+        if not completed:
+            self._file_done(file_path, None)
+            return
+        self._add_cached('duplicate content')
+        if file_info:
+            file_info = self._duplicate_info(file_info, file_path, state)
+            self._file_found(file_info)
+        self._file_done(file_path, state, file_info)
+        
+    def _duplicate_info(self, file_info, file_path, state):
+        """由代表文件的结果构造内容相同的文件的结果"""
+        mtime = state[1]
+        duplicate_info = dict(file_info, name=os.path.basename(file_path), path=file_path,
+                              modified=format_mtime(mtime), mtime=mtime)
+        # 文本文件以文件名作为工作表名
+        name = file_info['name']
+        if any(sheet == name for sheet, _, _ in file_info['hits']) and sniff_format(file_path) == FORMAT_TEXT:
+            duplicate_info['hits'] = [
+                (duplicate_info['name'] if sheet == name else sheet, row, col) for sheet, row, col in file_info['hits']
+            ]
+        return duplicate_info
+        
+    def _load_fingerprints(self):
+        """读取之前保存的搜索目录中文件的内容指纹，没有指纹数据库或读取失败时返回空字典"""
+        if not self.fingerprint_path:
+            return {}
+        try:
+            store = FingerprintStore(self.fingerprint_path)
+            try:
+                return store.load(self.directory)
+            finally:
+                store.close()
+        except Exception as e:
+            logger.warning(f"读取内容指纹数据库失败: {str(e)}")
+            return {}
+            
+    def _save_fingerprints(self):
+        """保存本次搜索中计算或用到的内容指纹"""
+        if not self.fingerprint_path:
+            return
+        try:
+            store = FingerprintStore(self.fingerprint_path)
+            try:
+                store.save(self._duplicates.entries())
+            finally:
+                store.close()
+        except Exception as e:
+            logger.warning(f"保存内容指纹失败: {str(e)}")
+            
+    def _add_cached(self, source):
+        """统计直接使用缓存或索引结果的文件"""
+        if self.stats is not None:
+            self.stats.add_cached(source)
+            
+    def _maybe_flush_reports(self):
+        """距上次报告已超过REPORT_INTERVAL，或缓冲的结果足够多时，报告结果和进度"""
+        if (len(self._found_batch) >= self.REPORT_MAX_BATCH
+                or time.monotonic() - self._last_report >= self.REPORT_INTERVAL):
+            self._flush_reports()
+            
+    def _flush_reports(self):
+        """批量报告缓冲的结果和当前进度
+        
+        每个文件都跨线程发出信号时，界面线程的事件队列会成为瓶颈；
+        合并后每个间隔最多报告一次结果列表和一次进度。
+        """
+        self._last_report = time.monotonic()
+        if self._found_batch:
+            batch, self._found_batch = self._found_batch, []
+            self.on_files_found(batch)
+        if self._files_done:
+            self.on_progress(self._files_done, max(self._files_enumerated, self._files_done))
+        
+    def _process_files_sequential(self, files, pattern):
+        """在当前线程中逐个搜索文件"""
+        for file_path, state in files:
+            try:
+                # 搜索文件
+                if self.sheet_cache is not None:
+                    file_info, sheets = self._search_file_with_content(file_path, pattern, state)
+                    self._store_content(file_path, state, sheets)
+                else:
+                    file_info = self._search_file(file_path, pattern, state)
+                self._add_timing(self.last_timing)
+                self._record_failure(file_path, state, self.last_failure)
+                if file_info:
+                    self._file_found(file_info)
+                self._file_done(file_path, state, file_info)
+            except BudgetExceeded as e:
+                self._add_timing(self.last_timing)
+                self._file_skipped(file_path, e)
+            except Exception as e:
+                logger.error(f"搜索文件 {file_path} 时出错: {str(e)}")
+                self._file_done(file_path, None)
+                
+    def _handle_worker_result(self, file_path, state, result, capture):
+        """处理工作进程返回的 (搜索结果, 耗时, 失败原因)"""
+        file_info, timing, failure = result
+        self._add_timing(timing)
+        self._record_failure(file_path, state, failure)
+        if capture:
+            file_info, sheets = file_info
+            self._store_content(file_path, state, sheets)
+        if file_info:
+            self._file_found(file_info)
+        self._file_done(file_path, state, file_info)
+        
+    def _worker_skipped(self, file_path, error):
+        """处理工作进程中超出资源上限的文件"""
+        self._add_timing(getattr(error, 'timing', None))
+        self._file_skipped(file_path, error)
+        
+    def _process_files_parallel(self, files, pattern):
+        """使用进程池并行搜索文件，按完成顺序发出结果
+        
+        先取出parallel_min_files个文件，文件数不足时直接在当前线程中搜索，
+        避免为少量文件付出启动进程池的开销。
+        """
+        first_files = list(islice(files, self.parallel_min_files))
+        if len(first_files) < self.parallel_min_files:
+            self._process_files_sequential(first_files, pattern)
+            return
+            
+        workers = self.max_workers
+        logger.info(f"启用并行搜索模式，工作进程数: {workers}")
+        params = self.get_search_params()
+        capture = self.sheet_cache is not None
+        file_iter = chain(first_files, files)
+        pending = {}  # future -> (文件路径, 文件状态)
+        
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        try:
+            # 限制在途任务数量，避免一次性提交数万个任务占用内存
+            for file_path, state in islice(file_iter, workers * 4):
+                pending[executor.submit(_search_file_in_worker, file_path, params, state, capture)] = (
+                    file_path, state)
+                
+            while pending:
+                if self.stop_flag:
+                    logger.info("用户停止了搜索，取消尚未开始的任务")
+                    break
+                    
+                # 使用超时等待，以便及时响应停止请求
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, state = pending.pop(future)
+                    try:
+                        self._handle_worker_result(file_path, state, future.result(), capture)
+                    except BudgetExceeded as e:
+                        self._worker_skipped(file_path, e)
+                    except Exception as e:
+                        logger.error(f"搜索文件 {file_path} 时出错: {str(e)}")
+                        self._file_done(file_path, None)
+                    
+                # 补充新任务
+                for file_path, state in islice(file_iter, len(done)):
+                    pending[executor.submit(_search_file_in_worker, file_path, params, state, capture)] = (
+                    file_path, state)
+                    
+                # 等待期间没有文件完成时，也按间隔报告已缓冲的结果
+                if not done:
+                    self._maybe_flush_reports()
+        finally:
+            executor.shutdown(wait=not self.stop_flag, cancel_futures=True)
+            
+    def _process_files_isolated(self, files, pattern):
+        """在可终止的工作进程中搜索文件，硬性执行单个文件的耗时和内存上限
+        
+        协作式检查只能在逐行读取时生效，打开工作簿（如xlrd一次读入整个文件、
+        完整加载回退）期间无法中断；这里超过耗时上限KILL_GRACE秒仍未完成的文件，
+        其工作进程被终止并替换，文件记为超时跳过。工作进程崩溃（如被系统因内存不足杀死）
+        只影响当前文件。即使文件很少也使用工作进程。
+        """
+        workers = self.max_workers
+        logger.info(f"启用隔离解析模式，工作进程数: {workers}")
+        params = self.get_search_params()
+        capture = self.sheet_cache is not None
+        budget = self.budget
+        timeout = budget.max_seconds + self.KILL_GRACE if budget.max_seconds else None
+        file_iter = iter(files)
+        pending = {}  # 任务序号 -> (文件路径, 文件状态)
+        task_id = 0
+        exhausted = False
+        
+        pool = KillablePool(workers, initializer=_init_isolated_worker, initargs=(budget.max_memory,))
+        try:
+            while not self.stop_flag:
+                # 给空闲的工作进程分配新文件
+                while not exhausted and pool.idle_workers:
+                    item = next(file_iter, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    task_id += 1
+                    pending[task_id] = item
+                    pool.submit(task_id, _search_file_in_worker, (item[0], params, item[1], capture), timeout)
+                if not pending:
+                    break
+                    
+                done = pool.wait(timeout=0.2)
+                for key, status, result in done:
+                    file_path, state = pending.pop(key)
+                    if status == TASK_DONE:
+                        self._handle_worker_result(file_path, state, result, capture)
+                    elif status == TASK_ERROR and isinstance(result, BudgetExceeded):
+                        self._worker_skipped(file_path, result)
+                    elif status == TASK_ERROR:
+                        logger.error(f"搜索文件 {file_path} 时出错: {str(result)}")
+                        self._file_done(file_path, None)
+                    elif status == TASK_TIMEOUT:
+                        self._file_skipped(file_path, BudgetExceeded(
+                            REASON_TIME, f"工作进程超过 {timeout:.0f} 秒未完成，已终止"))
+                    else:
+                        # 设置了内存上限时，崩溃多半是内存分配失败导致的
+                        reason = REASON_MEMORY if budget.max_memory else REASON_CRASHED
+                        self._file_skipped(file_path, BudgetExceeded(reason, f"工作进程退出码 {result}"))
+                        
+                if not done:
+                    self._maybe_flush_reports()
+            if self.stop_flag:
+                logger.info("用户停止了搜索，终止工作进程")
+        finally:
+            if pool.restarts:
+                logger.info(f"替换了 {pool.restarts} 个超时或崩溃的工作进程")
+            pool.shutdown()
+            
+
+    def _search_with_index(self, files, pattern):
+        """从内容索引中获取仍然有效（大小、修改时间、inode均未变）的文件的结果
+        
+        先在索引中查出搜索目录中所有匹配的单元格（逐个文件汇总为匹配数和坐标，不保留单元格文本），
+        再逐个检查枚举到的文件：有效的文件直接发出结果，其余文件（新增或修改过的）原样产出，交给实时解析。
+        索引不可用时记录警告，所有文件都实时解析。
+        """
+        try:
+            index = ContentIndex(self.index_path)
+            try:
+                start = time.perf_counter()
+                stored_states = index.get_file_states(self.directory)
+                results = {
+                    path: self._summarize_cells(cells, pattern)
+                    for path, cells in index.search(self.terms, pattern, self.directory, self._quick_max_row())
+                }
+                if self.stats is not None:
+                    self.stats.add_stage(STAGE_INDEX, time.perf_counter() - start)
+            finally:
+                index.close()
+        except Exception as e:
+            logger.warning(f"查询内容索引失败，改为实时搜索: {str(e)}")
+            yield from files
+            return
+            
+        fresh_files = 0
+        for file_path, state in files:
+            stored_state = stored_states.get(file_path)
+            if stored_state is None or tuple(stored_state) != state:
+                yield file_path, state
+                continue
+                
+            fresh_files += 1
+            self._add_cached('index')
+            summary = results.get(file_path)
+            file_info = self._build_file_info(file_path, state, *summary) if summary else None
+            if file_info:
+                self._file_found(file_info)
+            self._file_done(file_path, state, file_info)
+            
+        logger.info(f"内容索引命中 {fresh_files} 个文件")
+        
+    def _search_with_sheet_cache(self, files, pattern):
+        """在工作表内容缓存中搜索仍然有效的文件，未缓存的文件原样产出交给实时解析"""
+        cached_files = 0
+        for file_path, state in files:
+            # 完整内容可以截取出按行数、单元格数限制的范围，按字节数限制时只能使用范围相同的内容
+            sheets = self.sheet_cache.get(file_path, state, self._content_scope(),
+                                          exact=not self.complete_search and self.quick_limit_unit == LIMIT_BYTES)
+            if sheets is None:
+                yield file_path, state
+                continue
+                
+            cached_files += 1
+            timing = FileTiming(file_path, state[0]) if self.stats is not None else None
+            file_info = self._search_content(file_path, sheets, pattern, state)
+            if timing is not None:
+                timing.parser = PARSER_SHEET_CACHE
+                timing.finish()
+                timing.add(STAGE_MATCH, timing.total)
+                self._add_timing(timing)
+            if file_info:
+                self._file_found(file_info)
+            self._file_done(file_path, state, file_info)
+            
+        logger.info(f"工作表缓存命中 {cached_files} 个文件")
+        
+    def _search_content(self, file_path, sheets, pattern, state):
+        """在缓存的工作表内容中搜索，结果与实时解析相同"""
+        matches = 0
+        hits = []
+        term_counts = self._new_term_counts()
+        for sheet in sheets:
+            matches += self._scan_content(sheet, pattern, hits, self._content_end(sheet), term_counts)
+        if matches == 0:
+            return None
+        return self._build_file_info(file_path, state, matches, hits, term_counts)
+        
+    def _content_end(self, sheet):
+        """缓存的工作表内容中属于快速搜索读取范围的文本结束位置
+        
+        按字节数限制时缓存的就是范围相同的内容，不再截取。
+        """
+        if self.complete_search or self.quick_limit_unit == LIMIT_BYTES:
+            return len(sheet.text)
+        if self.quick_limit_unit == LIMIT_ROWS:
+            last = bisect_right(sheet.rows, self.quick_limit)
+        else:
+            last = self.quick_limit
+        return sheet.offsets[last] if last < len(sheet.offsets) else len(sheet.text)
+        
+    def _scan_content(self, sheet, pattern, hits, end=None, term_counts=None):
+        """在一个工作表的缓存内容（SheetContent）上执行一次正则搜索
+        
+        关键字不含换行符，匹配不会跨越单元格，因此匹配计数与逐个单元格搜索相同；
+        匹配位置通过二分查找还原为单元格坐标。end为搜索范围的结束位置（None=全部）。
+        返回匹配总数。
+        """
+        if end is None:
+            end = len(sheet.text)
+        matches = 0
+        last_cell = -1
+        for match in pattern.finditer(sheet.text, 0, end):
+            matches += 1
+            if term_counts is not None:
+                term_counts[pattern.term_of(match)] += 1
+            cell = bisect_right(sheet.offsets, match.start()) - 1
+            if cell == last_cell:
+                continue
+            last_cell = cell
+            if len(hits) < self.MAX_RECORDED_HITS:
+                hits.append((sheet.name, sheet.rows[cell], sheet.cols[cell]))
+                
+        return matches
+        
+    def _store_content(self, file_path, state, sheets):
+        """把实时解析得到的工作表内容存入缓存"""
+        if sheets is not None and state is not None:
+            self.sheet_cache.put(file_path, state, self._content_scope(), sheets)
+            
+    def _search_with_cache(self, files, cached):
+        """使用结果缓存中仍然有效（大小、修改时间、inode均未变）的文件结果
+        
+        cached为上次相同搜索的 {路径: (文件状态, 文件结果或None)}；
+        有效的文件直接发出缓存的结果，其余文件（新增、修改或上次出错的）原样产出。
+        """
+        cached_files = 0
+        for file_path, state in files:
+            entry = cached.get(file_path)
+            if entry is None or entry[0] != state:
+                yield file_path, state
+                continue
+                
+            cached_files += 1
+            self._add_cached('result cache')
+            file_info = entry[1]
+            if file_info:
+                # 发出副本，避免接收方修改缓存中的结果
+                self._file_found(dict(file_info))
+            self._file_done(file_path, state, file_info)
+            
+        logger.info(f"结果缓存命中 {cached_files} 个文件")
+        
+    def _summarize_cells(self, cells, pattern):
+        """汇总索引中一个文件匹配的单元格，返回 (匹配数, 坐标列表, 各搜索词的匹配数或None)"""
+        matches = 0
+        hits = []
+        term_counts = self._new_term_counts()
+        for _, sheet_name, row_idx, col_idx, text in cells:
+            matches += self._count_matches(pattern, text, term_counts)
+            if len(hits) < self.MAX_RECORDED_HITS:
+                hits.append((sheet_name, row_idx, col_idx))
+                
+        return matches, hits, term_counts
+        
+    def _build_file_info(self, file_path, state, matches, hits, term_counts=None):
+        """构造文件结果字典
+        
+        结果只记录匹配单元格的坐标，预览在查看结果时按坐标重新读取文件生成（见preview模块）。
+        """
+        size, mtime = state[:2]
+        return {
+            'name': os.path.basename(file_path),
+            'path': file_path,
+            'size': format_file_size(size),
+            'modified': format_mtime(mtime),
+            'size_bytes': size,
+            'mtime': mtime,
+            'matches': matches,
+            'hits': hits,
+            'term_matches': self._term_matches(term_counts)
+        }
+        
+    def _new_term_counts(self):
+        """多个搜索词时返回各搜索词的匹配计数列表，单个搜索词时返回None（不分别计数）"""
+        return [0] * len(self.terms) if len(self.terms) > 1 else None
+        
+    def _term_matches(self, term_counts):
+        """把匹配计数列表转换为 {搜索词: 匹配数}（只包含有匹配的搜索词）"""
+        if term_counts is None:
+            return {}
+        return {term: count for term, count in zip(self.terms, term_counts) if count}
+        
+    def _count_matches(self, pattern, text, term_counts=None, first=None):
+        """统计文本中的匹配数，term_counts不为None时同时按搜索词累加
+        
+        first为已经用search找到的第一个匹配时从它之后继续查找，不再从头搜索一遍。
+        """
+        pos = 0
+        count = 0
+        if first is not None:
+            pos = first.end()
+            count = 1
+            if term_counts is not None:
+                term_counts[pattern.term_of(first)] += 1
+        if term_counts is None:
+            return count + sum(1 for _ in pattern.finditer(text, pos))
+        for match in pattern.finditer(text, pos):
+            count += 1
+            term_counts[pattern.term_of(match)] += 1
+        return count
+        
+    def start_indexing(self):
+        """后台构建/更新内容索引
+        
+        把当前目录清单与索引中保存的文件状态比较：只重新解析新增或修改过的文件，
+        并删除索引中已不存在的文件。
+        """
+        updated_files = 0
+        total_files = 0
+        try:
+            logger.info(f"开始更新目录 '{self.directory}' 的内容索引")
+            index = ContentIndex(self.index_path)
+            try:
+                file_states = self._scan_files()
+                total_files = len(file_states)
+                stored_states = {
+                    path: state for path, state in index.get_file_states().items()
+                    if self._in_search_scope(path)
+                }
+                diff = diff_states(file_states, stored_states)
+                stale_files = diff.added + diff.modified
+                logger.info(f"新增 {len(diff.added)} 个文件，修改 {len(diff.modified)} 个文件，"
+                            f"删除 {len(diff.deleted)} 个文件")
+                
+                for file_path in diff.deleted:
+                    index.remove_file(file_path)
+                    
+                for i, file_path in enumerate(stale_files):
+                    if self.stop_flag:
+                        logger.info("索引更新已停止")
+                        break
+                    self.on_index_progress(i, len(stale_files))
+                    state = file_states[file_path]
+                    try:
+                        index.update_file(file_path, state, self._iter_cells(file_path))
+                    except Exception as e:
+                        # 无法解析的文件记录为空，文件修改后会重新索引
+                        logger.warning(f"索引文件 {file_path} 时出错: {str(e)}")
+                        index.update_file(file_path, state, [])
+                    updated_files += 1
+            finally:
+                index.close()
+                
+            logger.info(f"内容索引更新完成，重新索引了 {updated_files} 个文件")
+        except Exception as e:
+            logger.error(f"更新内容索引时出错: {str(e)}")
+            
+        self.on_index_finished(updated_files, total_files)
+        
+    def _iter_cells(self, file_path):
+        """迭代文件中所有非空单元格：(工作表序号, 工作表名, 行, 列, 文本)，总是读取所有行
+        
+        按魔数识别的实际格式选择xlrd或openpyxl；文本文件每个非空行是一个单元格（工作表序号为
+        TEXT_SHEET_INDEX，工作表名为文件名，列为1）。无法识别文件格式时抛出ValueError。
+        """
+        if not file_path.lower().endswith(('.xlsx', '.xls') + TEXT_EXTENSIONS):
+            return
+        file_format = sniff_format(file_path)
+        if file_format == FORMAT_TEXT:
+            name = os.path.basename(file_path)
+            with open(file_path, 'rb') as f:
+                for line_no, line in TextStreamReader(f).iter_lines(self.TEXT_CHUNK_SIZE):
+                    if line:
+                        yield TEXT_SHEET_INDEX, name, line_no, 1, line
+            return
+        if file_format == FORMAT_EMPTY and file_path.lower().endswith(TEXT_EXTENSIONS):
+            return
+        if file_format == FORMAT_OLE2:
+            import xlrd
+            workbook = xlrd.open_workbook(file_path, on_demand=True)
+            try:
+                for sheet_idx in range(workbook.nsheets):
+                    sheet = workbook.sheet_by_index(sheet_idx)
+                    for row_idx in range(sheet.nrows):
+                        for col_idx, value in enumerate(sheet.row_values(row_idx), start=1):
+                            if value is not None and value != '':
+                                yield sheet_idx, sheet.name, row_idx + 1, col_idx, str(value)
+                    workbook.unload_sheet(sheet_idx)
+            finally:
+                workbook.release_resources()
+            return
+        if file_format != FORMAT_ZIP:
+            raise ValueError(f"无法识别的文件格式（{file_format}）")
+            
+        import openpyxl
+        with open(file_path, 'rb') as f:
+            workbook = openpyxl.load_workbook(f, read_only=True, data_only=True)
+            try:
+                for sheet_idx, sheet_name in enumerate(workbook.sheetnames):
+                    rows = workbook[sheet_name].iter_rows(values_only=True)
+                    for row_idx, row in enumerate(rows, start=1):
+                        for col_idx, value in enumerate(row, start=1):
+                            if value is not None and value != '':
+                                yield sheet_idx, sheet_name, row_idx, col_idx, str(value)
+            finally:
+                workbook.close()
+                
+    def stop_search(self):
+        """停止当前搜索"""
+        self.stop_flag = True
+        
+    def _build_search_pattern(self):
+        """构建匹配所有搜索词的匹配器（接口与编译后的正则表达式相同，见term_matcher）"""
+        return build_matcher(self.terms, self.case_sensitive, self.whole_word)
+        
+    def _can_prefilter(self):
+        """判断当前关键字是否适用共享字符串预过滤
+        
+        数值、日期、布尔值单元格不在共享字符串表中，若关键字可能出现在这些值的文本形式中
+        （如"2024"、"true"），就不能仅凭共享字符串排除工作簿。
+        """
+        return self.use_prefilter and self._text_cells_only()
+        
+    def _text_cells_only(self):
+        """搜索词是否都不可能出现在数值、日期、布尔值单元格的文本形式中（只需匹配文本单元格）"""
+        return bool(self.terms) and not any(_may_match_non_text_value(term) for term in self.terms)
+        
+    def create_manifest(self):
+        """为当前搜索目录和选项创建文件清单（可跨搜索复用，配合目录监视器增量刷新）"""
+        return FileManifest(self.directory, self.include_subdirs, self.file_type, self._is_excel_file)
+        
+    def _scan_files(self):
+        """扫描要搜索的文件，返回 {路径: (大小, 修改时间, inode)}
+        
+        有可复用的清单时只重新扫描发生变化的目录。
+        """
+        manifest = self.manifest
+        if manifest is None or not manifest.matches(self.directory, self.include_subdirs, self.file_type):
+            manifest = self.create_manifest()
+        return manifest.refresh()
+        
+    def _iter_scan_files(self):
+        """流式扫描要搜索的文件，边遍历目录边产生 (路径, 文件状态)"""
+        if self.file_list is not None:
+            return self._iter_listed_files()
+        manifest = self.manifest
+        if manifest is None or not manifest.matches(self.directory, self.include_subdirs, self.file_type):
+            manifest = self.create_manifest()
+        return manifest.iter_refresh()
+        
+    def _iter_listed_files(self):
+        """产生file_list中仍然存在的文件的 (路径, 文件状态)"""
+        for file_path in self.file_list:
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                logger.warning(f"无法访问文件 {file_path}: {str(e)}")
+                continue
+            yield file_path, file_state(stat)
+            
+    def _get_excel_files(self):
+        """获取要搜索的Excel文件列表"""
+        return list(self._scan_files())
+        
+    def _in_search_scope(self, file_path):
+        """判断路径是否属于当前搜索目录和文件类型的范围"""
+        directory = os.path.join(self.directory, '')
+        if not file_path.startswith(directory):
+            return False
+        if not self.include_subdirs and os.path.dirname(file_path) != os.path.dirname(directory):
+            return False
+        return self._is_excel_file(os.path.basename(file_path))
+        
+    def _is_excel_file(self, filename):
+        """根据当前文件类型过滤器检查文件是否为Excel文件"""
+        filename_lower = filename.lower()
+        
+        if self.file_type == "All Excel Files (.xlsx, .xls)":
+            return filename_lower.endswith(('.xlsx', '.xls'))
+        elif self.file_type == "Excel 2007+ (.xlsx)":
+            return filename_lower.endswith('.xlsx')
+        elif self.file_type == "Excel 97-2003 (.xls)":
+            return filename_lower.endswith('.xls')
+        elif self.file_type == "All Files":
+            return filename_lower.endswith(('.xlsx', '.xls') + TEXT_EXTENSIONS)
+        else:
+            return filename_lower.endswith(('.xlsx', '.xls'))
+            
+    def _search_file_with_content(self, file_path, pattern, state=None):
+        """搜索文件，同时提取所有非空单元格的文本
+        
+        返回 (文件结果或None, SheetContent列表或None)；文件被预过滤跳过、解析失败
+        或搜索被停止时没有完整内容，第二项为None。
+        """
+        sheets = []
+        file_info = self._search_file(file_path, pattern, state, sheets)
+        if self.stop_flag or None in sheets:
+            return file_info, None
+        return file_info, sheets
+        
+    def _search_file(self, file_path, pattern, state=None, sheets=None):
+        """在单个Excel文件中搜索关键字
+        
+        state为枚举目录时得到的文件状态 (大小, 修改时间, ...)，提供时不再重复stat文件。
+        sheets不为None时，把解析出的每个工作表的内容（SheetContent）追加到其中；
+        没有解析出完整内容时追加None。
+        collect_stats为True时，各阶段耗时记录在last_timing中。
+        文件超出资源上限（budget）时抛出BudgetExceeded，内存不足（MemoryError）也按超出内存上限处理。
+        """
+        timing = FileTiming(file_path, state[0] if state else 0) if self.collect_stats else None
+        self._timing = self.last_timing = timing
+        self.last_failure = None
+        try:
+            if self.budget:
+                self.budget.check_size(state[0] if state else os.path.getsize(file_path))
+                self._meter = self.budget.meter()
+                
+            file_format = None
+            if file_path.lower().endswith(('.xlsx', '.xls') + TEXT_EXTENSIONS):
+                # 文件只打开一次，格式识别、预过滤和各解析器（包括回退）共享同一份内容
+                self._source = self._open_source(file_path, state[0] if state else None)
+                # 按文件开头的魔数识别实际格式（扩展名不可靠），第一次就选择能解析它的解析器
+                file_format = sniff_bytes(self._source.head(SNIFF_SIZE))
+                
+            # 预过滤：只读取共享字符串表，确定不包含关键字的工作簿直接跳过完整解析
+            if file_format == FORMAT_ZIP and self._can_prefilter():
+                start = time.perf_counter()
+                with self._open_file(file_path) as f:
+                    may_match = workbook_may_match(f, pattern)
+                if timing is not None:
+                    timing.add(STAGE_PREFILTER, time.perf_counter() - start)
+                if not may_match:
+                    if timing is not None:
+                        timing.parser = PARSER_PREFILTER
+                    if sheets is not None:
+                        sheets.append(None)
+                    return None
+                
+            if state is None:
+                stat = os.stat(file_path)
+                state = (stat.st_size, stat.st_mtime)
+                if timing is not None:
+                    timing.size = stat.st_size
+            size, mtime = state[:2]
+            file_info = {
+                'name': os.path.basename(file_path),
+                'path': file_path,
+                'size': format_file_size(size),
+                'modified': format_mtime(mtime),
+                'size_bytes': size,
+                'mtime': mtime,
+                'matches': 0,
+                'hits': [],
+                'term_matches': {}
+            }
+            
+            matches = 0
+            hits = []  # 匹配单元格坐标 (工作表, 行, 列)，预览在查看结果时才按坐标生成
+            term_counts = self._new_term_counts()  # 各搜索词的匹配数（多个搜索词时）
+            
+            if file_format in FORMAT_EXTENSIONS and not file_path.lower().endswith(FORMAT_EXTENSIONS[file_format]):
+                logger.info(f"文件 {file_path} 的实际格式（{file_format}）与扩展名不符，按实际格式读取")
+                self._add_fallback(FALLBACK_FORMAT)
+                
+            if file_format == FORMAT_ZIP:
+                matches = self._search_xlsx_file(file_path, pattern, hits, sheets, term_counts)
+            elif file_format == FORMAT_OLE2:
+                # 读取旧版Excel格式
+                matches = self._search_xls_file(file_path, pattern, hits, sheets, term_counts)
+            elif file_format == FORMAT_TEXT:
+                # CSV、TXT，以及实际是文本（CSV、HTML等）的"Excel"文件：按文本分块读取
+                matches = self._search_text_file(file_path, pattern, hits, sheets, term_counts)
+            elif file_format == FORMAT_EMPTY and file_path.lower().endswith(TEXT_EXTENSIONS):
+                # 空的文本文件没有可搜索的内容，不算读取失败
+                pass
+            elif file_format is not None:
+                # 空的工作簿文件或无法识别的内容：xlrd和openpyxl都无法解析，不再逐个尝试
+                matches = self._read_failed(file_path, f"无法识别的文件格式（{file_format}）", sheets)
+                
+            if matches > 0:
+                file_info['matches'] = matches
+                file_info['hits'] = hits
+                file_info['term_matches'] = self._term_matches(term_counts)
+                return file_info
+                
+        except BudgetExceeded as e:
+            self._mark_skipped(e.reason)
+            raise
+        except MemoryError:
+            self._mark_skipped(REASON_MEMORY)
+            raise BudgetExceeded(REASON_MEMORY, "MemoryError") from None
+        except Exception as e:
+            logger.error(f"搜索文件 {file_path} 时出错: {str(e)}")
+            self._mark_failed()
+            if sheets is not None:
+                sheets.append(None)
+        finally:
+            if timing is not None:
+                timing.finish()
+            self._timing = None
+            self._meter = None
+            if self._source is not None:
+                self._source.close()
+                self._source = None
+            
+        return None
+        
+    def _open_source(self, file_path, size=None):
+        """打开文件供本次搜索的各阶段共享
+        
+        设置了内存上限时不使用mmap：映射的文件页计入进程内存和地址空间，
+        会被误判为解析占用的内存（隔离模式下还会触发地址空间上限）。
+        """
+        return FileBuffer(file_path, size, self.use_mmap and not self.budget.max_memory)
+        
+    def _open_file(self, file_path):
+        """返回正在搜索的文件的一个新的只读文件对象（读取共享的内容）"""
+        if self._source is not None:
+            return self._source.open()
+        return open(file_path, 'rb')
+        
+    def _mark_failed(self, reason=None):
+        """把正在搜索的文件记为读取失败
+        
+        reason不为None表示文件内容无法解析（而不是暂时无法访问），文件修改之前不必再次尝试，
+        见last_failure和unreadable_cache。
+        """
+        if self._timing is not None:
+            self._timing.failed = True
+        self.last_failure = reason
+        
+    def _read_failed(self, file_path, error, sheets=None):
+        """记录文件无法解析（所有适用的读取方式都失败），返回匹配数0"""
+        logger.error(f"读取 {file_path} 失败: {str(error)}")
+        if self._timing is not None and self._timing.parser is None:
+            self._timing.parser = PARSER_NONE
+        self._mark_failed(error if isinstance(error, str) else f"{type(error).__name__}: {str(error)}")
+        if sheets is not None:
+            sheets.append(None)
+        return 0
+        
+    def _add_fallback(self, fallback):
+        """记录正在搜索的文件发生的回退（FALLBACK_*）"""
+        if self._timing is not None:
+            self._timing.fallbacks.append(fallback)
+            
+    def _reset_partial(self, hits, sheets, term_counts):
+        """回退到其他读取方式之前，清除失败的读取方式已经产生的部分结果"""
+        hits.clear()
+        if sheets is not None:
+            sheets.clear()
+        if term_counts is not None:
+            term_counts[:] = [0] * len(term_counts)
+            
+    def _mark_skipped(self, reason):
+        """把正在搜索的文件记为超出资源上限被跳过（还没有开始解析时解析器记为skipped）"""
+        if self._timing is not None:
+            self._timing.skipped = reason
+            if self._timing.parser is None:
+                self._timing.parser = PARSER_SKIPPED
+                
+    def _scan_rows(self, rows, pattern, sheet_name, hits, content=None, term_counts=None):
+        """逐行逐单元格匹配关键字
+        
+        rows为单元格值序列的可迭代对象（按行流式产生），不会把整个工作表拼成字符串，
+        因此内存占用与工作表大小无关。匹配计数是精确的；坐标只记录前若干个，不生成预览。
+        content（SheetContent）不为None时同时记录所有非空单元格的文本；
+        term_counts不为None时按搜索词分别累加匹配数。
+        返回匹配总数。正在记录耗时时，取出各行的时间计为解析，逐行匹配的时间计为匹配。
+        设置了资源上限时定期检查（见FileBudgetMeter），超出时抛出BudgetExceeded。
+        """
+        matches = 0
+        timing = self._timing
+        meter = self._meter
+        perf_counter = time.perf_counter
+        match_time = 0.0
+        loop_start = perf_counter()
+        
+        for row_idx, row in enumerate(rows, start=1):
+            if self.stop_flag:
+                break
+            if meter is not None:
+                meter.add_row(len(row))
+                
+            row_start = perf_counter() if timing is not None else 0.0
+            for col_idx, value in enumerate(row, start=1):
+                if value is None or value == '':
+                    continue
+                text = value if isinstance(value, str) else str(value)
+                if content is not None:
+                    content.add(row_idx, col_idx, text)
+                # 绝大多数单元格不匹配，先用search快速排除
+                match = pattern.search(text)
+                if match is None:
+                    continue
+                    
+                matches += self._count_matches(pattern, text, term_counts, match)
+                if len(hits) < self.MAX_RECORDED_HITS:
+                    hits.append((sheet_name, row_idx, col_idx))
+                    
+            if timing is not None:
+                match_time += perf_counter() - row_start
+                
+        if timing is not None:
+            timing.add(STAGE_MATCH, match_time)
+            timing.add(STAGE_PARSE, perf_counter() - loop_start - match_time)
+        return matches
+        
+    def _search_xlsx_file(self, file_path, pattern, hits, sheets=None, term_counts=None):
+        """搜索.xlsx（ZIP格式）文件
+        
+        快速搜索先用XML流式读取，然后是openpyxl只读模式，最后完整加载工作簿（如维度信息损坏时）。
+        ZIP压缩包本身损坏时换用其他读取方式也会失败，直接记为无法解析。
+        """
+        if not self.complete_search:
+            # 快速搜索：自带的XML流式读取器读到上限就停止解压，不读取工作表的其余部分
+            try:
+                return self._search_with_stream(file_path, pattern, hits, sheets, term_counts)
+            except _BUDGET_ERRORS:
+                raise
+            except _CORRUPT_ZIP_ERRORS as e:
+                return self._read_failed(file_path, e, sheets)
+            except Exception as e:
+                logger.warning(f"XML流式读取 {file_path} 失败，改用openpyxl: {str(e)}")
+                self._add_fallback(FALLBACK_STREAM)
+                self._reset_partial(hits, sheets, term_counts)
+                
+        # 用openpyxl只读模式流式读取：工作簿只打开一次，逐行解析，内存占用恒定
+        try:
+            return self._search_with_openpyxl(file_path, pattern, hits, sheets, term_counts)
+        except _BUDGET_ERRORS:
+            raise
+        except _CORRUPT_ZIP_ERRORS as e:
+            return self._read_failed(file_path, e, sheets)
+        except Exception as e:
+            logger.warning(f"流式读取 {file_path} 失败，尝试完整加载工作簿: {str(e)}")
+            self._add_fallback(FALLBACK_FULL_LOAD)
+            self._reset_partial(hits, sheets, term_counts)
+            
+        try:
+            return self._search_with_openpyxl(file_path, pattern, hits, sheets, term_counts,
+                                              read_only=False)
+        except _BUDGET_ERRORS:
+            raise
+        except Exception as e:
+            return self._read_failed(file_path, e, sheets)
+            
+    def _search_xls_file(self, file_path, pattern, hits, sheets=None, term_counts=None):
+        """搜索旧版Excel (.xls) 文件
+        
+        按需加载工作表（on_demand）：打开工作簿时只解析工作簿级的记录（包括共享字符串表），
+        每个工作表在搜索前才解析、搜索完立即卸载，内存中最多只有一个工作表。
+        搜索词不可能出现在数值、日期、布尔值的文本形式中时只匹配文本：
+        先在共享字符串表中匹配，再只遍历工作表的记录找出引用匹配字符串的单元格（见_scan_xls_records），
+        不解析单元格；工作表中有不在共享字符串表中的文本时改为解析后只匹配文本单元格（见_scan_xls_text）。
+        只匹配文本时没有完整的工作表内容，即使启用了工作表缓存也不缓存这个文件（sheets中追加None）：
+        之后的搜索重新按记录扫描，仍比完整解析快得多。
+        """
+        start = time.perf_counter()  # 首次使用时导入xlrd的时间也计入打开工作簿
+        import xlrd
+        
+        matches = 0
+        on_demand = self.use_xls_on_demand
+        text_only = (on_demand and self._text_cells_only()
+                     and (self.complete_search or self.quick_limit_unit != LIMIT_CELLS))
+        if text_only and sheets is not None:
+            sheets.append(None)
+            sheets = None
+        
+        try:
+            # 直接使用共享的文件内容（mmap时xlrd按偏移读取工作簿流，不复制整个文件）
+            contents = self._source.data if self._source is not None else None
+            workbook = xlrd.open_workbook(file_path, file_contents=contents, on_demand=on_demand,
+                                          logfile=_XLRD_LOG)
+            if self._timing is not None:
+                self._timing.parser = PARSER_XLRD
+                self._timing.add(STAGE_OPEN, time.perf_counter() - start)
+            try:
+                matched_strings = None
+                if text_only and can_scan_records(workbook):
+                    match_start = time.perf_counter()
+                    matched_strings = self._match_shared_strings(shared_strings(workbook), pattern)
+                    if self._timing is not None:
+                        self._timing.add(STAGE_MATCH, time.perf_counter() - match_start)
+                        
+                for sheet_idx in range(workbook.nsheets):
+                    if self.stop_flag:
+                        break
+                        
+                    if matched_strings is not None:
+                        sheet_matches = self._scan_xls_records(workbook, sheet_idx, matched_strings, hits,
+                                                               term_counts)
+                        if sheet_matches is not None:
+                            matches += sheet_matches
+                            continue
+                            
+                    load_start = time.perf_counter()
+                    sheet = workbook.sheet_by_index(sheet_idx)
+                    if self._timing is not None:
+                        self._timing.add(STAGE_PARSE, time.perf_counter() - load_start)
+                    if text_only:
+                        matches += self._scan_xls_text(sheet, pattern, hits, term_counts)
+                    else:
+                        # 根据配置决定搜索范围
+                        rows = self._limit_rows(sheet.row_values(row_idx) for row_idx in range(sheet.nrows))
+                        content = SheetContent(sheet.name) if sheets is not None else None
+                        matches += self._scan_rows(rows, pattern, sheet.name, hits, content, term_counts)
+                        if content is not None:
+                            content.finish()
+                            sheets.append(content)
+                    if on_demand:
+                        workbook.unload_sheet(sheet_idx)
+            finally:
+                workbook.release_resources()
+                
+        except _BUDGET_ERRORS:
+            raise
+        except Exception as e:
+            # 已按魔数确认是OLE2文件，openpyxl无法读取，不再回退
+            return self._read_failed(file_path, e, sheets)
+            
+        return matches
+        
+    def _match_shared_strings(self, strings, pattern):
+        """在.xls的共享字符串表中匹配，返回 {序号: (匹配数, 各搜索词的匹配数或None)}（只包含有匹配的字符串）"""
+        # 绝大多数工作簿不包含关键字，连接后搜索一次即可排除
+        if pattern.search('\n'.join(strings)) is None:
+            return {}
+        matched = {}
+        for isst, text in enumerate(strings):
+            match = pattern.search(text)
+            if match is None:
+                continue
+            counts = self._new_term_counts()
+            matched[isst] = (self._count_matches(pattern, text, counts, match), counts)
+        return matched
+        
+    def _scan_xls_records(self, workbook, sheet_idx, matched_strings, hits, term_counts=None):
+        """按记录扫描.xls工作表（见xls_records），不解析单元格
+        
+        每个引用匹配的共享字符串的单元格按该字符串的匹配数计数，结果与解析后逐个单元格搜索相同。
+        返回匹配总数；工作表中有不在共享字符串表中的文本或记录无法识别时返回None，由调用方解析工作表。
+        """
+        start = time.perf_counter()
+        max_row = None
+        if not self.complete_search:
+            max_row = self.quick_limit if self.quick_limit_unit == LIMIT_ROWS else self.QUICK_FALLBACK_ROWS
+        try:
+            cells, cell_count = scan_sst_cells(workbook, sheet_idx, matched_strings, max_row)
+        except TextRecordFound:
+            return None
+        except Exception as e:
+            logger.debug(f"按记录扫描工作表 {sheet_idx} 失败，改为解析: {str(e)}")
+            return None
+        finally:
+            if self._timing is not None:
+                self._timing.add(STAGE_PARSE, time.perf_counter() - start)
+        if self._meter is not None:
+            self._meter.add_rows(0, cell_count)
+            
+        sheet_name = workbook.sheet_names()[sheet_idx]
+        matches = 0
+        for row_idx, col_idx, isst in cells:
+            count, counts = matched_strings[isst]
+            matches += count
+            if term_counts is not None:
+                for term_idx, term_count in enumerate(counts):
+                    term_counts[term_idx] += term_count
+            if len(hits) < self.MAX_RECORDED_HITS:
+                hits.append((sheet_name, row_idx, col_idx))
+        return matches
+        
+    def _scan_xls_text(self, sheet, pattern, hits, term_counts=None):
+        """只匹配.xls工作表（xlrd.sheet.Sheet）中文本类型的单元格，返回匹配总数
+        
+        数值、日期、布尔值和空单元格不转换为文本，也不参与匹配。每XLS_BLOCK_ROWS行的文本单元格
+        以换行符连接后只搜索一次（搜索词不含换行符，匹配不会跨越单元格，完整单词的边界也相同），
+        没有匹配的块直接跳过；有匹配的块再逐行、逐个文本单元格计数和记录坐标，结果与逐个单元格搜索相同。
+        """
+        from xlrd import XL_CELL_TEXT
+        
+        matches = 0
+        timing = self._timing
+        meter = self._meter
+        loop_start = time.perf_counter()
+        nrows = sheet.nrows
+        if not self.complete_search:
+            nrows = min(nrows, self.quick_limit if self.quick_limit_unit == LIMIT_ROWS else self.QUICK_FALLBACK_ROWS)
+            
+        for block_start in range(0, nrows, self.XLS_BLOCK_ROWS):
+            if self.stop_flag:
+                break
+            block_end = min(nrows, block_start + self.XLS_BLOCK_ROWS)
+            row_texts = []
+            cells = 0
+            for row_idx in range(block_start, block_end):
+                types = sheet.row_types(row_idx)
+                values = sheet.row_values(row_idx)
+                cells += len(values)
+                row_texts.append('\n'.join(value for value, ctype in zip(values, types) if ctype == XL_CELL_TEXT))
+            if meter is not None:
+                meter.add_rows(block_end - block_start, cells)
+            if pattern.search('\n'.join(row_texts)) is None:
+                continue
+                
+            for row_idx, row_text in enumerate(row_texts, start=block_start):
+                if pattern.search(row_text) is None:
+                    continue
+                types = sheet.row_types(row_idx)
+                values = sheet.row_values(row_idx)
+                for col_idx, ctype in enumerate(types, start=1):
+                    if ctype != XL_CELL_TEXT:
+                        continue
+                    text = values[col_idx - 1]
+                    match = pattern.search(text)
+                    if match is None:
+                        continue
+                    matches += self._count_matches(pattern, text, term_counts, match)
+                    if len(hits) < self.MAX_RECORDED_HITS:
+                        hits.append((sheet.name, row_idx + 1, col_idx))
+                        
+        if timing is not None:
+            timing.add(STAGE_MATCH, time.perf_counter() - loop_start)
+        return matches
+        
+    def _search_with_openpyxl(self, file_path, pattern, hits, sheets=None, term_counts=None,
+                              read_only=True):
+        """使用openpyxl搜索工作簿
+        
+        默认使用只读模式按行流式读取；read_only=False时完整加载工作簿，
+        作为流式读取失败（如维度信息损坏）时的回退方案。读取失败时抛出异常。
+        """
+        start = time.perf_counter()  # 首次使用时导入openpyxl的时间也计入打开工作簿
+        import openpyxl
+        
+        matches = 0
+        
+        # 以文件对象打开：按文件名打开时openpyxl按扩展名拒绝实际是ZIP格式的.xls文件
+        with self._open_file(file_path) as f:
+            workbook = openpyxl.load_workbook(f, read_only=read_only, data_only=True)
+            if self._timing is not None:
+                self._timing.parser = PARSER_OPENPYXL if read_only else PARSER_OPENPYXL_FULL
+                self._timing.add(STAGE_OPEN, time.perf_counter() - start)
+            try:
+                for sheet_name in workbook.sheetnames:
+                    if self.stop_flag:
+                        break
+                        
+                    sheet = workbook[sheet_name]
+                    # 根据配置决定搜索范围
+                    rows = self._limit_rows(sheet.iter_rows(max_row=self._quick_max_row(), values_only=True))
+                    content = SheetContent(sheet_name) if sheets is not None else None
+                    matches += self._scan_rows(rows, pattern, sheet_name, hits, content, term_counts)
+                    if content is not None:
+                        content.finish()
+                        sheets.append(content)
+            finally:
+                workbook.close()
+                
+        return matches
+        
+    def _search_with_stream(self, file_path, pattern, hits, sheets=None, term_counts=None):
+        """快速搜索：用XlsxStreamReader按行读取每个工作表的开头，读到上限后停止解压"""
+        start = time.perf_counter()
+        matches = 0
+        
+        with self._open_file(file_path) as f, XlsxStreamReader(f) as reader:
+            if self._timing is not None:
+                self._timing.parser = PARSER_XLSX_STREAM
+                self._timing.add(STAGE_OPEN, time.perf_counter() - start)
+            for sheet_name, member in reader.sheets:
+                if self.stop_flag:
+                    break
+                    
+                rows = reader.iter_rows(member, self.quick_limit, self.quick_limit_unit)
+                content = SheetContent(sheet_name) if sheets is not None else None
+                matches += self._scan_rows(rows, pattern, sheet_name, hits, content, term_counts)
+                if content is not None:
+                    content.finish()
+                    sheets.append(content)
+                    
+        return matches
+        
+    def _search_text_file(self, file_path, pattern, hits, sheets=None, term_counts=None):
+        """搜索文本文件（CSV、TXT，以及实际是文本的"Excel"文件）
+        
+        文件内容已映射到内存、编码兼容ASCII时直接在原始字节上搜索（见_search_text_bytes），
+        其他情况（UTF-16、搜索词很多、不区分大小写的非ASCII字母等）解码后搜索（见_search_text_chunks）。
+        文本文件没有工作表内容可以缓存，sheets中追加None。
+        """
+        if sheets is not None:
+            sheets.append(None)
+        data = self._source.data if self._source is not None else None
+        if self.use_bytes_search and data is not None and len(self.terms) <= MAX_REGEX_TERMS:
+            encoding, tentative = detect_text_encoding(self._source.head(SNIFF_SIZE))
+            encodings = bytes_encodings(encoding, tentative)
+            bytes_pattern = build_bytes_pattern(self.terms, encodings, self.case_sensitive) if encodings else None
+            if bytes_pattern is not None:
+                matches = self._search_text_bytes(file_path, data, encoding, tentative, pattern, *bytes_pattern,
+                                                  hits, term_counts)
+                if matches is not None:
+                    return matches
+                logger.info(f"文件 {file_path} 中有超长的行，改为分块解码后搜索")
+                self._add_fallback(FALLBACK_TEXT_DECODE)
+                self._reset_partial(hits, None, term_counts)
+        return self._search_text_chunks(file_path, pattern, hits, term_counts)
+        
+    def _search_text_bytes(self, file_path, data, encoding, tentative, pattern, bytes_pattern, fold, hits,
+                           term_counts=None):
+        """直接在文件的原始字节（mmap）上搜索文本文件，不解码整个文件
+        
+        bytes_pattern（见build_bytes_pattern）在原始字节中找出可能匹配的行，只有这些行被解码，
+        再用匹配器确认和计数，因此结果与解码后搜索相同；一个窗口中的候选很密集（见DENSE_CANDIDATE_BYTES）时
+        把窗口内其余的完整行一起解码。按TEXT_CHUNK_SIZE字节的窗口依次查找（向后多看搜索词编码后的最大长度），
+        以便及时响应停止和资源上限检查；fold为True时每个窗口先转换为小写。
+        有匹配的行超过MAX_DECODE_LINE字节时返回None，由调用方改为分块解码后搜索。
+        """
+        start = time.perf_counter()
+        timing = self._timing
+        meter = self._meter
+        name = os.path.basename(file_path)
+        size = len(data)
+        if not self.complete_search:
+            if self.quick_limit_unit == LIMIT_BYTES:
+                size = min(size, self.quick_limit)
+            else:
+                # 按行数或单元格数限制时读取到第quick_limit行的末尾
+                end = 0
+                for _ in range(self.quick_limit):
+                    end = data.find(b'\n', end, size) + 1
+                    if not end:
+                        break
+                else:
+                    size = end
+        overlap = MAX_CHAR_BYTES * max(len(term) for term in self.terms)
+        
+        if timing is not None:
+            timing.parser = PARSER_TEXT_BYTES
+            timing.add(STAGE_OPEN, time.perf_counter() - start)
+        matches = 0
+        decode_time = 0.0
+        loop_start = time.perf_counter()
+        pos = 0
+        line_no = 1  # pos所在的行号
+        pending_lines = 0  # 尚未计入资源计量的行数
+        for window_start in range(0, size, self.TEXT_CHUNK_SIZE):
+            window_end = min(size, window_start + self.TEXT_CHUNK_SIZE)
+            if pos >= window_end:
+                # 上一个候选行（或一起解码的行）已经越过这个窗口
+                continue
+            if self.stop_flag:
+                break
+            if meter is not None and pending_lines >= CHECK_INTERVAL_ROWS:
+                meter.add_rows(pending_lines, pending_lines)
+                pending_lines = 0
+            search_end = min(size, window_end + overlap)
+            if fold:
+                haystack = data[window_start:search_end].lower()
+                base = window_start
+            else:
+                haystack = data
+                base = 0
+            candidate_lines = 0  # 本窗口中已经逐行解码的候选行数
+            first_candidate = 0  # 本窗口中第一个候选的位置
+            
+            while pos < window_end:
+                found = bytes_pattern.search(haystack, pos - base, search_end - base)
+                if found is None or found.start() + base >= window_end:
+                    lines = data[pos:window_end].count(b'\n')
+                    line_no += lines
+                    pending_lines += lines
+                    pos = window_end
+                    break
+                    
+                # 可能匹配的行：解码后用匹配器确认（完整单词、Unicode大小写等只在这里判断）
+                found_pos = found.start() + base
+                line_start = data.rfind(b'\n', 0, found_pos) + 1
+                line_end = data.find(b'\n', found_pos, size)
+                if line_end < 0:
+                    line_end = size
+                if not candidate_lines:
+                    first_candidate = found_pos
+                candidate_lines += 1
+                if (candidate_lines > self.DENSE_MIN_CANDIDATES
+                        and found_pos - first_candidate < candidate_lines * self.DENSE_CANDIDATE_BYTES):
+                    # 候选很密集时逐行解码反而更慢，把窗口内其余的完整行一起解码
+                    line_end = max(line_end, data.rfind(b'\n', line_end, window_end))
+                if line_end - line_start > MAX_DECODE_LINE:
+                    return None
+                if line_start > pos:
+                    lines = data[pos:line_start].count(b'\n')
+                    line_no += lines
+                    pending_lines += lines
+                decode_start = time.perf_counter()
+                # 读取上限截断的最后一行丢弃末尾不完整的字符
+                final = line_end < size or size == len(data)
+                text = decode_line(data[line_start:line_end], encoding, tentative, final)
+                decode_time += time.perf_counter() - decode_start
+                matches += self._scan_text_lines(text, line_no, name, pattern, hits, term_counts)
+                lines = text.count('\n') + 1
+                pos = line_end + 1
+                line_no += lines
+                pending_lines += lines
+                
+        if timing is not None:
+            timing.add(STAGE_PARSE, decode_time)
+            timing.add(STAGE_MATCH, time.perf_counter() - loop_start - decode_time)
+        return matches
+        
+    def _scan_text_lines(self, text, line_no, name, pattern, hits, term_counts=None):
+        """在解码后的若干完整行中搜索，text的第一行行号为line_no，返回匹配总数"""
+        matches = 0
+        counted = 0
+        last_line = 0
+        for match in pattern.finditer(text):
+            match_pos = match.start()
+            line_no += text.count('\n', counted, match_pos)
+            counted = match_pos
+            matches += 1
+            if term_counts is not None:
+                term_counts[pattern.term_of(match)] += 1
+            if line_no == last_line:
+                continue
+            last_line = line_no
+            if len(hits) < self.MAX_RECORDED_HITS:
+                hits.append((name, line_no, 1))
+        return matches
+        
+    def _search_text_chunks(self, file_path, pattern, hits, term_counts=None):
+        """分块解码文本文件后搜索
+        
+        按TEXT_CHUNK_SIZE字节分块读取和解码，内存占用与文件大小无关。每块只搜索到最后一个完整行的末尾，
+        其余部分与下一块合并后再搜索；超长的行没有换行符时保留最长搜索词长度的重叠，
+        因此跨越块边界的匹配既不会遗漏也不会重复计数。每行相当于一个单元格（列为1），
+        坐标按行号记录；快速搜索按行数或单元格数限制时读取前若干行，按字节数限制时读取前若干字节。
+        """
+        start = time.perf_counter()
+        timing = self._timing
+        meter = self._meter
+        name = os.path.basename(file_path)
+        max_bytes = max_line = None
+        if not self.complete_search:
+            if self.quick_limit_unit == LIMIT_BYTES:
+                max_bytes = self.quick_limit
+            else:
+                max_line = self.quick_limit
+        # 搜索词都不含换行符，匹配的长度不超过最长的搜索词
+        overlap = max((len(term) for term in self.terms), default=1)
+        
+        matches = 0
+        match_time = 0.0
+        buffer = ''
+        pos = 0  # buffer中开始搜索的位置（之前的一个字符只用于判断完整单词的边界）
+        line_no = 1  # buffer[0]所在的行号
+        last_line = 0  # 最近一个有匹配的行号
+        
+        with self._open_file(file_path) as f:
+            reader = TextStreamReader(f)
+            if timing is not None:
+                timing.parser = PARSER_TEXT_STREAM
+                timing.add(STAGE_OPEN, time.perf_counter() - start)
+            loop_start = time.perf_counter()
+            # 末尾的None表示文件读完，搜索剩余的全部内容
+            for chunk in chain(reader.iter_chunks(self.TEXT_CHUNK_SIZE, max_bytes), (None,)):
+                if self.stop_flag:
+                    break
+                if chunk is not None:
+                    buffer += chunk
+                    if len(buffer) - pos <= overlap:
+                        continue
+                    end = buffer.rfind('\n', pos, len(buffer) - overlap) + 1
+                    if end <= pos:
+                        end = len(buffer) - overlap
+                else:
+                    end = len(buffer)
+                    
+                match_start = time.perf_counter()
+                resume = end
+                line = line_no
+                counted = 0
+                for match in pattern.finditer(buffer, pos):
+                    match_pos = match.start()
+                    if match_pos >= end:
+                        break
+                    line += buffer.count('\n', counted, match_pos)
+                    counted = match_pos
+                    if max_line is not None and line > max_line:
+                        break
+                    matches += 1
+                    resume = max(resume, match.end())
+                    if term_counts is not None:
+                        term_counts[pattern.term_of(match)] += 1
+                    if line == last_line:
+                        continue
+                    last_line = line
+                    if len(hits) < self.MAX_RECORDED_HITS:
+                        hits.append((name, line, 1))
+                match_time += time.perf_counter() - match_start
+                
+                if chunk is None:
+                    break
+                # 保留resume之前的一个字符，下一块从它之后开始搜索
+                lines = buffer.count('\n', 0, resume - 1)
+                if meter is not None:
+                    meter.add_rows(lines, lines)
+                line_no += lines
+                buffer = buffer[resume - 1:]
+                pos = 1
+                if max_line is not None and line_no > max_line:
+                    break
+                    
+        if timing is not None:
+            timing.add(STAGE_MATCH, match_time)
+            timing.add(STAGE_PARSE, time.perf_counter() - loop_start - match_time)
+        return matches
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索耗时统计模块
+
+记录每个文件在各阶段（预过滤、打开工作簿、解析、匹配）的耗时和使用的解析器，
+汇总为各阶段总耗时、按解析器分组的耗时分布直方图和最慢文件列表，可以导出为JSON或CSV。
+"""
+
+import csv
+import heapq
+import json
+import os
+import threading
+import time
+
+# 阶段名称
+STAGE_ENUMERATE = 'enumerate'  # 遍历目录（枚举线程）
+STAGE_PREFILTER = 'prefilter'  # 读取.xlsx共享字符串表预过滤
+STAGE_OPEN = 'open'  # 打开工作簿（openpyxl.load_workbook / xlrd.open_workbook）
+STAGE_PARSE = 'parse'  # 逐行读取单元格（XML解析或BIFF解码）
+STAGE_MATCH = 'match'  # 在单元格文本中匹配关键字
+STAGE_INDEX = 'index'  # 查询内容索引
+STAGE_GUI = 'gui'  # 界面插入结果
+STAGES = (STAGE_ENUMERATE, STAGE_PREFILTER, STAGE_OPEN, STAGE_PARSE, STAGE_MATCH, STAGE_INDEX, STAGE_GUI)
+
+# 每个文件的阶段（单元格级别的阶段，用于CSV导出的列）
+FILE_STAGES = (STAGE_PREFILTER, STAGE_OPEN, STAGE_PARSE, STAGE_MATCH)
+
+# 解析器名称
+PARSER_OPENPYXL = 'openpyxl'
+PARSER_OPENPYXL_FULL = 'openpyxl (full load)'
+PARSER_XLSX_STREAM = 'xlsx stream'  # 快速搜索的XML流式读取
+PARSER_XLRD = 'xlrd'
+PARSER_TEXT_STREAM = 'text stream'  # CSV、TXT等文本文件的分块读取
+PARSER_TEXT_BYTES = 'text bytes'  # 文本文件直接在原始字节上搜索，只解码可能匹配的行
+PARSER_PREFILTER = 'prefilter'  # 被预过滤跳过，没有完整解析
+PARSER_SHEET_CACHE = 'sheet cache'
+PARSER_SKIPPED = 'skipped'  # 超出资源上限，还没有开始解析就被跳过
+PARSER_NONE = 'none'  # 没有解析器能够打开文件（不是工作簿格式或文件损坏）
+
+# 回退（第一次选择的解析方式没有成功或不适用）
+FALLBACK_STREAM = 'xlsx stream -> openpyxl'  # XML流式读取失败，改用openpyxl
+FALLBACK_FULL_LOAD = 'openpyxl -> full load'  # openpyxl只读模式失败，完整加载工作簿
+FALLBACK_FORMAT = 'extension mismatch'  # 实际格式与扩展名不符，按实际格式选择解析器
+FALLBACK_TEXT_DECODE = 'text bytes -> decode'  # 文本文件中有超长的行，改为分块解码后搜索
+
+# 单个文件耗时直方图的分桶上界（秒）
+HISTOGRAM_BOUNDS = (0.001, 0.01, 0.1, 1.0, 10.0)
+HISTOGRAM_LABELS = ("<1 ms", "1-10 ms", "10-100 ms", "0.1-1 s", "1-10 s", ">=10 s")
+
+MAX_SLOWEST_FILES = 100  # 保留的最慢文件数
+
+
+def histogram_bucket(seconds):
+    """返回耗时所在的直方图分桶序号"""
+    for i, bound in enumerate(HISTOGRAM_BOUNDS):
+        if seconds < bound:
+            return i
+    return len(HISTOGRAM_BOUNDS)
+
+
+class FileTiming:
+    """一个文件的搜索耗时：总耗时、各阶段耗时和使用的解析器"""
+
+    __slots__ = ('path', 'size', 'parser', 'total', 'stages', 'failed', 'skipped', 'fallbacks', '_start')
+
+    def __init__(self, path, size=0):
+        self.path = path
+        self.size = size
+        self.parser = None
+        self.total = 0.0
+        self.stages = {}
+        self.failed = False
+        self.skipped = None  # 超出资源上限被跳过时为原因（file_budget.REASON_*）
+        self.fallbacks = []  # 发生的回退（FALLBACK_*）
+        self._start = time.perf_counter()
+
+    def add(self, stage, seconds):
+        """累加一个阶段的耗时"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def finish(self):
+        """结束计时"""
+        self.total = time.perf_counter() - self._start
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'size': self.size,
+            'parser': self.parser,
+            'seconds': round(self.total, 6),
+            'stages': {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'fallbacks': list(self.fallbacks),
+        }
+
+
+class _ParserStats:
+    """一个解析器的汇总：文件数、总耗时、耗时分布"""
+
+    __slots__ = ('files', 'seconds', 'bytes', 'histogram')
+
+    def __init__(self):
+        self.files = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+
+class SearchStats:
+    """一次搜索的耗时统计（可以在不同线程中记录）"""
+
+    def __init__(self, max_slowest=MAX_SLOWEST_FILES):
+        self.max_slowest = max_slowest
+        self.stages = {}  # 阶段 -> 总耗时（秒）；各文件的阶段耗时在所有工作进程中累加
+        self.parsers = {}  # 解析器 -> _ParserStats
+        self.cached_files = {}  # 结果来源（结果缓存、内容索引） -> 文件数
+        self.failed_files = 0
+        self.skipped_files = {}  # 跳过原因 -> 超出资源上限被跳过的文件数
+        self.fallbacks = {}  # 回退（FALLBACK_*） -> 发生次数
+        self.wall_seconds = 0.0
+        self._slowest = []  # (总耗时, 序号, FileTiming) 小顶堆
+        self._counter = 0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage, seconds):
+        """累加不属于单个文件的阶段耗时（如遍历目录、界面更新）"""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_cached(self, source, count=1):
+        """记录直接使用缓存或索引结果、没有解析的文件"""
+        with self._lock:
+            self.cached_files[source] = self.cached_files.get(source, 0) + count
+
+    def add_skipped(self, reason):
+        """记录超出资源上限被跳过的文件"""
+        with self._lock:
+            self.skipped_files[reason] = self.skipped_files.get(reason, 0) + 1
+
+    def add_file(self, timing):
+        """记录一个文件的耗时"""
+        if timing is None:
+            return
+        with self._lock:
+            for stage, seconds in timing.stages.items():
+                self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            parser_stats = self.parsers.get(timing.parser)
+            if parser_stats is None:
+                parser_stats = self.parsers[timing.parser] = _ParserStats()
+            parser_stats.files += 1
+            parser_stats.seconds += timing.total
+            parser_stats.bytes += timing.size
+            parser_stats.histogram[histogram_bucket(timing.total)] += 1
+            if timing.failed:
+                self.failed_files += 1
+            for fallback in timing.fallbacks:
+                self.fallbacks[fallback] = self.fallbacks.get(fallback, 0) + 1
+
+            self._counter += 1
+            entry = (timing.total, self._counter, timing)
+            if len(self._slowest) < self.max_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif timing.total > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def finish(self):
+        """结束计时，记录整个搜索的耗时"""
+        self.wall_seconds = time.perf_counter() - self._start
+
+    @property
+    def checked_files(self):
+        return sum(parser_stats.files for parser_stats in self.parsers.values())
+
+    def slowest(self, count=None):
+        """按耗时从大到小返回最慢的文件（FileTiming列表）"""
+        with self._lock:
+            entries = sorted(self._slowest, key=lambda entry: entry[0], reverse=True)
+        return [timing for _, _, timing in entries[:count]]
+
+    def to_dict(self):
+        """转换为可序列化为JSON的字典"""
+        with self._lock:
+            parsers = {
+                name: {
+                    'files': parser_stats.files,
+                    'seconds': round(parser_stats.seconds, 6),
+                    'bytes': parser_stats.bytes,
+                    'histogram': dict(zip(HISTOGRAM_LABELS, parser_stats.histogram)),
+                }
+                for name, parser_stats in self.parsers.items()
+            }
+            stages = {stage: round(seconds, 6) for stage, seconds in self.stages.items()}
+            cached_files = dict(self.cached_files)
+            skipped_files = dict(self.skipped_files)
+            fallbacks = dict(self.fallbacks)
+        return {
+            'wall_seconds': round(self.wall_seconds, 6),
+            'checked_files': sum(parser['files'] for parser in parsers.values()),
+            'failed_files': self.failed_files,
+            'cached_files': cached_files,
+            'skipped_files': skipped_files,
+            'fallbacks': fallbacks,
+            'stages': stages,
+            'parsers': parsers,
+            'slowest_files': [timing.to_dict() for timing in self.slowest()],
+        }
+
+    def summary_lines(self, slowest_count=5):
+        """用于日志的简要报告"""
+        lines = [f"搜索耗时 {self.wall_seconds:.2f} 秒，检查 {self.checked_files} 个文件"]
+        if self.cached_files:
+            lines.append("直接使用已有结果: " + ', '.join(
+                f"{source} {count} 个文件" for source, count in self.cached_files.items()))
+        if self.skipped_files:
+            lines.append("超出资源上限被跳过: " + ', '.join(
+                f"{reason} {count} 个文件" for reason, count in self.skipped_files.items()))
+        if self.fallbacks:
+            lines.append("解析回退: " + ', '.join(
+                f"{fallback} {count} 次" for fallback, count in self.fallbacks.items()))
+        stages = ', '.join(
+            f"{stage} {self.stages[stage]:.2f}s" for stage in STAGES if stage in self.stages
+        )
+        if stages:
+            lines.append(f"各阶段累计耗时: {stages}")
+        for name, parser_stats in sorted(self.parsers.items(), key=lambda item: -item[1].seconds):
+            lines.append(f"{name}: {parser_stats.files} 个文件，{parser_stats.seconds:.2f} 秒")
+        for timing in self.slowest(slowest_count):
+            lines.append(f"慢文件 {timing.total:.2f}s [{timing.parser}] {timing.path}")
+        return lines
+
+    def export(self, path):
+        """导出统计：扩展名为.csv时导出最慢文件列表，否则导出完整的JSON报告"""
+        if os.path.splitext(path)[1].lower() == '.csv':
+            with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(
+                    ['path', 'parser', 'size', 'seconds'] + list(FILE_STAGES) + ['failed', 'skipped', 'fallbacks']
+                )
+                for timing in self.slowest():
+                    writer.writerow(
+                        [timing.path, timing.parser, timing.size, f"{timing.total:.6f}"]
+                        + [f"{timing.stages.get(stage, 0.0):.6f}" for stage in FILE_STAGES]
+                        + [int(timing.failed), timing.skipped or '', ';'.join(timing.fallbacks)]
+                    )
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
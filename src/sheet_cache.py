@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作表内容缓存模块
+
+缓存已解析工作簿中所有非空单元格的文本，按 路径+文件状态 判断是否仍然有效。
+之后用不同的关键字或选项搜索同一目录时，命中缓存的文件无需再用openpyxl/xlrd解析。
+内存中按可配置的上限和淘汰策略管理，被淘汰的内容可以转存到本地磁盘缓存目录。
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 淘汰策略：最久未使用优先 / 占用最大优先
+POLICY_LRU = 'lru'
+POLICY_LARGEST = 'largest'
+
+# 磁盘缓存超出上限时，清理到上限的该比例以下，避免每次写入都清理
+_DISK_PRUNE_RATIO = 0.9
+
+
+class SheetContent:
+    """一个工作表中所有非空单元格的文本
+
+    所有单元格文本以换行分隔拼接成一个字符串，另用三个整数数组记录每个单元格的
+    起始位置、行号和列号（按行、列顺序），比逐个保存字符串和坐标元组紧凑得多，
+    也可以直接在整个字符串上执行一次正则搜索。
+    """
+
+    __slots__ = ('name', 'text', 'offsets', 'rows', 'cols', '_parts', '_length')
+
+    def __init__(self, name):
+        self.name = name
+        self.text = ''
+        self.offsets = array('I')  # 每个单元格文本在text中的起始位置
+        self.rows = array('I')
+        self.cols = array('I')
+        self._parts = []  # 构建过程中的单元格文本，finish后释放
+        self._length = 0
+
+    def add(self, row, col, text):
+        """追加一个单元格（须按行、列顺序调用）"""
+        self.offsets.append(self._length)
+        self.rows.append(row)
+        self.cols.append(col)
+        self._parts.append(text)
+        self._length += len(text) + 1
+
+    def finish(self):
+        """结束构建，拼接单元格文本"""
+        self.text = '\n'.join(self._parts)
+        self._parts = None
+
+    def cell_text(self, index):
+        """返回第index个单元格的文本"""
+        start = self.offsets[index]
+        end = self.offsets[index + 1] - 1 if index + 1 < len(self.offsets) else len(self.text)
+        return self.text[start:end]
+
+    def nbytes(self):
+        """估算占用的内存字节数"""
+        return (sys.getsizeof(self.text) + sys.getsizeof(self.name)
+                + sum(len(values) * values.itemsize for values in (self.offsets, self.rows, self.cols)))
+
+
+class _CacheEntry:
+    """一个文件的缓存内容"""
+
+    __slots__ = ('state', 'complete', 'sheets', 'size', 'spilled')
+
+    def __init__(self, state, complete, sheets, spilled=False):
+        self.state = state
+        self.complete = complete  # 读取范围：True为完整内容，快速搜索时为 (上限单位, 上限)
+        self.sheets = sheets
+        self.size = sum(sheet.nbytes() for sheet in sheets) + 200
+        self.spilled = spilled  # 磁盘缓存目录中是否已有相同内容
+
+
+class SheetCache:
+    """工作表内容缓存
+
+    内存占用超过max_bytes时按policy淘汰文件；设置了spill_dir时，被淘汰的内容写入
+    该目录（压缩保存，总大小不超过max_disk_bytes），之后命中时再读回内存。
+    可以在不同线程中访问。
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, policy=POLICY_LRU, spill_dir=None,
+                 max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.spill_dir = spill_dir  # 磁盘缓存目录（None=不转存到磁盘）
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # 路径 -> _CacheEntry
+        self._total_bytes = 0
+        self._disk_bytes = None  # 磁盘缓存目录总大小（首次使用时统计）
+        self._lock = threading.Lock()
+
+    def set_limits(self, max_bytes, policy, spill_dir, max_disk_bytes):
+        """修改缓存上限、淘汰策略和磁盘缓存目录，超出部分立即淘汰"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.policy = policy
+            if spill_dir != self.spill_dir:
+                self.spill_dir = spill_dir
+                self._disk_bytes = None
+                for entry in self._entries.values():
+                    entry.spilled = False
+            self.max_disk_bytes = max_disk_bytes
+            self._evict()
+            if self.spill_dir:
+                self._prune_disk()
+
+    def get(self, path, state, complete, exact=False):
+        """获取文件的工作表内容列表
+
+        complete为需要的读取范围（True为完整内容，否则为快速搜索的 (上限单位, 上限)）。
+        文件状态一致、且缓存的范围与需要的相同才算命中；exact为False时完整内容也可以命中
+        （由调用方截取需要的部分）。否则返回None。
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None and self.spill_dir:
+                entry = self._load_spilled(path)
+            if entry is None or entry.state != state:
+                return None
+            if entry.complete != complete and (entry.complete is not True or exact):
+                return None
+            self._entries.move_to_end(path)
+            return entry.sheets
+
+    def put(self, path, state, complete, sheets):
+        """保存文件的工作表内容（同一文件状态的完整内容不会被快速搜索的部分内容替换）"""
+        entry = _CacheEntry(state, complete, sheets)
+        with self._lock:
+            current = self._entries.get(path)
+            if current is not None and current.state == state and current.complete is True and complete is not True:
+                return
+            self._remove(path)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[path] = entry
+            self._total_bytes += entry.size
+            self._evict()
+
+    def clear(self):
+        """清空内存和磁盘中的缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            if self.spill_dir and os.path.isdir(self.spill_dir):
+                for entry in os.scandir(self.spill_dir):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+            self._disk_bytes = 0
+
+    def stats(self):
+        """返回 (内存中的文件数, 内存占用字节数, 磁盘缓存字节数)"""
+        with self._lock:
+            disk_bytes = self._get_disk_bytes() if self.spill_dir else 0
+            return len(self._entries), self._total_bytes, disk_bytes
+
+    def _remove(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+    def _evict(self):
+        """按淘汰策略移出文件，直到内存占用不超过上限"""
+        while self._entries and self._total_bytes > self.max_bytes:
+            if self.policy == POLICY_LARGEST:
+                path = max(self._entries, key=lambda key: self._entries[key].size)
+            else:
+                path = next(iter(self._entries))
+            entry = self._entries[path]
+            self._remove(path)
+            if self.spill_dir and not entry.spilled:
+                self._spill(path, entry)
+
+    def _spill_path(self, path):
+        name = hashlib.sha1(path.encode('utf-8', errors='surrogatepass')).hexdigest()
+        return os.path.join(self.spill_dir, name + '.bin')
+
+    def _spill(self, path, entry):
+        """把被淘汰的文件内容写入磁盘缓存目录"""
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            data = zlib.compress(
+                pickle.dumps((path, entry.state, entry.complete, entry.sheets), pickle.HIGHEST_PROTOCOL), 1
+            )
+            spill_path = self._spill_path(path)
+            # 先统计（未统计过时扫描目录），覆盖已有的文件时减去其原来的大小
+            disk_bytes = self._get_disk_bytes()
+            try:
+                disk_bytes -= os.stat(spill_path).st_size
+            except FileNotFoundError:
+                pass
+            with open(spill_path, 'wb') as f:
+                f.write(data)
+            self._disk_bytes = disk_bytes + len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+        except Exception as e:
+            logger.warning(f"写入磁盘缓存失败: {str(e)}")
+
+    def _load_spilled(self, path):
+        """从磁盘缓存目录读回文件内容并放回内存，不存在或无法读取时返回None"""
+        spill_path = self._spill_path(path)
+        try:
+            with open(spill_path, 'rb') as f:
+                stored_path, state, complete, sheets = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取磁盘缓存 {spill_path} 失败: {str(e)}")
+            return None
+        if stored_path != path:
+            return None
+
+        entry = _CacheEntry(state, complete, sheets, spilled=True)
+        if entry.size <= self.max_bytes:
+            self._entries[path] = entry
+            self._total_bytes += entry.size
+            self._evict()
+        return entry
+
+    def _get_disk_bytes(self):
+        """磁盘缓存目录的总大小"""
+        if self._disk_bytes is None:
+            self._disk_bytes = 0
+            if os.path.isdir(self.spill_dir):
+                for entry in os.scandir(self.spill_dir):
+                    try:
+                        self._disk_bytes += entry.stat().st_size
+                    except OSError:
+                        pass
+        return self._disk_bytes
+
+    def _prune_disk(self):
+        """删除最早写入的磁盘缓存文件，直到总大小低于上限"""
+        if not os.path.isdir(self.spill_dir):
+            return
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * _DISK_PRUNE_RATIO
+        for _, size, spill_path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(spill_path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
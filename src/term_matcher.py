@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多关键字匹配模块
+
+把多个搜索词编译为一个匹配器，一次扫描即可找出所有搜索词：搜索词较少时合并为一个正则表达式，
+较多时使用Aho-Corasick自动机。匹配器提供与编译后的正则表达式相同的search/finditer接口，
+可以直接替代单个关键字的正则表达式；term_of()返回一个匹配对应的搜索词序号，用于分别计数。
+"""
+
+import os
+import re
+from collections import deque
+
+# 搜索词分隔符：英文分号、中文分号、换行
+_TERM_SEPARATOR_RE = re.compile(r'[;；\r\n]+')
+
+# 搜索词不超过该数量时合并为一个正则表达式，超过时使用Aho-Corasick自动机
+MAX_REGEX_TERMS = 100
+
+
+def split_terms(text):
+    """把输入的文本按分隔符拆分为搜索词列表（去掉首尾空白、空项和重复项，保持顺序）"""
+    terms = []
+    for term in _TERM_SEPARATOR_RE.split(text):
+        term = term.strip()
+        if term and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def load_terms(file_path):
+    """从文本文件或Excel文件中读取搜索词
+
+    文本文件（.txt、.csv等）按分隔符拆分，依次尝试UTF-8和GBK编码；
+    Excel文件读取第一个工作表中所有非空单元格。
+    """
+    file_lower = file_path.lower()
+    if file_lower.endswith('.xlsx'):
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            values = [value for row in rows for value in row if value is not None]
+        finally:
+            workbook.close()
+        return split_terms('\n'.join(str(value) for value in values))
+
+    if file_lower.endswith('.xls'):
+        import xlrd
+        sheet = xlrd.open_workbook(file_path).sheet_by_index(0)
+        values = [value for row_idx in range(sheet.nrows) for value in sheet.row_values(row_idx) if value != '']
+        return split_terms('\n'.join(str(value) for value in values))
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    for encoding in ('utf-8-sig', 'gbk'):
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = data.decode('utf-8', errors='replace')
+    return split_terms(text.replace(',', '\n') if os.path.splitext(file_lower)[1] == '.csv' else text)
+
+
+def build_matcher(terms, case_sensitive=False, whole_word=False):
+    """为搜索词列表构建匹配器"""
+    if len(terms) > MAX_REGEX_TERMS:
+        return AhoCorasickMatcher(terms, case_sensitive, whole_word)
+    return RegexTermMatcher(terms, case_sensitive, whole_word)
+
+
+def _lower(text):
+    """转换为小写并保持每个字符的位置不变（少数字符小写后长度会变化，只取第一个字符）"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char.lower()[:1] for char in text)
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class RegexTermMatcher:
+    """把所有搜索词合并为一个正则表达式的匹配器
+
+    较长的搜索词排在前面，同一位置优先匹配最长的搜索词；匹配互不重叠。
+    search和finditer直接使用编译后正则表达式的方法，没有额外开销。
+    """
+
+    def __init__(self, terms, case_sensitive=False, whole_word=False):
+        self.terms = list(terms)
+        self.case_sensitive = case_sensitive
+        alternatives = '|'.join(re.escape(term) for term in sorted(self.terms, key=len, reverse=True))
+        pattern = f'(?:{alternatives})'
+        if whole_word:
+            pattern = r'\b' + pattern + r'\b'
+        self.regex = re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+        self.search = self.regex.search
+        self.finditer = self.regex.finditer
+        self._term_index = {}
+        for i, term in enumerate(self.terms):
+            self._term_index.setdefault(self._normalize(term), i)
+
+    def _normalize(self, text):
+        return text if self.case_sensitive else text.lower()
+
+    def term_of(self, match):
+        """返回匹配对应的搜索词序号"""
+        index = self._term_index.get(self._normalize(match.group()))
+        if index is not None:
+            return index
+        # 少数字符的大小写转换不对称，逐个搜索词确认
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        for i, term in enumerate(self.terms):
+            if re.fullmatch(re.escape(term), match.group(), flags):
+                return i
+        return 0
+
+
+class TermMatch:
+    """Aho-Corasick匹配结果，接口与正则表达式的匹配对象相同"""
+
+    __slots__ = ('string', 'term_index', '_start', '_end')
+
+    def __init__(self, string, start, end, term_index):
+        self.string = string
+        self._start = start
+        self._end = end
+        self.term_index = term_index
+
+    def start(self):
+        return self._start
+
+    def end(self):
+        return self._end
+
+    def span(self):
+        return self._start, self._end
+
+    def group(self):
+        return self.string[self._start:self._end]
+
+
+class AhoCorasickMatcher:
+    """Aho-Corasick自动机匹配器，适合大量搜索词
+
+    每个字符只做一次状态转移，耗时与搜索词数量无关。匹配规则与RegexTermMatcher相同：
+    从左到右、同一位置取最长的搜索词、匹配互不重叠；完整单词匹配按正则表达式\\b的规则判断边界。
+    """
+
+    def __init__(self, terms, case_sensitive=False, whole_word=False):
+        self.terms = list(terms)
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self._goto = [{}]  # 状态 -> {字符: 下一状态}
+        self._fail = [0]
+        self._output = [()]  # 状态 -> 在此结束的 (搜索词长度, 搜索词序号)
+        for index, term in enumerate(self.terms):
+            self._add_term(term if case_sensitive else _lower(term), index)
+        self._build_failure_links()
+
+    def _add_term(self, term, index):
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        if not any(length == len(term) for length, _ in self._output[state]):
+            self._output[state] += ((len(term), index),)
+
+    def _build_failure_links(self):
+        """广度优先计算失败链接，并把失败状态的输出合并到当前状态"""
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def _candidates(self, text, pos, endpos):
+        """产生所有（可能重叠的）匹配 (起始位置, 结束位置, 搜索词序号)"""
+        haystack = text if self.case_sensitive else _lower(text)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for i in range(pos, endpos):
+            char = haystack[i]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, index in output[state]:
+                yield i + 1 - length, i + 1, index
+
+    def _is_boundary(self, text, index, endpos):
+        before = index > 0 and _is_word_char(text[index - 1])
+        after = index < endpos and _is_word_char(text[index])
+        return before != after
+
+    def finditer(self, text, pos=0, endpos=None):
+        """按从左到右的顺序产生互不重叠的匹配（TermMatch）"""
+        endpos = len(text) if endpos is None else min(endpos, len(text))
+        candidates = self._candidates(text, pos, endpos)
+        if self.whole_word:
+            candidates = (
+                (start, end, index) for start, end, index in candidates
+                if self._is_boundary(text, start, endpos) and self._is_boundary(text, end, endpos)
+            )
+
+        # 候选按结束位置产生；保留每个起始位置最长的候选，再从左到右选取不重叠的匹配
+        best = {}
+        for start, end, index in candidates:
+            if start not in best or end > best[start][0]:
+                best[start] = (end, index)
+        last_end = pos
+        for start in sorted(best):
+            if start < last_end:
+                continue
+            end, index = best[start]
+            last_end = end
+            yield TermMatch(text, start, end, index)
+
+    def search(self, text, pos=0, endpos=None):
+        """返回第一个匹配，没有匹配时返回None"""
+        return next(self.finditer(text, pos, endpos), None)
+
+    def term_of(self, match):
+        """返回匹配对应的搜索词序号"""
+        return match.term_index
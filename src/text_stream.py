@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本文件流式读取模块
+
+CSV、TXT（以及从网页系统导出的、实际是文本的"Excel"文件）按固定大小的块读取和解码，
+不把整个文件读入内存。编码根据文件开头自动识别（见file_format.sniff_encoding），
+多字节字符跨越块边界时由增量解码器衔接。
+
+UTF-8、GBK等兼容ASCII的编码还可以不解码，直接在原始字节上搜索（见build_bytes_pattern）：
+换行符在这些编码中只会是换行，按字节找出可能匹配的行后只解码这些行。
+"""
+
+import codecs
+import re
+from .file_format import sniff_encoding, SNIFF_SIZE, FALLBACK_TEXT_ENCODING
+
+# 每次读取的字节数
+CHUNK_SIZE = 1024 * 1024
+
+# 预览中一行文本最多显示的字符数（超长的行只显示匹配附近的部分）
+PREVIEW_CHARS = 200
+
+# 文本文件在内容索引中的工作表序号（区别于工作簿的工作表，预览按行号显示）
+TEXT_SHEET_INDEX = -1
+
+# 可以直接按字节搜索的编码：兼容ASCII，多字节字符中不会出现换行符（0x0A）
+BYTES_ENCODINGS = ('utf-8', 'utf-8-sig', FALLBACK_TEXT_ENCODING, 'latin-1')
+
+# 按字节搜索时一次解码的一行的最大字节数，超过时改为分块解码整个文件
+MAX_DECODE_LINE = 16 * 1024 * 1024
+
+# 待定为UTF-8的内容遇到无效字节后，逐段尝试按UTF-8解码的字节数
+TENTATIVE_WINDOW = 64 * 1024
+
+# 一个字符编码后的最大字节数（UTF-8和GB18030都是4）
+MAX_CHAR_BYTES = 4
+
+# 不会匹配任何内容的字节正则表达式（搜索词都无法用文件的编码表示时）
+_NEVER_MATCH = re.compile(b'(?!)')
+
+
+def detect_text_encoding(head):
+    """根据文件开头识别编码，返回 (编码, 是否待定)
+
+    开头只有ASCII字符时无法区分UTF-8和GBK：先按UTF-8严格解码（待定），遇到无法解码的字节再改用GB18030。
+    """
+    encoding = sniff_encoding(head)
+    return encoding, encoding == 'utf-8' and head.isascii()
+
+
+def bytes_encodings(encoding, tentative):
+    """按字节搜索时需要编码搜索词的编码，不能按字节搜索时返回None"""
+    if tentative:
+        return ('utf-8', FALLBACK_TEXT_ENCODING)
+    if encoding in BYTES_ENCODINGS:
+        # 搜索词编码时不能带BOM
+        return ('utf-8' if encoding == 'utf-8-sig' else encoding,)
+    return None
+
+
+def build_bytes_pattern(terms, encodings, case_sensitive=False):
+    """把搜索词按文件的编码编译为字节正则表达式，用于在原始字节中找出可能匹配的行
+
+    返回 (正则表达式, 是否折叠大小写)，不能按字节搜索时返回None。结果是实际匹配的超集（不判断完整单词），
+    每个候选行解码后再用文本匹配器确认和计数。不区分大小写时搜索词转换为小写，
+    折叠大小写为True表示要在bytes.lower()之后的内容中搜索（re的IGNORECASE会使字面量搜索慢一个数量级）；
+    bytes.lower()只转换ASCII字母，搜索词含有其他区分大小写的字符（如é）时返回None，改为解码后搜索。
+    """
+    if not case_sensitive and any(
+        not char.isascii() and (char.lower() != char or char.upper() != char) for term in terms for char in term
+    ):
+        return None
+    alternatives = set()
+    for encoding in encodings:
+        for term in terms:
+            try:
+                alternatives.add(term.encode(encoding))
+            except UnicodeEncodeError:
+                # 无法用文件的编码表示的搜索词不可能出现在文件中
+                continue
+    if not alternatives:
+        return _NEVER_MATCH, False
+    # 不区分大小写时，只要搜索词含有ASCII字母（即使全是小写）就要折叠，文件中可能是大写的
+    fold = not case_sensitive and any(alternative.lower() != alternative.upper() for alternative in alternatives)
+    if fold:
+        alternatives = {alternative.lower() for alternative in alternatives}
+    alternatives = sorted(alternatives, key=len, reverse=True)
+    return re.compile(b'|'.join(re.escape(alternative) for alternative in alternatives)), fold
+
+
+def decode_line(raw, encoding, tentative=False, final=True):
+    """解码按字节找到的一行（候选密集时可以是连续的多行）；final为False时丢弃末尾不完整的字符（读取上限截断的行）
+
+    编码待定时每行各自判断按UTF-8还是GB18030解码（见decode_tentative_lines），多行一起解码时结果也相同。
+    """
+    if not final:
+        if tentative:
+            try:
+                return codecs.getincrementaldecoder('utf-8')().decode(raw)
+            except UnicodeDecodeError:
+                encoding = FALLBACK_TEXT_ENCODING
+        return codecs.getincrementaldecoder(encoding)('replace').decode(raw)
+    if tentative:
+        return decode_tentative_lines(raw)
+    return raw.decode(encoding, 'replace')
+
+
+def decode_tentative_lines(raw):
+    """按行解码待定为UTF-8的内容（与decode_line相同：能按UTF-8解码的行按UTF-8，其余的行按GB18030）
+
+    raw为完整的若干行。按TENTATIVE_WINDOW字节（在行尾处截断）分段，能整段按UTF-8解码的直接解码，
+    只有解码失败的段才逐行解码，因此大部分是UTF-8、个别字节无效的文件仍然很快。
+    """
+    parts = []
+    pos = 0
+    while pos < len(raw):
+        end = raw.find(b'\n', pos + TENTATIVE_WINDOW) + 1 or len(raw)
+        window = raw[pos:end]
+        try:
+            parts.append(window.decode('utf-8'))
+        except UnicodeDecodeError:
+            lines = []
+            for line in window.split(b'\n'):
+                try:
+                    lines.append(line.decode('utf-8'))
+                except UnicodeDecodeError:
+                    lines.append(line.decode(FALLBACK_TEXT_ENCODING, 'replace'))
+            parts.append('\n'.join(lines))
+        pos = end
+    return ''.join(parts)
+
+
+def preview_line(line, offset=0, width=PREVIEW_CHARS):
+    """返回一行文本用于预览的部分：超过width个字符时截取offset（匹配位置）附近的部分"""
+    line = line.rstrip('\r')
+    if len(line) <= width:
+        return line
+    start = max(0, min(offset - width // 4, len(line) - width))
+    text = line[start:start + width]
+    if start > 0:
+        text = '…' + text
+    if start + width < len(line):
+        text += '…'
+    return text
+
+
+class TextStreamReader:
+    """按块读取文本文件并解码
+
+    f为二进制文件对象（文件或FileBuffer.open()的结果）；head为已经读取的文件开头，
+    不提供时从f读取后回到开头。encoding属性为识别出的编码。
+    开头只有ASCII字符（待定为UTF-8）的文件遇到无法按UTF-8解码的字节后，从那一行开始逐行识别编码
+    （见decode_tentative_lines），与按字节搜索时逐行解码（decode_line）的结果相同。
+    """
+
+    def __init__(self, f, head=None):
+        self._file = f
+        if head is None:
+            head = f.read(SNIFF_SIZE)
+            f.seek(0)
+        self.encoding, self._tentative = detect_text_encoding(head)
+
+    def iter_chunks(self, chunk_size=CHUNK_SIZE, max_bytes=None):
+        """产生解码后的文本块；max_bytes不为None时最多读取这么多字节（末尾不完整的字符丢弃）"""
+        decoder = codecs.getincrementaldecoder(self.encoding)('strict' if self._tentative else 'replace')
+        by_line = False  # 是否已改为逐行识别编码
+        pending = b''  # 逐行识别编码时尚未读完的一行
+        remaining = max_bytes
+        while True:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            data = self._file.read(size) if size > 0 else b''
+            if not data and remaining == 0:
+                if pending:
+                    yield decode_line(pending, 'utf-8', True, final=False)
+                return
+            if remaining is not None:
+                remaining -= len(data)
+            final = not data
+            if by_line:
+                text, pending = self._decode_by_line(pending + data, final)
+            else:
+                try:
+                    text = decoder.decode(data, final)
+                except UnicodeDecodeError as e:
+                    # 解码失败时解码器中仍是之前缓存的不完整字节，e.start相对于它们连同本块的内容；
+                    # 出错的行之前仍按UTF-8解码，从这一行开始逐行识别编码
+                    raw = decoder.getstate()[0] + data
+                    line_start = raw.rfind(b'\n', 0, e.start) + 1
+                    by_line = True
+                    text, pending = self._decode_by_line(raw[line_start:], final)
+                    text = raw[:line_start].decode('utf-8') + text
+            if text:
+                yield text
+            if final:
+                return
+
+    def _decode_by_line(self, raw, final):
+        """逐行识别编码解码完整的行，返回 (文本, 最后一个不完整的行)；final为True时全部解码"""
+        end = len(raw) if final else raw.rfind(b'\n') + 1
+        return decode_tentative_lines(raw[:end]), raw[end:]
+
+    def iter_lines(self, chunk_size=CHUNK_SIZE):
+        """逐行产生 (行号, 文本)，行号从1开始，文本不含换行符"""
+        line_no = 1
+        rest = ''
+        for chunk in self.iter_chunks(chunk_size):
+            lines = (rest + chunk).split('\n')
+            rest = lines.pop()
+            for line in lines:
+                yield line_no, line.rstrip('\r')
+                line_no += 1
+        if rest:
+            yield line_no, rest.rstrip('\r')
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无法读取的文件缓存模块
+
+记录解析失败的文件（按 路径+文件状态），之后的搜索（不论关键字和选项）在文件修改之前
+直接跳过它们，损坏的文件不会在每次搜索时都被重新完整解析一遍。
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class UnreadableCache:
+    """无法读取的文件LRU缓存：{路径: (文件状态, 失败原因)}，可以在不同线程中访问"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, state):
+        """文件状态未变时返回上次的失败原因，否则返回None"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != state:
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+
+    def put(self, path, state, reason):
+        """记录解析失败的文件"""
+        with self._lock:
+            self._entries.pop(path, None)
+            self._entries[path] = (state, reason)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, path):
+        """移除一个文件的记录"""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel关键字搜索工具显示格式化模块
+"""
+
+from datetime import datetime
+
+
+def format_file_size(size_bytes):
+    """格式化文件大小为人类可读格式"""
+    if size_bytes == 0:
+        return "0 B"
+        
+    size_names = ["B", "KB", "MB", "GB"]
+    i = 0
+    while size_bytes >= 1024 and i < len(size_names) - 1:
+        size_bytes /= 1024.0
+        i += 1
+        
+    return f"{size_bytes:.1f} {size_names[i]}"
+
+
+def format_mtime(mtime):
+    """格式化文件修改时间"""
+    return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def column_letter(col_idx):
+    """把列号（从1开始）转换为Excel列字母，如 1 -> A，28 -> AB"""
+    letters = ''
+    while col_idx > 0:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
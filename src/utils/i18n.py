@@ -13,12 +13,27 @@ CHINESE_TRANSLATIONS = {
     "Select Directory to Search": "选择要搜索的目录",
     "Browse": "浏览",
     "Keyword:": "关键字:",
-    "Enter keyword to search...": "输入要搜索的关键字...",
+    "Enter keyword to search...": "输入要搜索的关键字（多个关键字用分号分隔）...",
+    "Load Terms": "导入",
+    "Load Terms Tooltip": "从文本文件或Excel文件导入搜索词列表（每行或每个单元格一个）",
+    "Term Files (*.txt *.csv *.xlsx *.xls)": "搜索词文件 (*.txt *.csv *.xlsx *.xls)",
+    "Failed to load terms": "导入搜索词失败",
+    "Loaded {} search terms": "已导入{}个搜索词",
     "Case Sensitive": "区分大小写",
     "Whole Word": "完整单词",
     "Include Subdirectories": "包含子目录",
     "Complete Search": "完整搜索",
-    "Complete Search Tooltip": "搜索文件的所有行（取消勾选只搜索前1000行以提高速度）",
+    "Complete Search Tooltip": "搜索文件的所有行（取消勾选为快速搜索，每个工作表只读取右侧设置的上限以提高速度）",
+    "Quick Limit Tooltip": "快速搜索时每个工作表读取的上限：前若干行、前若干个非空单元格，或.xlsx工作表XML的前若干KB",
+    "Rows": "行",
+    "Cells": "单元格",
+    "KB": "KB",
+    "Worker Processes:": "工作进程数:",
+    "Worker Processes Tooltip": "并行解析文件的进程数（1 = 单进程顺序搜索）",
+    "Use Content Index": "使用内容索引",
+    "Use Content Index Tooltip": "未修改的文件直接从本地索引获取结果，搜索完成后在后台更新索引",
+    "Indexing... {}/{}": "正在索引... {}/{}",
+    "Content index updated: {} files re-indexed": "内容索引已更新：重新索引了{}个文件",
     "File Types:": "文件类型:",
     "All Excel Files (.xlsx, .xls)": "所有Excel文件 (.xlsx, .xls)",
     "Excel 2007+ (.xlsx)": "Excel 2007+ (.xlsx)",
@@ -40,6 +55,66 @@ CHINESE_TRANSLATIONS = {
     "Language": "语言",
     "Start Search": "开始搜索",
     "Stop Search": "停止搜索",
+    "Watch Directory for Changes": "监视目录变化",
+    "Cache Settings...": "缓存设置...",
+    "Cache Settings": "缓存设置",
+    "Cached Searches:": "缓存的搜索数:",
+    "Cached Searches Tooltip": "最多保留多少次搜索的结果；重复相同的搜索时只重新解析修改过的文件（0=不缓存）",
+    "Result Cache Memory Limit:": "结果缓存内存上限:",
+    "Cached: {} searches, {:.1f} MB": "已缓存: {} 次搜索, {:.1f} MB",
+    "Clear Cache": "清空缓存",
+    "Search Result Cache": "搜索结果缓存",
+    "Sheet Content Cache": "工作表内容缓存",
+    "Sheet Content Cache Tooltip": "保存已解析文件的单元格文本，用其他关键字或选项再次搜索时无需重新解析（内存上限为0时不缓存）",
+    "Memory Limit:": "内存上限:",
+    "Eviction Policy:": "淘汰策略:",
+    "Least Recently Used": "最久未使用优先",
+    "Largest First": "占用最大优先",
+    "Spill Evicted Sheets to Disk": "将淘汰的内容转存到磁盘",
+    "Disk Limit:": "磁盘上限:",
+    "Cached: {} files, {:.1f} MB in memory, {:.1f} MB on disk": "已缓存: {} 个文件, 内存 {:.1f} MB, 磁盘 {:.1f} MB",
+    "Unreadable Files": "无法读取的文件",
+    "Unreadable Files Tooltip": "解析失败的文件（损坏或不是Excel工作簿）在修改之前的搜索中直接跳过；清空后下次搜索重新尝试解析",
+    "{} files skipped until modified": "{} 个文件在修改之前跳过",
+    "Parser fallbacks: {}": "解析回退: {}",
+    "Search Statistics...": "搜索统计...",
+    "Search Statistics": "搜索统计",
+    "Search took {:.2f} s: {} files checked, {} failed, {} from cache or index": "搜索耗时 {:.2f} 秒：检查了 {} 个文件，{} 个读取失败，{} 个直接使用缓存或索引结果",
+    "Stages": "各阶段耗时",
+    "Stage": "阶段",
+    "Time (s)": "耗时（秒）",
+    "Share": "占比",
+    "Parsers": "解析器",
+    "Parser": "解析器",
+    "Files": "文件数",
+    "Average (ms)": "平均（毫秒）",
+    "Slowest Files": "最慢的文件",
+    "Total (s)": "总耗时（秒）",
+    "Directory Scan": "遍历目录",
+    "Prefilter": "预过滤",
+    "Open Workbook": "打开工作簿",
+    "Parse": "解析",
+    "Match": "匹配",
+    "Index Lookup": "查询索引",
+    "GUI Update": "界面更新",
+    "Export...": "导出...",
+    "Export Statistics": "导出统计",
+    "JSON Report (*.json);;CSV Slowest Files (*.csv)": "JSON报告 (*.json);;CSV最慢文件列表 (*.csv)",
+    "Failed to export statistics": "导出统计失败",
+    "Close": "关闭",
+    "File Limits...": "单文件上限...",
+    "File Limits": "单文件上限",
+    "Per-File Limits": "单个文件的资源上限",
+    "File Limits Hint": "超出任一上限的文件会被跳过并记录，不会拖住整个搜索；搜索完成后可通过\"重试跳过的文件\"不限制资源重新搜索它们。0表示不限制。",
+    "Unlimited": "不限制",
+    "Max File Size:": "文件大小上限:",
+    "Max Parse Time:": "解析耗时上限:",
+    "Max Cells:": "单元格数上限:",
+    "Max Memory:": "内存上限:",
+    "Parse Files in Separate Processes": "在单独的进程中解析文件",
+    "Parse Files in Separate Processes Tooltip": "超时的文件所在的进程会被终止，内存上限作为进程的内存限制；打开工作簿期间也能强制执行上限，但每个文件多一次进程间传递的开销",
+    "Retry Skipped Files": "重试跳过的文件",
+    "{} files skipped for exceeding file limits": "{} 个文件超出单文件上限被跳过",
     "Help": "帮助",
     "About": "关于",
     "Warning": "警告",
@@ -55,7 +130,10 @@ CHINESE_TRANSLATIONS = {
     "Size": "大小",
     "Modified": "修改时间",
     "Keyword Matches": "关键字匹配",
+    "Term Matches": "各关键字匹配",
     "Preview not available": "预览不可用",
+    "Loading preview...": "正在读取预览...",
+    "The file has changed since the search; the preview may not match.": "文件在搜索之后已被修改，预览可能与搜索结果不一致。",
     "Path copied to clipboard": "路径已复制到剪贴板",
     "About Excel Keyword Search Tool": "关于Excel关键字搜索工具",
     "Excel Keyword Search Tool v1.0.0": "Excel关键字搜索工具 v1.0.0",
@@ -81,12 +159,27 @@ ENGLISH_TRANSLATIONS = {
     "Select Directory to Search": "Select Directory to Search",
     "Browse": "Browse",
     "Keyword:": "Keyword:",
-    "Enter keyword to search...": "Enter keyword to search...",
+    "Enter keyword to search...": "Enter keyword to search (separate multiple keywords with ;)...",
+    "Load Terms": "Load",
+    "Load Terms Tooltip": "Load a list of search terms from a text or Excel file (one per line or cell)",
+    "Term Files (*.txt *.csv *.xlsx *.xls)": "Term Files (*.txt *.csv *.xlsx *.xls)",
+    "Failed to load terms": "Failed to load terms",
+    "Loaded {} search terms": "Loaded {} search terms",
     "Case Sensitive": "Case Sensitive",
     "Whole Word": "Whole Word",
     "Include Subdirectories": "Include Subdirectories",
     "Complete Search": "Complete Search",
-    "Complete Search Tooltip": "Search all rows in files (uncheck to search only first 1000 rows for speed)",
+    "Complete Search Tooltip": "Search all rows in files (uncheck for a quick search that reads only up to the limit on the right from each sheet)",
+    "Quick Limit Tooltip": "How much of each sheet a quick search reads: the first rows, the first non-empty cells, or the first KB of an .xlsx sheet's XML",
+    "Rows": "Rows",
+    "Cells": "Cells",
+    "KB": "KB",
+    "Worker Processes:": "Worker Processes:",
+    "Worker Processes Tooltip": "Number of processes parsing files in parallel (1 = sequential search)",
+    "Use Content Index": "Use Content Index",
+    "Use Content Index Tooltip": "Answer unchanged files from a local index and update it in the background after each search",
+    "Indexing... {}/{}": "Indexing... {}/{}",
+    "Content index updated: {} files re-indexed": "Content index updated: {} files re-indexed",
     "File Types:": "File Types:",
     "All Excel Files (.xlsx, .xls)": "All Excel Files (.xlsx, .xls)",
     "Excel 2007+ (.xlsx)": "Excel 2007+ (.xlsx)",
@@ -108,6 +201,66 @@ ENGLISH_TRANSLATIONS = {
     "Language": "Language",
     "Start Search": "Start Search",
     "Stop Search": "Stop Search",
+    "Watch Directory for Changes": "Watch Directory for Changes",
+    "Cache Settings...": "Cache Settings...",
+    "Cache Settings": "Cache Settings",
+    "Cached Searches:": "Cached Searches:",
+    "Cached Searches Tooltip": "How many searches to keep results for; repeating an identical search only re-parses modified files (0 = no caching)",
+    "Result Cache Memory Limit:": "Result Cache Memory Limit:",
+    "Cached: {} searches, {:.1f} MB": "Cached: {} searches, {:.1f} MB",
+    "Clear Cache": "Clear Cache",
+    "Search Result Cache": "Search Result Cache",
+    "Sheet Content Cache": "Sheet Content Cache",
+    "Sheet Content Cache Tooltip": "Keep the cell text of parsed files so searching again with another keyword or options skips parsing (memory limit 0 disables it)",
+    "Memory Limit:": "Memory Limit:",
+    "Eviction Policy:": "Eviction Policy:",
+    "Least Recently Used": "Least Recently Used",
+    "Largest First": "Largest First",
+    "Spill Evicted Sheets to Disk": "Spill Evicted Sheets to Disk",
+    "Disk Limit:": "Disk Limit:",
+    "Cached: {} files, {:.1f} MB in memory, {:.1f} MB on disk": "Cached: {} files, {:.1f} MB in memory, {:.1f} MB on disk",
+    "Unreadable Files": "Unreadable Files",
+    "Unreadable Files Tooltip": "Files that failed to parse (corrupt or not Excel workbooks) are skipped by later searches until they are modified; clear to try parsing them again",
+    "{} files skipped until modified": "{} files skipped until modified",
+    "Parser fallbacks: {}": "Parser fallbacks: {}",
+    "Search Statistics...": "Search Statistics...",
+    "Search Statistics": "Search Statistics",
+    "Search took {:.2f} s: {} files checked, {} failed, {} from cache or index": "Search took {:.2f} s: {} files checked, {} failed, {} from cache or index",
+    "Stages": "Stages",
+    "Stage": "Stage",
+    "Time (s)": "Time (s)",
+    "Share": "Share",
+    "Parsers": "Parsers",
+    "Parser": "Parser",
+    "Files": "Files",
+    "Average (ms)": "Average (ms)",
+    "Slowest Files": "Slowest Files",
+    "Total (s)": "Total (s)",
+    "Directory Scan": "Directory Scan",
+    "Prefilter": "Prefilter",
+    "Open Workbook": "Open Workbook",
+    "Parse": "Parse",
+    "Match": "Match",
+    "Index Lookup": "Index Lookup",
+    "GUI Update": "GUI Update",
+    "Export...": "Export...",
+    "Export Statistics": "Export Statistics",
+    "JSON Report (*.json);;CSV Slowest Files (*.csv)": "JSON Report (*.json);;CSV Slowest Files (*.csv)",
+    "Failed to export statistics": "Failed to export statistics",
+    "Close": "Close",
+    "File Limits...": "File Limits...",
+    "File Limits": "File Limits",
+    "Per-File Limits": "Per-File Limits",
+    "File Limits Hint": "Files exceeding any limit are skipped and recorded instead of holding up the whole search; use \"Retry Skipped Files\" afterwards to search them without limits. 0 means unlimited.",
+    "Unlimited": "Unlimited",
+    "Max File Size:": "Max File Size:",
+    "Max Parse Time:": "Max Parse Time:",
+    "Max Cells:": "Max Cells:",
+    "Max Memory:": "Max Memory:",
+    "Parse Files in Separate Processes": "Parse Files in Separate Processes",
+    "Parse Files in Separate Processes Tooltip": "Kill the process parsing a file that runs over time and apply the memory limit to it, so limits are enforced even while a workbook is being opened, at the cost of passing each file to a worker process",
+    "Retry Skipped Files": "Retry Skipped Files",
+    "{} files skipped for exceeding file limits": "{} files skipped for exceeding file limits",
     "Help": "Help",
     "About": "About",
     "Warning": "Warning",
@@ -123,7 +276,10 @@ ENGLISH_TRANSLATIONS = {
     "Size": "Size",
     "Modified": "Modified",
     "Keyword Matches": "Keyword Matches",
+    "Term Matches": "Term Matches",
     "Preview not available": "Preview not available",
+    "Loading preview...": "Loading preview...",
+    "The file has changed since the search; the preview may not match.": "The file has changed since the search; the preview may not match.",
     "Path copied to clipboard": "Path copied to clipboard",
     "About Excel Keyword Search Tool": "About Excel Keyword Search Tool",
     "Excel Keyword Search Tool v1.0.0": "Excel Keyword Search Tool v1.0.0",
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可终止的工作进程池模块
+
+concurrent.futures的进程池无法终止正在执行的单个任务：工作进程卡在一个文件上时只能等待，
+强行终止又会使整个进程池失效。这里每个工作进程通过独立的管道接收任务，
+任务超过截止时间或工作进程异常退出时，只终止并替换这一个工作进程，其他任务不受影响。
+"""
+
+import multiprocessing
+import time
+from multiprocessing.connection import wait as wait_connections
+
+# 任务结果状态
+TASK_DONE = 'done'  # 正常返回，结果为返回值
+TASK_ERROR = 'error'  # 抛出异常，结果为异常对象
+TASK_TIMEOUT = 'timeout'  # 超过截止时间，工作进程已被终止，结果为None
+TASK_CRASHED = 'crashed'  # 工作进程异常退出（如被系统因内存不足杀死），结果为退出码
+
+
+def _worker_main(conn, initializer, initargs):
+    """工作进程主循环：逐个接收 (函数, 参数) 并发回 (状态, 结果)，收到None时退出"""
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        func, args = task
+        try:
+            result = (TASK_DONE, func(*args))
+        except Exception as e:
+            result = (TASK_ERROR, e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # 结果无法序列化
+            conn.send((TASK_ERROR, RuntimeError(f"{type(e).__name__}: {str(e)}")))
+    conn.close()
+
+
+class _Worker:
+    """一个工作进程及其正在执行的任务"""
+
+    __slots__ = ('process', 'conn', 'key', 'deadline')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.key = None  # 正在执行的任务标识（None=空闲）
+        self.deadline = None  # 任务的截止时间（time.monotonic，None=不限时）
+
+
+class KillablePool:
+    """可以单独终止超时任务的工作进程池
+
+    submit()把任务交给一个空闲的工作进程，wait()返回完成、出错、超时或崩溃的任务。
+    调用方负责在有空闲工作进程时才提交任务（见idle_workers）。
+    """
+
+    def __init__(self, workers, initializer=None, initargs=()):
+        self._context = multiprocessing.get_context()
+        self._initializer = initializer
+        self._initargs = initargs
+        self._workers = [self._start_worker() for _ in range(max(1, workers))]
+        self.restarts = 0  # 因超时或崩溃而替换的工作进程数
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, self._initializer, self._initargs), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _replace_worker(self, worker):
+        """终止一个工作进程并启动新的进程代替它"""
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        self._workers[self._workers.index(worker)] = self._start_worker()
+        self.restarts += 1
+
+    @property
+    def idle_workers(self):
+        """空闲的工作进程数"""
+        return sum(1 for worker in self._workers if worker.key is None)
+
+    def submit(self, key, func, args=(), timeout=None):
+        """在空闲的工作进程中执行func(*args)，key为任务标识，timeout为秒数（None=不限时）"""
+        worker = next((worker for worker in self._workers if worker.key is None), None)
+        if worker is None:
+            raise RuntimeError("没有空闲的工作进程")
+        try:
+            worker.conn.send((func, args))
+        except (BrokenPipeError, ConnectionResetError):
+            # 空闲的工作进程已经退出，换一个新进程重新提交
+            self._replace_worker(worker)
+            return self.submit(key, func, args, timeout)
+        worker.key = key
+        worker.deadline = time.monotonic() + timeout if timeout else None
+
+    def wait(self, timeout=None):
+        """等待任务结束，返回 [(任务标识, 状态, 结果)]
+
+        最多等待timeout秒（None=等到有任务结束）；有任务到达截止时间时提前返回，
+        该任务的工作进程被终止并替换，状态为TASK_TIMEOUT。
+        """
+        busy = [worker for worker in self._workers if worker.key is not None]
+        if not busy:
+            return []
+        deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+        if deadlines:
+            until_deadline = max(0.0, min(deadlines) - time.monotonic())
+            timeout = until_deadline if timeout is None else min(timeout, until_deadline)
+        ready = wait_connections([worker.conn for worker in busy], timeout)
+
+        finished = []
+        now = time.monotonic()
+        for worker in busy:
+            key = worker.key
+            if worker.conn in ready:
+                try:
+                    status, result = worker.conn.recv()
+                except (EOFError, OSError):
+                    # 工作进程在执行任务时退出（段错误、被系统杀死等）
+                    worker.process.join(1.0)
+                    finished.append((key, TASK_CRASHED, worker.process.exitcode))
+                    self._replace_worker(worker)
+                    continue
+                except Exception as e:
+                    # 结果无法反序列化，工作进程本身仍然可用
+                    status, result = TASK_ERROR, e
+                worker.key = worker.deadline = None
+                finished.append((key, status, result))
+            elif worker.deadline is not None and now >= worker.deadline:
+                finished.append((key, TASK_TIMEOUT, None))
+                self._replace_worker(worker)
+        return finished
+
+    def shutdown(self):
+        """通知空闲的工作进程退出，终止仍在执行任务的工作进程"""
+        for worker in self._workers:
+            if worker.key is None:
+                try:
+                    worker.conn.send(None)
+                except OSError:
+                    pass
+            else:
+                worker.process.kill()
+        for worker in self._workers:
+            worker.process.join(5.0)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.conn.close()
+        self._workers = []
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.xls（BIFF8）工作表记录扫描模块
+
+xlrd解析工作表时为每个单元格记录构造值并存入行列表，大部分时间花在数值单元格上。
+BIFF8中的文本单元格几乎都是引用共享字符串表（SST）的LABELSST记录：只要知道哪些共享字符串
+匹配关键字，遍历工作表的记录头、只读取这些LABELSST记录的行列号，就能得到与xlrd逐个单元格
+搜索相同的结果，不必构造任何单元格值。公式的字符串结果（STRING）、不在SST中的文本（LABEL、
+RSTRING）无法这样判断，遇到时抛出TextRecordFound，由调用方改用xlrd解析这个工作表。
+"""
+
+from struct import unpack_from
+
+# BIFF记录类型（与xlrd.biffh相同）
+_BOF_CODES = (0x0809, 0x0409, 0x0209, 0x0009)
+_EOF = 0x000A
+_LABELSST = 0x00FD
+_TEXT_RECORDS = frozenset((0x0204, 0x00D6, 0x0207))  # LABEL、RSTRING、STRING（公式的字符串结果）
+_SINGLE_CELL_RECORDS = frozenset((0x0201, 0x0203, 0x0205, 0x0006, 0x027E))  # BLANK、NUMBER、BOOLERR、FORMULA、RK
+_MULRK = 0x00BD
+_MULBLANK = 0x00BE
+
+
+class TextRecordFound(Exception):
+    """工作表中有不在共享字符串表中的文本，只按LABELSST记录无法得到完整结果"""
+
+
+def can_scan_records(workbook):
+    """工作簿（xlrd按需加载打开的Book）是否支持按记录扫描：BIFF8，且共享字符串表和工作表位置可用"""
+    return (
+        workbook.biff_version >= 80
+        and getattr(workbook, 'mem', None) is not None
+        and getattr(workbook, '_sharedstrings', None) is not None
+        and len(getattr(workbook, '_sh_abs_posn', ())) == workbook.nsheets
+    )
+
+
+def shared_strings(workbook):
+    """工作簿的共享字符串列表（LABELSST记录按序号引用）"""
+    return workbook._sharedstrings
+
+
+def scan_sst_cells(workbook, sheet_idx, wanted, max_row=None):
+    """遍历工作表的记录，找出引用wanted中共享字符串的单元格
+
+    wanted为共享字符串序号的集合（为空时只检查是否有其他文本记录）；max_row不为None时只取前max_row行。
+    返回 ([(行号, 列号, 共享字符串序号)]（行列号从1开始，按行列排序）, 单元格记录数)。
+    遇到LABEL、RSTRING或STRING记录时抛出TextRecordFound；工作表结构异常时抛出ValueError或struct.error。
+    """
+    mem = workbook.mem
+    pos = workbook._sh_abs_posn[sheet_idx]
+    code, length = unpack_from('<HH', mem, pos)
+    if code not in _BOF_CODES:
+        raise ValueError(f"工作表 {sheet_idx} 的位置 {pos} 不是BOF记录")
+    pos += 4 + length
+    end = len(mem)
+    found = []
+    cells = 0
+    while pos + 4 <= end:
+        code, length = unpack_from('<HH', mem, pos)
+        if code == _LABELSST:
+            cells += 1
+            row, col, _, isst = unpack_from('<HHHi', mem, pos + 4)
+            if isst in wanted and (max_row is None or row < max_row):
+                found.append((row + 1, col + 1, isst))
+        elif code in _SINGLE_CELL_RECORDS:
+            cells += 1
+        elif code == _MULRK:
+            cells += (length - 6) // 6
+        elif code == _MULBLANK:
+            cells += (length - 6) // 2
+        elif code in _TEXT_RECORDS:
+            raise TextRecordFound(f"0x{code:04x}")
+        elif code == _EOF:
+            # Excel按行的顺序写入单元格记录，其他程序生成的文件不一定如此
+            found.sort()
+            return found, cells
+        elif code in _BOF_CODES:
+            # 嵌入的图表等子流：跳到它的EOF（与xlrd相同）
+            pos += 4 + length
+            while pos + 4 <= end:
+                code, length = unpack_from('<HH', mem, pos)
+                if code == _EOF:
+                    break
+                pos += 4 + length
+        pos += 4 + length
+    raise ValueError(f"工作表 {sheet_idx} 缺少EOF记录")
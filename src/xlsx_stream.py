@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.xlsx 原始XML流式读取模块
+
+直接读取 .xlsx（zip包）中的XML成员，不经过openpyxl/pandas：
+用于在完整解析之前快速判断工作簿是否可能包含关键字，
+以及快速搜索时按行读取工作表、读到上限（行数、单元格数或字节数）就停止解压。
+"""
+
+import html
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+# 注音文本（不显示在单元格中）和XML标签
+_PHONETIC_RE = re.compile(r'<rPh\b.*?</rPh>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]*>')
+
+# 工作表XML中存放文本、但不在共享字符串表里的单元格类型：
+# 内联字符串、公式字符串结果、错误值
+_TEXT_CELL_MARKERS = (b't="inlineStr"', b't="str"', b't="e"')
+
+# 读取zip成员时的块大小
+_CHUNK_SIZE = 256 * 1024
+
+# 快速搜索逐行读取工作表时的块大小（较小的块使读到上限后多解压的数据更少）
+_ROW_CHUNK_SIZE = 64 * 1024
+
+# 快速搜索的读取上限单位（每个工作表分别计算）
+LIMIT_ROWS = 'rows'  # 行号不超过上限的行
+LIMIT_CELLS = 'cells'  # 前若干个非空单元格
+LIMIT_BYTES = 'bytes'  # 工作表XML解压后的前若干字节
+LIMIT_UNITS = (LIMIT_ROWS, LIMIT_CELLS, LIMIT_BYTES)
+
+
+def _find_member(zip_file, suffix):
+    """按名称后缀（不区分大小写）查找zip成员"""
+    suffix = suffix.lower()
+    for name in zip_file.namelist():
+        if name.lower().endswith(suffix):
+            return name
+    return None
+
+
+def _sheet_members(zip_file):
+    """返回所有工作表XML成员名"""
+    return [
+        name for name in zip_file.namelist()
+        if name.lower().startswith('xl/worksheets/') and name.lower().endswith('.xml')
+    ]
+
+
+def _xml_text(xml):
+    """提取XML片段中的文本：去掉注音<rPh>和所有标签，再还原实体引用"""
+    xml = _PHONETIC_RE.sub('', xml)
+    xml = _TAG_RE.sub('', xml)
+    return html.unescape(xml) if '&' in xml else xml
+
+
+def shared_strings_match(zip_file, pattern):
+    """流式扫描共享字符串表，判断是否有字符串匹配pattern
+
+    按块解压，每次只处理到最后一个完整的</si>为止；每个<si>的文本（含富文本的多个
+    片段）拼接后以换行分隔，因此关键字不会跨越两个不同的字符串匹配。
+    共享字符串表不存在时返回False。
+    """
+    name = _find_member(zip_file, 'xl/sharedstrings.xml')
+    if name is None:
+        return False
+
+    pending = b''
+    with zip_file.open(name) as stream:
+        while True:
+            chunk = stream.read(_CHUNK_SIZE)
+            data = pending + chunk
+            if chunk:
+                cut = data.rfind(b'</si>')
+                if cut < 0:
+                    pending = data
+                    continue
+                cut += len(b'</si>')
+                data, pending = data[:cut], data[cut:]
+
+            text = _xml_text(data.decode('utf-8', errors='replace').replace('</si>', '\n'))
+            if pattern.search(text):
+                return True
+            if not chunk:
+                return False
+
+
+def _member_contains(zip_file, name, markers):
+    """在zip成员解压后的原始字节中查找任一标记（只解压，不解析XML）"""
+    overlap = max(len(marker) for marker in markers) - 1
+    tail = b''
+    with zip_file.open(name) as stream:
+        while True:
+            chunk = stream.read(_CHUNK_SIZE)
+            if not chunk:
+                return False
+            data = tail + chunk
+            if any(marker in data for marker in markers):
+                return True
+            tail = data[-overlap:]
+
+
+def workbook_may_match(file_path, pattern):
+    """预过滤：判断 .xlsx 工作簿是否可能包含匹配的文本
+
+    只流式读取共享字符串表；若其中没有任何字符串匹配，再检查工作表XML的原始字节中
+    是否存在内联字符串/公式字符串等不在共享字符串表里的文本单元格（仅解压、不解析）。
+    返回False表示确定不包含匹配文本，可以跳过完整解析；
+    无法判断（如文件损坏）时返回True，交由完整解析处理。
+
+    注意：数值、日期、布尔值单元格不在检查范围内，调用方需自行判断关键字
+    是否可能匹配这些值的文本形式。file_path可以是路径，也可以是已打开的二进制文件对象。
+    """
+    try:
+        with zipfile.ZipFile(file_path) as zip_file:
+            if shared_strings_match(zip_file, pattern):
+                return True
+
+            for name in _sheet_members(zip_file):
+                if _member_contains(zip_file, name, _TEXT_CELL_MARKERS):
+                    return True
+
+            return False
+    except Exception:
+        return True
+
+
+def _local_name(name):
+    """去掉XML名称的命名空间前缀（"x:row"或"{uri}row" -> "row"）"""
+    return name.rpartition('}')[2].rpartition(':')[2]
+
+
+def _column_index(ref):
+    """单元格引用中的列号（"AB12" -> 28）"""
+    col = 0
+    for ch in ref:
+        if ch <= '9':
+            break
+        col = col * 26 + (ord(ch) & 0x1F)
+    return col
+
+
+class _SharedStrings:
+    """按需增量解析的共享字符串表
+
+    只解压、解析到被引用的最大序号为止；Excel按首次出现的顺序写入共享字符串，
+    快速搜索只读取工作表开头时通常只需要解析表的开头部分。
+    """
+
+    def __init__(self, zip_file, name):
+        self.strings = []
+        self._stream = zip_file.open(name) if name else None
+        self._parts = None  # 正在解析的<si>中的文本片段
+        self._in_text = False
+        self._phonetic = 0  # 所在<rPh>（注音，不显示在单元格中）的层数
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._text
+
+    def _start(self, name, attrs):
+        name = _local_name(name)
+        if name == 'si':
+            self._parts = []
+        elif name == 'rPh':
+            self._phonetic += 1
+        elif name == 't' and not self._phonetic:
+            self._in_text = True
+
+    def _end(self, name):
+        name = _local_name(name)
+        if name == 'si':
+            self.strings.append(''.join(self._parts))
+            self._parts = None
+        elif name == 'rPh':
+            self._phonetic -= 1
+        elif name == 't':
+            self._in_text = False
+
+    def _text(self, data):
+        if self._in_text and self._parts is not None:
+            self._parts.append(data)
+
+    def __getitem__(self, index):
+        while index >= len(self.strings) and self._stream is not None:
+            chunk = self._stream.read(_CHUNK_SIZE)
+            self._parser.Parse(chunk, not chunk)
+            if not chunk:
+                self.close()
+        return self.strings[index]
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class _SheetRowParser:
+    """工作表XML的增量解析器：把完整的行追加到rows，读到行号或单元格数上限时停止"""
+
+    def __init__(self, reader, max_row=None, max_cells=None):
+        self.reader = reader
+        self.max_row = max_row
+        self.max_cells = max_cells
+        self.rows = []  # 已解析完成、尚未取走的行
+        self.done = False  # 已读到上限，忽略之后的内容
+        self.cells = 0  # 已读取的非空单元格数
+        self.row_num = 0  # 当前行号
+        self._row = None  # 当前行的单元格值
+        self._cell = None  # 当前单元格 (列号, 类型, 样式)
+        self._parts = []  # 当前单元格<v>或内联字符串<t>中的文本
+        self._in_value = False
+        self._phonetic = 0
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+        self.parser.CharacterDataHandler = self._text
+
+    def _start(self, name, attrs):
+        if self.done:
+            return
+        name = _local_name(name)
+        if name == 'c':
+            ref = attrs.get('r')
+            col = _column_index(ref) if ref else len(self._row) + 1
+            self._cell = (col, attrs.get('t', 'n'), attrs.get('s'))
+            self._parts = []
+        elif name == 'row':
+            row_num = attrs.get('r')
+            row_num = int(row_num) if row_num else self.row_num + 1
+            if self.max_row is not None and row_num > self.max_row:
+                self.done = True
+                return
+            # 跳过的行号产生空行，使行号与位置一致
+            self.rows.extend([] for _ in range(self.row_num + 1, row_num))
+            self.row_num = row_num
+            self._row = []
+        elif name == 'v' or (name == 't' and not self._phonetic):
+            self._in_value = self._cell is not None
+        elif name == 'rPh':
+            self._phonetic += 1
+
+    def _end(self, name):
+        if self.done:
+            return
+        name = _local_name(name)
+        if name == 'c':
+            value = self.reader.cell_value(''.join(self._parts), *self._cell[1:]) if self._parts else None
+            col = self._cell[0]
+            self._cell = None
+            if value is None or value == '':
+                return
+            row = self._row
+            if col > len(row) + 1:
+                row.extend([None] * (col - len(row) - 1))
+            row.append(value)
+            self.cells += 1
+            if self.max_cells is not None and self.cells >= self.max_cells:
+                self.rows.append(row)
+                self.done = True
+        elif name == 'row':
+            self.rows.append(self._row)
+            self._row = None
+            if self.max_row is not None and self.row_num >= self.max_row:
+                self.done = True
+        elif name in ('v', 't'):
+            self._in_value = False
+        elif name == 'rPh':
+            self._phonetic -= 1
+
+    def _text(self, data):
+        if self._in_value:
+            self._parts.append(data)
+
+
+class XlsxStreamReader:
+    """不经过openpyxl、按行流式读取 .xlsx 工作表中的单元格值
+
+    单元格值的转换与openpyxl只读模式（data_only=True）一致：共享字符串、内联字符串、
+    布尔值、数值（int/float），以及按单元格样式的数字格式转换的日期时间。
+    工作簿结构无法解析时抛出异常，调用方可以改用openpyxl。
+    file_path可以是路径，也可以是已打开的二进制文件对象（关闭读取器时不会关闭它）。
+    """
+
+    def __init__(self, file_path):
+        self.zip_file = zipfile.ZipFile(file_path)
+        try:
+            self._members = {name.lower(): name for name in self.zip_file.namelist()}
+            self.epoch = None  # 日期系统（None=1900），首次转换日期时确定
+            self.sheets = self._read_sheets()  # [(工作表名, zip成员名)]
+            self.shared_strings = _SharedStrings(self.zip_file, self._members.get('xl/sharedstrings.xml'))
+            self._date_styles = None  # 样式序号 -> 是否为时间间隔格式（只包含日期时间样式）
+        except Exception:
+            self.zip_file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.shared_strings.close()
+        self.zip_file.close()
+
+    def _read_xml(self, name):
+        member = self._members.get(name.lower())
+        if member is None:
+            return None
+        return ElementTree.fromstring(self.zip_file.read(member))
+
+    def _read_sheets(self):
+        """按工作簿中的顺序返回 [(工作表名, zip成员名)]"""
+        targets = {}
+        rels = self._read_xml('xl/_rels/workbook.xml.rels')
+        for rel in (rels.iter() if rels is not None else ()):
+            if _local_name(rel.tag) == 'Relationship' and rel.get('Target'):
+                target = rel.get('Target')
+                path = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+                targets[rel.get('Id')] = posixpath.normpath(path)
+
+        workbook = self._read_xml('xl/workbook.xml')
+        if workbook is None:
+            raise ValueError("缺少 xl/workbook.xml")
+        self._date1904 = False
+        sheets = []
+        for element in workbook.iter():
+            tag = _local_name(element.tag)
+            if tag == 'workbookPr':
+                self._date1904 = element.get('date1904', '').lower() in ('1', 'true')
+            elif tag == 'sheet':
+                rel_id = next((value for key, value in element.attrib.items() if _local_name(key) == 'id'), None)
+                member = self._members.get(targets.get(rel_id, '').lower())
+                if member is not None:
+                    sheets.append((element.get('name'), member))
+        return sheets
+
+    def _load_date_styles(self):
+        """找出数字格式为日期时间的单元格样式（与openpyxl的判断相同）"""
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+        self.epoch = CALENDAR_MAC_1904 if self._date1904 else CALENDAR_WINDOWS_1900
+        self._date_styles = {}
+        styles = self._read_xml('xl/styles.xml')
+        if styles is None:
+            return
+        custom = {}
+        cell_xfs = []
+        for element in styles.iter():
+            tag = _local_name(element.tag)
+            if tag == 'numFmt':
+                custom[int(element.get('numFmtId', -1))] = element.get('formatCode', '')
+            elif tag == 'cellXfs':
+                cell_xfs = [xf for xf in element if _local_name(xf.tag) == 'xf']
+        for idx, xf in enumerate(cell_xfs):
+            fmt_id = int(xf.get('numFmtId', 0))
+            fmt = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+            if fmt and is_date_format(fmt):
+                self._date_styles[idx] = is_timedelta_format(fmt)
+
+    def cell_value(self, text, data_type, style):
+        """把单元格XML中的文本转换为值"""
+        if data_type == 's':
+            return self.shared_strings[int(text)]
+        if data_type in ('inlineStr', 'str', 'e'):
+            return text
+        if data_type == 'b':
+            return bool(int(text))
+        if data_type == 'd':
+            from openpyxl.utils.datetime import from_ISO8601
+            return from_ISO8601(text)
+        value = float(text) if '.' in text or 'E' in text or 'e' in text else int(text)
+        if style:
+            if self._date_styles is None:
+                self._load_date_styles()
+            timedelta = self._date_styles.get(int(style))
+            if timedelta is not None:
+                from openpyxl.utils.datetime import from_excel
+                try:
+                    return from_excel(value, self.epoch, timedelta=timedelta)
+                except (OverflowError, ValueError):
+                    return '#VALUE!'
+        return value
+
+    def iter_rows(self, member, limit=None, unit=LIMIT_ROWS):
+        """按行产生工作表中单元格的值列表（下标0为A列，没有值的位置为None，空行为空列表）
+
+        limit不为None时按unit只读取工作表开头：行号不超过limit的行、前limit个非空单元格，
+        或解压后的前limit字节XML（最后一个不完整的行被丢弃）；读到上限后立即停止解压。
+        """
+        parser = _SheetRowParser(self, limit if unit == LIMIT_ROWS else None,
+                                 limit if unit == LIMIT_CELLS else None)
+        remaining = limit if unit == LIMIT_BYTES else None
+        with self.zip_file.open(member) as stream:
+            while not parser.done:
+                size = _ROW_CHUNK_SIZE if remaining is None else min(_ROW_CHUNK_SIZE, remaining)
+                chunk = stream.read(size) if size > 0 else b''
+                if remaining is not None:
+                    remaining -= len(chunk)
+                if chunk:
+                    parser.parser.Parse(chunk, False)
+                elif size:
+                    parser.parser.Parse(b'', True)
+                    parser.done = True
+                else:
+                    # 读到字节上限：不再解析，只产出已完整解析的行
+                    parser.done = True
+
+                rows, parser.rows = parser.rows, []
+                yield from rows